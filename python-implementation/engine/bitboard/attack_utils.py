@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import List, TYPE_CHECKING
 
 from engine.bitboard.moves.knight import KNIGHT_ATTACKS
-from engine.bitboard.moves.bishop import bishop_attacks
-from engine.bitboard.moves.rook import rook_attacks
+from engine.bitboard.moves.king import KING_ATTACKS
+from engine.bitboard.moves.bishop import BISHOP_MAGIC, bishop_attacks
+from engine.bitboard.moves.rook import ROOK_MAGIC, SLIDER_ATTACKS, rook_attacks
 from engine.bitboard.constants import (
     WHITE_PAWN,
     BLACK_PAWN,
@@ -19,12 +20,82 @@ from engine.bitboard.constants import (
     WHITE_KING,
     BLACK_KING,
     WHITE,
+    BLACK,
+    FILE_A,
+    FILE_H,
+    MASK_64,
 )
 
 if TYPE_CHECKING:  # pragma: no cover - used for type hints only
     from .board import Board
 
 
+def _pawn_attack_mask(sq: int, side: int) -> int:
+    """Squares attacked by a pawn of `side` standing on `sq`."""
+    bb = 1 << sq
+    if side == WHITE:
+        attacks = ((bb & ~FILE_A) << 7) | ((bb & ~FILE_H) << 9)
+    else:
+        attacks = ((bb & ~FILE_A) >> 9) | ((bb & ~FILE_H) >> 7)
+    return attacks & MASK_64
+
+
+# PAWN_ATTACKS[side][sq] = squares a pawn of `side` on `sq` attacks
+PAWN_ATTACKS = [
+    [_pawn_attack_mask(sq, WHITE) for sq in range(64)],
+    [_pawn_attack_mask(sq, BLACK) for sq in range(64)],
+]
+
+
+def _between_mask(a: int, b: int) -> int:
+    """Squares strictly between `a` and `b` on a shared line, else 0."""
+    if rook_attacks(a, 0) & (1 << b):
+        return rook_attacks(a, 1 << b) & rook_attacks(b, 1 << a)
+    if bishop_attacks(a, 0) & (1 << b):
+        return bishop_attacks(a, 1 << b) & bishop_attacks(b, 1 << a)
+    return 0
+
+
+# BETWEEN[a][b] = squares strictly between a and b (0 if not aligned)
+BETWEEN = [[_between_mask(a, b) for b in range(64)] for a in range(64)]
+
+
+def attacked_squares(bitboards: List[int], side: int, occ: int) -> int:
+    """
+    Return a bitboard of every square attacked by `side`,
+    with sliding attacks computed against occupancy `occ`.
+    """
+    base = 0 if side == WHITE else 6
+
+    pawns = bitboards[base + WHITE_PAWN]
+    if side == WHITE:
+        attacks = ((pawns & ~FILE_A) << 7) | ((pawns & ~FILE_H) << 9)
+    else:
+        attacks = ((pawns & ~FILE_A) >> 9) | ((pawns & ~FILE_H) >> 7)
+
+    bb = bitboards[base + WHITE_KNIGHT]
+    while bb:
+        attacks |= KNIGHT_ATTACKS[(bb & -bb).bit_length() - 1]
+        bb &= bb - 1
+
+    queens = bitboards[base + WHITE_QUEEN]
+    bb = bitboards[base + WHITE_BISHOP] | queens
+    while bb:
+        attacks |= bishop_attacks((bb & -bb).bit_length() - 1, occ)
+        bb &= bb - 1
+
+    bb = bitboards[base + WHITE_ROOK] | queens
+    while bb:
+        attacks |= rook_attacks((bb & -bb).bit_length() - 1, occ)
+        bb &= bb - 1
+
+    king = bitboards[base + WHITE_KING]
+    if king:
+        attacks |= KING_ATTACKS[king.bit_length() - 1]
+
+    return attacks & MASK_64
+
+
 def is_square_attacked(
     board: "Board", square: int, attacker_side: int
 ) -> bool:
@@ -32,23 +103,13 @@ def is_square_attacked(
     all_occ = board.white_occ | board.black_occ
 
     # 1. Pawn attacks
+    # A pawn attacks `square` from where a pawn of the *other* colour
+    # standing on `square` would attack.
     if attacker_side == WHITE:
-        pawn_bb = board.bitboards[WHITE_PAWN]
-        mask = 0
-        if square >= 9 and (square % 8) != 7:
-            mask |= 1 << (square - 9)
-        if square >= 7 and (square % 8) != 0:
-            mask |= 1 << (square - 7)
-        if pawn_bb & mask:
+        if PAWN_ATTACKS[BLACK][square] & board.bitboards[WHITE_PAWN]:
             return True
     else:
-        pawn_bb = board.bitboards[BLACK_PAWN]
-        mask = 0
-        if square <= 56 and (square % 8) != 7:
-            mask |= 1 << (square + 7)
-        if square <= 55 and (square % 8) != 0:
-            mask |= 1 << (square + 9)
-        if pawn_bb & mask:
+        if PAWN_ATTACKS[WHITE][square] & board.bitboards[BLACK_PAWN]:
             return True
 
     # 2. Knight attacks
@@ -60,14 +121,21 @@ def is_square_attacked(
     if KNIGHT_ATTACKS[square] & knight_bb:
         return True
 
-    # 3. Bishop/Queen diagonal attacks
+    # 3. Bishop/Queen diagonal attacks (flat magic lookup, inlined)
     diagonal_attackers = (
         board.bitboards[WHITE_BISHOP] | board.bitboards[WHITE_QUEEN]
         if attacker_side == WHITE
         else board.bitboards[BLACK_BISHOP] | board.bitboards[BLACK_QUEEN]
     )
-    if bishop_attacks(square, all_occ) & diagonal_attackers:
-        return True
+    if diagonal_attackers:
+        mask, magic, shift, offset = BISHOP_MAGIC[square]
+        if (
+            SLIDER_ATTACKS[
+                offset + ((((all_occ & mask) * magic) & MASK_64) >> shift)
+            ]
+            & diagonal_attackers
+        ):
+            return True
 
     # 4. Rook/Queen orthogonal attacks
     orthogonal_attackers = (
@@ -75,13 +143,17 @@ def is_square_attacked(
         if attacker_side == WHITE
         else board.bitboards[BLACK_ROOK] | board.bitboards[BLACK_QUEEN]
     )
-    if rook_attacks(square, all_occ) & orthogonal_attackers:
-        return True
+    if orthogonal_attackers:
+        mask, magic, shift, offset = ROOK_MAGIC[square]
+        if (
+            SLIDER_ATTACKS[
+                offset + ((((all_occ & mask) * magic) & MASK_64) >> shift)
+            ]
+            & orthogonal_attackers
+        ):
+            return True
 
     # 5. King attacks (adjacent)
-    # King attack import done only at runtime to avoid circular import
-    from engine.bitboard.moves.king import KING_ATTACKS
-
     king_bb = (
         board.bitboards[WHITE_KING]
         if attacker_side == WHITE
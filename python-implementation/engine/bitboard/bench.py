@@ -0,0 +1,622 @@
+#!/usr/bin/env python3
+"""Benchmarks: the fixed suite with its node signature, and focused modes.
+
+The default mode, ``suite``, runs BENCH_POSITIONS (middlegame, endgame,
+promotion- and castling-heavy positions) through perft to
+``--perft-depth`` and through the search to ``--search-depth``
+(optionally capped at ``--search-nodes`` per position), each search
+with a fresh table. It reports total nodes, wall time and nodes/sec
+per part and per category.
+
+The ``signature`` is the total node count of both parts. The suite is
+deterministic, so the signature changes only when move generation or
+the search's behaviour does, never with the speed of the machine. CI
+can chart ``nps`` across commits and flag a signature change that a
+commit did not mean to make.
+
+The other modes each time one thing. Those that count or search run
+the few QUICK_POSITIONS to ``--depth``, and the first two take the
+best of ``--repeat`` runs:
+
+  * ``generators`` - perft nodes/sec with every generator in
+    LEGAL_MOVE_GENERATORS (``--copy-make`` adds a Board.make_move_copy
+    row for each),
+  * ``search`` - search nodes/sec per position, with the moves
+    generated per node and the pawn hash hit rate,
+  * ``smp`` - Lazy SMP time to depth and nodes/sec for each count in
+    ``--threads`` (smp.py), as speedups over the first count,
+  * ``magic-load`` - start-up time and peak RSS of the Python and the
+    binary magic tables, each ``--runs`` times in a fresh interpreter,
+    with warm and with cold bytecode caches.
+
+Usage::
+
+    PYTHONPATH=. python -m engine.bitboard.bench [--perft-depth 3]
+        [--search-depth 4] [--search-nodes N] [--json] [--output FILE]
+    PYTHONPATH=. python -m engine.bitboard.bench --mode generators
+        [--depth 3] [--repeat 3] [--copy-make]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from itertools import product
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from engine.bitboard.board import Board
+from engine.bitboard.generator import LEGAL_MOVE_GENERATORS
+from engine.bitboard.perft import perft_copy_make, perft_count
+from engine.bitboard.search import Searcher
+from engine.bitboard.smp import HelperPool
+from engine.bitboard.timeman import SearchLimits
+from engine.bitboard.transposition import TranspositionTable
+from engine.bitboard.utils import move_to_uci
+
+# Bumped whenever the report layout or the positions change, so that
+# charts do not join numbers that cannot be compared
+BENCH_VERSION = 1
+DEFAULT_PERFT_DEPTH = 3
+DEFAULT_SEARCH_DEPTH = 4
+MODES = ("suite", "generators", "search", "smp", "magic-load")
+# Table size for every smp run, in megabytes
+SMP_HASH_MB = 16
+
+project_root = Path(__file__).resolve().parents[2]
+
+# (category, fen)
+BENCH_POSITIONS: List[Tuple[str, str]] = [
+    (
+        "middlegame",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w "
+        "KQkq - 0 10",
+    ),
+    (
+        "middlegame",
+        "4rrk1/pp1n3p/3q2pQ/2p1pb2/2PP4/2P3N1/P2B2PP/4RRK1 b - - 7 19",
+    ),
+    (
+        "middlegame",
+        "rq3rk1/ppp2ppp/1bnpb3/3N2B1/3NP3/7P/PPPQ1PP1/2KR3R w - - 7 14",
+    ),
+    (
+        "middlegame",
+        "r1bq1r1k/1pp1n1pp/1p1p4/4p2Q/4Pp2/1BNP4/PPP2PPP/3R1RK1 w - - 2 14",
+    ),
+    (
+        "middlegame",
+        "r3r1k1/2p2ppp/p1p1bn2/8/1q2P3/2NPQN2/PPP3PP/R4RK1 b - - 2 15",
+    ),
+    (
+        "middlegame",
+        "r1bbk1nr/pp3p1p/2n5/1N4p1/2Np1B2/8/PPP2PPP/2KR1B1R w kq - 0 13",
+    ),
+    (
+        "middlegame",
+        "r1bq1rk1/ppp1nppp/4n3/3p3Q/3P4/1BP1B3/PP1N2PP/R4RK1 w - - 1 16",
+    ),
+    (
+        "middlegame",
+        "4r1k1/r1q2ppp/ppp2n2/4P3/5Rb1/1N1BQ3/PPP3PP/R5K1 w - - 1 17",
+    ),
+    (
+        "middlegame",
+        "2rqkb1r/ppp2p2/2npb1p1/1N1Nn2p/2P1PP2/8/PP2B1PP/R1BQK2R b KQ - 0 11",
+    ),
+    (
+        "middlegame",
+        "r1bq1r1k/b1p1npp1/p2p3p/1p6/3PP3/1B2NN2/PP3PPP/R2Q1RK1 w - - 1 16",
+    ),
+    (
+        "middlegame",
+        "3r1rk1/p5pp/bpp1pp2/8/q1PP1P2/b3P3/P2NQRPP/1R2B1K1 b - - 6 22",
+    ),
+    (
+        "middlegame",
+        "r1q2rk1/2p1bppp/2Pp4/p6b/Q1PNp3/4B3/PP1R1PPP/2K4R w - - 2 18",
+    ),
+    (
+        "middlegame",
+        "4k2r/1pb2ppp/1p2p3/1R1p4/3P4/2r1PN2/P4PPP/1R4K1 b - - 3 22",
+    ),
+    (
+        "middlegame",
+        "3q2k1/pb3p1p/4pbp1/2r5/PpN2N2/1P2P2P/5PP1/Q2R2K1 b - - 4 26",
+    ),
+    (
+        "middlegame",
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1"
+        " w - - 0 10",
+    ),
+    (
+        "middlegame",
+        "5rk1/q6p/2p3bR/1pPp1rP1/1P1Pp3/P3B1Q1/1K3P2/R7 w - - 93 90",
+    ),
+    (
+        "middlegame",
+        "4rrk1/1p1nq3/p7/2p1P1pp/3P2bp/3Q1Bn1/PPPB4/1K2R1NR w - - 40 21",
+    ),
+    ("endgame", "6k1/6p1/6Pp/ppp5/3pn2P/1P3K2/1PP2P2/8 b - - 3 54"),
+    ("endgame", "3b4/5kp1/1p1p1p1p/pP1PpP1P/P1P1P3/3KN3/8/8 w - - 0 1"),
+    ("endgame", "2K5/p7/7P/5pR1/8/5k2/r7/8 w - - 0 1"),
+    ("endgame", "8/6pk/1p6/8/PP3p1p/5P2/4KP1q/3Q4 w - - 0 1"),
+    ("endgame", "7k/3p2pp/4q3/8/4Q3/5Kp1/P6b/8 w - - 0 1"),
+    ("endgame", "8/2p5/8/2kPKp1p/2p4P/2P5/3P4/8 w - - 0 1"),
+    ("endgame", "8/1p3pp1/7p/5P1P/2k3P1/8/2K2P2/8 w - - 0 1"),
+    ("endgame", "8/pp2r1k1/2p1p3/3pP2p/1P1P1P1P/P5KR/8/8 w - - 0 1"),
+    ("endgame", "8/3p4/p1bk3p/Pp6/1Kp1PpPp/2P2P1P/2P5/5B2 b - - 0 1"),
+    ("endgame", "5k2/7R/4P2p/5K2/p1r2P1p/8/8/8 b - - 0 1"),
+    ("endgame", "6k1/6p1/P6p/r1N5/5p2/7P/1b3PP1/4R1K1 w - - 0 1"),
+    ("endgame", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"),
+    ("promotion", "n1n5/PPPk4/8/8/8/8/4Kppp/5N1N b - - 0 1"),
+    ("promotion", "8/PPP4k/8/8/8/8/4Kppp/8 w - - 0 1"),
+    ("promotion", "8/2p4P/8/kr6/6R1/8/8/1K6 w - - 0 1"),
+    ("promotion", "8/8/3P3k/8/1p6/8/1P6/1K3n2 b - - 0 1"),
+    ("promotion", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"),
+    (
+        "promotion",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    ),
+    ("castling", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"),
+    ("castling", "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1"),
+    ("castling", "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1"),
+    (
+        "castling",
+        "r3k2r/3nnpbp/q2pp1p1/p7/Pp1PPPP1/4BNN1/1P5P/R2Q1RK1 w kq - 0 16",
+    ),
+    (
+        "castling",
+        "r3k2r/p1pp1pb1/bn2Qnp1/2qPN3/1p2P3/2N5/PPPBBPPP/R3K2R b KQkq - 3 2",
+    ),
+]
+
+# (name, fen) for the focused modes: quiet, tactical, castling and
+# en-passant-heavy nodes
+QUICK_POSITIONS: List[Tuple[str, str]] = [
+    ("start", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"),
+    (
+        "kiwipete",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    ),
+    ("pos3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"),
+    (
+        "pos4",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    ),
+    ("pos5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"),
+]
+
+
+@dataclass
+class BenchRow:
+    """One position's run through one part of the suite."""
+
+    category: str
+    fen: str
+    nodes: int
+    seconds: float
+    # Search only: the move found
+    best: Optional[str] = None
+
+
+def run_perft(
+    depth: int, positions: List[Tuple[str, str]] = BENCH_POSITIONS
+) -> List[BenchRow]:
+    """Perft every position to `depth`."""
+    rows = []
+    for category, fen in positions:
+        board = Board()
+        board.set_fen(fen)
+        t0 = time.perf_counter()
+        nodes = perft_count(board, depth)
+        rows.append(
+            BenchRow(category, fen, nodes, time.perf_counter() - t0)
+        )
+    return rows
+
+
+def run_search(
+    depth: int,
+    max_nodes: Optional[int] = None,
+    positions: List[Tuple[str, str]] = BENCH_POSITIONS,
+) -> List[BenchRow]:
+    """Search every position to `depth`, with at most `max_nodes` each."""
+    rows = []
+    limits = SearchLimits(depth=depth, nodes=max_nodes)
+    for category, fen in positions:
+        board = Board()
+        board.set_fen(fen)
+        # A fresh table and pawn cache per position keep the node
+        # counts independent of the order of the positions
+        searcher = Searcher(board)
+        t0 = time.perf_counter()
+        move, _ = searcher.search(limits=limits)
+        seconds = time.perf_counter() - t0
+        best = move_to_uci(move) if move is not None else "0000"
+        rows.append(BenchRow(category, fen, searcher.nodes, seconds, best))
+    return rows
+
+
+def summarize(rows: List[BenchRow]) -> Dict[str, Dict[str, float]]:
+    """{"total" or category: {"nodes", "seconds", "nps"}}."""
+    groups: Dict[str, List[BenchRow]] = {"total": rows}
+    for row in rows:
+        groups.setdefault(row.category, []).append(row)
+    summary: Dict[str, Dict[str, float]] = {}
+    for name, group in groups.items():
+        nodes = sum(row.nodes for row in group)
+        seconds = sum(row.seconds for row in group)
+        summary[name] = {
+            "nodes": nodes,
+            "seconds": seconds,
+            "nps": nodes / seconds if seconds else 0.0,
+        }
+    return summary
+
+
+def bench(
+    perft_depth: int = DEFAULT_PERFT_DEPTH,
+    search_depth: int = DEFAULT_SEARCH_DEPTH,
+    search_nodes: Optional[int] = None,
+    positions: List[Tuple[str, str]] = BENCH_POSITIONS,
+) -> Dict[str, object]:
+    """
+    The full report: settings, then a "perft" and a "search" part
+    (each {"summary", "positions"}; a depth of 0 skips the part) and
+    the node ``signature``.
+    """
+    report: Dict[str, object] = {
+        "version": BENCH_VERSION,
+        "python": platform.python_version(),
+        "positions": len(positions),
+        "perft_depth": perft_depth,
+        "search_depth": search_depth,
+        "search_nodes": search_nodes,
+    }
+    signature = 0
+    parts: List[Tuple[str, List[BenchRow]]] = []
+    if perft_depth > 0:
+        parts.append(("perft", run_perft(perft_depth, positions)))
+    if search_depth > 0:
+        rows = run_search(search_depth, search_nodes, positions)
+        parts.append(("search", rows))
+    for name, rows in parts:
+        report[name] = {
+            "summary": summarize(rows),
+            "positions": [asdict(row) for row in rows],
+        }
+        signature += sum(row.nodes for row in rows)
+    report["signature"] = signature
+    return report
+
+
+def run_generators(
+    depth: int,
+    repeat: int,
+    copy_make: bool = False,
+    positions: List[Tuple[str, str]] = QUICK_POSITIONS,
+) -> Dict[str, Dict[str, float]]:
+    """{generator: {"nodes", "seconds", "nps"}} over `positions`."""
+    modes: List[Tuple[str, Callable[..., int]]] = [("", perft_count)]
+    if copy_make:
+        modes.append(("/copy", perft_copy_make))
+    results: Dict[str, Dict[str, float]] = {}
+    for (gen_name, move_gen), (suffix, perft) in product(
+        sorted(LEGAL_MOVE_GENERATORS.items()), modes
+    ):
+        nodes = 0
+        seconds = 0.0
+        for _, fen in positions:
+            board = Board()
+            board.set_fen(fen)
+            best = float("inf")
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                count = perft(board, depth, move_gen=move_gen)
+                best = min(best, time.perf_counter() - t0)
+            nodes += count
+            seconds += best
+        results[gen_name + suffix] = {
+            "nodes": nodes,
+            "seconds": seconds,
+            "nps": nodes / seconds,
+        }
+    return results
+
+
+def run_search_stats(
+    depth: int,
+    repeat: int,
+    positions: List[Tuple[str, str]] = QUICK_POSITIONS,
+) -> Dict[str, Dict[str, object]]:
+    """
+    {position: {"nodes", "gen_per_node", "pawn_hit_rate", "seconds",
+    "nps", "best"}} plus a "total" row.
+    """
+    results: Dict[str, Dict[str, object]] = {}
+    total_nodes = 0
+    total_generated = 0
+    total_probes = 0
+    total_hits = 0
+    total_seconds = 0.0
+    for name, fen in positions:
+        board = Board()
+        board.set_fen(fen)
+        searcher = Searcher(board)
+        best_time = float("inf")
+        for _ in range(repeat):
+            # Every run starts cold, so repeats do not feed on each other
+            searcher.tt.clear()
+            searcher.pawns.clear()
+            t0 = time.perf_counter()
+            move, _ = searcher.search(depth)
+            best_time = min(best_time, time.perf_counter() - t0)
+        results[name] = {
+            "nodes": searcher.nodes,
+            "gen_per_node": searcher.generated / searcher.nodes,
+            "pawn_hit_rate": searcher.pawns.hit_rate(),
+            "seconds": best_time,
+            "nps": searcher.nodes / best_time,
+            "best": move_to_uci(move) if move is not None else "0000",
+        }
+        total_nodes += searcher.nodes
+        total_generated += searcher.generated
+        total_probes += searcher.pawns.probes
+        total_hits += searcher.pawns.hits
+        total_seconds += best_time
+    results["total"] = {
+        "nodes": total_nodes,
+        "gen_per_node": total_generated / total_nodes,
+        "pawn_hit_rate": total_hits / total_probes if total_probes else 0.0,
+        "seconds": total_seconds,
+        "nps": total_nodes / total_seconds,
+        "best": "",
+    }
+    return results
+
+
+def _smp_totals(
+    threads: int, depth: int, positions: List[Tuple[str, str]]
+) -> Dict[str, float]:
+    """{"seconds", "nodes"} summed over `positions` with `threads`."""
+    limits = SearchLimits(depth=depth)
+    seconds = 0.0
+    nodes = 0
+    pool = HelperPool(threads - 1, SMP_HASH_MB) if threads > 1 else None
+    try:
+        for _, fen in positions:
+            board = Board()
+            board.set_fen(fen)
+            if pool is not None:
+                tt = pool.tt
+                tt.clear()
+            else:
+                tt = TranspositionTable(SMP_HASH_MB)
+            searcher = Searcher(board, tt=tt)
+            t0 = time.perf_counter()
+            if pool is not None:
+                pool.start(board, limits)
+            searcher.search(limits=limits)
+            seconds += time.perf_counter() - t0
+            nodes += searcher.nodes
+            if pool is not None:
+                nodes += sum(r.nodes for r in pool.stop())
+    finally:
+        if pool is not None:
+            pool.close()
+    return {"seconds": seconds, "nodes": nodes}
+
+
+def run_smp(
+    depth: int,
+    thread_counts: List[int],
+    positions: List[Tuple[str, str]] = QUICK_POSITIONS,
+) -> Dict[str, Dict[str, float]]:
+    """
+    {threads: {"seconds", "nodes", "nps", "speedup", "nps_scaling"}},
+    speedups relative to the first count.
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    base = None
+    for threads in thread_counts:
+        row = _smp_totals(threads, depth, positions)
+        row["nps"] = row["nodes"] / row["seconds"]
+        if base is None:
+            base = row
+        row["speedup"] = base["seconds"] / row["seconds"]
+        row["nps_scaling"] = row["nps"] / base["nps"]
+        results[str(threads)] = row
+    return results
+
+
+# Child program: time the load, report seconds and peak RSS as JSON
+_MAGIC_LOAD_CHILD = """
+import json, resource, time
+t0 = time.perf_counter()
+from engine.bitboard.magic_blob import layout_from_modules, load_magic_tables
+if {binary!r}:
+    source = load_magic_tables()[3]
+    assert source == "binary", "magic_tables.bin missing or stale"
+else:
+    layout = layout_from_modules()
+elapsed = time.perf_counter() - t0
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": elapsed, "max_rss_kb": rss}}))
+"""
+
+
+def _magic_load_sample(
+    binary: bool, pycache: Optional[str]
+) -> Dict[str, float]:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(project_root)
+    if pycache is not None:
+        env["PYTHONPYCACHEPREFIX"] = pycache
+    out = subprocess.run(
+        [sys.executable, "-c", _MAGIC_LOAD_CHILD.format(binary=binary)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(out)
+
+
+def run_magic_load(runs: int) -> Dict[str, Dict[str, float]]:
+    """
+    {"python|binary/warm|cold": {"median_ms", "max_rss_kb"}}; cold runs
+    get a fresh ``PYTHONPYCACHEPREFIX``, which forces recompilation.
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    for fmt, binary in (("python", False), ("binary", True)):
+        for mode in ("warm", "cold"):
+            samples: List[Dict[str, float]] = []
+            for _ in range(runs):
+                if mode == "cold":
+                    with tempfile.TemporaryDirectory() as tmp:
+                        samples.append(_magic_load_sample(binary, tmp))
+                else:
+                    samples.append(_magic_load_sample(binary, None))
+            results[f"{fmt}/{mode}"] = {
+                "median_ms": 1000
+                * statistics.median(s["seconds"] for s in samples),
+                "max_rss_kb": max(s["max_rss_kb"] for s in samples),
+            }
+    return results
+
+
+def _print_suite(report: Dict[str, object]) -> None:
+    print(f"{'part':<22} {'nodes':>10} {'seconds':>9} {'nodes/s':>9}")
+    for part in ("perft", "search"):
+        if part not in report:
+            continue
+        summary = report[part]["summary"]  # type: ignore[index]
+        for name, row in summary.items():
+            print(
+                f"{part + '/' + name:<22} {row['nodes']:>10d}"
+                f" {row['seconds']:>9.3f} {row['nps']:>9.0f}"
+            )
+    print(f"signature {report['signature']}")
+
+
+def _print_generators(results: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'generator':<12} {'nodes':>10} {'seconds':>9} {'nodes/s':>10}")
+    for name, row in results.items():
+        print(
+            f"{name:<12} {row['nodes']:>10d} {row['seconds']:>9.3f}"
+            f" {row['nps']:>10.0f}"
+        )
+
+
+def _print_search_stats(results: Dict[str, Dict[str, object]]) -> None:
+    print(
+        f"{'position':<10} {'nodes':>9} {'gen/node':>8} {'pawn hit':>8}"
+        f" {'seconds':>9} {'nodes/s':>9} {'best':>6}"
+    )
+    for name, row in results.items():
+        print(
+            f"{name:<10} {row['nodes']:>9d} {row['gen_per_node']:>8.2f}"
+            f" {row['pawn_hit_rate']:>8.1%} {row['seconds']:>9.3f}"
+            f" {row['nps']:>9.0f} {row['best']:>6}"
+        )
+
+
+def _print_smp(results: Dict[str, Dict[str, float]]) -> None:
+    print(
+        f"{'threads':>7} {'seconds':>9} {'speedup':>7} {'nodes':>9}"
+        f" {'nodes/s':>9} {'scaling':>7}"
+    )
+    for threads, row in results.items():
+        print(
+            f"{threads:>7} {row['seconds']:>9.3f} {row['speedup']:>7.2f}"
+            f" {row['nodes']:>9d} {row['nps']:>9.0f}"
+            f" {row['nps_scaling']:>7.2f}"
+        )
+
+
+def _print_magic_load(results: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'format/mode':<14} {'median ms':>10} {'max RSS kB':>11}")
+    for name, row in results.items():
+        print(
+            f"{name:<14} {row['median_ms']:>10.1f} {row['max_rss_kb']:>11d}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument(
+        "--perft-depth",
+        type=int,
+        default=DEFAULT_PERFT_DEPTH,
+        help="perft depth, 0 to skip perft",
+    )
+    ap.add_argument(
+        "--search-depth",
+        type=int,
+        default=DEFAULT_SEARCH_DEPTH,
+        help="search depth, 0 to skip the search",
+    )
+    ap.add_argument(
+        "--search-nodes", type=int, help="node limit per searched position"
+    )
+    ap.add_argument("--mode", choices=MODES, default="suite")
+    ap.add_argument(
+        "--depth",
+        type=int,
+        help="perft or search depth of the other modes"
+        " (default 3 for generators, 4 otherwise)",
+    )
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument(
+        "--copy-make",
+        action="store_true",
+        help="generators: also time copy-make (Board.make_move_copy) perft",
+    )
+    ap.add_argument(
+        "--threads", default="1,2,4", help="smp: comma-separated counts"
+    )
+    ap.add_argument("--runs", type=int, default=5, help="magic-load runs")
+    ap.add_argument("--json", action="store_true", help="emit JSON")
+    ap.add_argument("--output", help="also write the JSON report here")
+    args = ap.parse_args(argv)
+
+    depth = args.depth
+    if depth is None:
+        depth = 3 if args.mode == "generators" else 4
+    report: Dict[str, Any]
+    if args.mode == "suite":
+        report = bench(args.perft_depth, args.search_depth, args.search_nodes)
+        show: Callable[..., None] = _print_suite
+    elif args.mode == "generators":
+        report = run_generators(depth, args.repeat, args.copy_make)
+        show = _print_generators
+    elif args.mode == "search":
+        report = run_search_stats(depth, args.repeat)
+        show = _print_search_stats
+    elif args.mode == "smp":
+        counts = [int(t) for t in args.threads.split(",")]
+        report = run_smp(depth, counts)
+        show = _print_smp
+    else:
+        report = run_magic_load(args.runs)
+        show = _print_magic_load
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    show(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,22 @@
 # engine/bitboard/board.py
 
-from typing import List, Optional
+from typing import List, Optional, TYPE_CHECKING
 from engine.bitboard.config import RawHistoryEntry  # noqa : TC001
+from engine.bitboard.config import AnyMove  # noqa : TC001
 from engine.bitboard.attack_utils import (
+    attacked_squares,
     is_square_attacked as _is_square_attacked,
 )
+from engine.bitboard.psqt import (
+    PHASE_WEIGHTS,
+    PSQ_EG,
+    PSQ_MG,
+    psq_from_scratch,
+)
+from engine.bitboard.undo import RawHistoryView
+
+if TYPE_CHECKING:  # pragma: no cover - type hints only
+    from engine.bitboard.profiler import Profiler
 from engine.bitboard.utils import algebraic_to_index, index_to_algebraic
 from engine.bitboard.constants import (
     INITIAL_MASKS,
@@ -33,6 +45,15 @@ from engine.bitboard.constants import (
     ZOBRIST_SIDE_KEY,
     ZOBRIST_CASTLE_KEYS,
     ZOBRIST_EP_KEYS,
+    MOVE_SQ_MASK,
+    MOVE_DST_SHIFT,
+    MOVE_FLAG_CAPTURE,
+    MOVE_FLAG_EN_PASSANT,
+    MOVE_FLAG_CASTLING,
+    MOVE_PROMO_SHIFT,
+    MOVE_PROMO_MASK,
+    PROMO_PIECES,
+    UNDO_STACK_SIZE,
 )
 
 PROMO_MAP_WHITE = {
@@ -48,6 +69,9 @@ PROMO_MAP_BLACK = {
     "Q": BLACK_QUEEN,
 }
 
+# Pieces hashed into pawn_key
+PAWN_KEY_PIECES = frozenset((WHITE_PAWN, WHITE_KING, BLACK_PAWN, BLACK_KING))
+
 castle_map = {
     CASTLE_WHITE_KINGSIDE: ZOBRIST_CASTLE_KEYS["K"],
     CASTLE_WHITE_QUEENSIDE: ZOBRIST_CASTLE_KEYS["Q"],
@@ -58,12 +82,37 @@ castle_map = {
 
 class Board:
 
+    __slots__ = (
+        "bitboards",
+        "white_occ",
+        "black_occ",
+        "all_occ",
+        "ep_square",
+        "undo_stack",
+        "ply",
+        "halfmove_clock",
+        "fullmove_number",
+        "side_to_move",
+        "castling_rights",
+        "square_to_piece",
+        "zobrist_key",
+        "zobrist_history",
+        "pawn_key",
+        "psq_mg",
+        "psq_eg",
+        "phase",
+        "attack_maps",
+        "profiler",
+    )
+
     bitboards: List[int]
     white_occ: int
     black_occ: int
     all_occ: int
     ep_square: Optional[int]
-    raw_history: List[RawHistoryEntry]  # Raw history records
+    # undo_stack[:ply] holds one RawHistoryEntry per move made
+    undo_stack: List[Optional[RawHistoryEntry]]
+    ply: int
     halfmove_clock: int
     fullmove_number: int
     side_to_move: int
@@ -71,8 +120,23 @@ class Board:
     square_to_piece: List[Optional[int]]
     zobrist_key: int
     zobrist_history: List[int]
+    # Zobrist key of the pawns and kings only, for the pawn hash table
+    pawn_key: int
+    # Material + piece-square sums (white minus black) and game phase,
+    # see psqt.py
+    psq_mg: int
+    psq_eg: int
+    phase: int
+    attack_maps: List[Optional[int]]
+    # Counts make/undo/in_check calls while set, see Profiler.attach
+    profiler: Optional["Profiler"]
 
     def __init__(self):
+        # attack_maps[side] = squares attacked by `side`, or None until
+        # first asked for; cleared whenever the position changes
+        self.attack_maps = [None, None]
+        self.profiler = None
+
         # a list of 12 ints, one per piece-type
         self.bitboards = [0] * 12
 
@@ -84,8 +148,10 @@ class Board:
         # En_passant flag/square
         self.ep_square: Optional[int] = None
 
-        # History of all moves
-        self.raw_history = []
+        # History of all moves: a preallocated stack indexed by ply,
+        # so make/undo never resize a list
+        self.undo_stack = [None] * UNDO_STACK_SIZE
+        self.ply = 0
 
         # Move counts half and full
         self.halfmove_clock = 0  # counts plies since last pawn move or capture
@@ -165,6 +231,25 @@ class Board:
         # Also used for testing purposes
         self.zobrist_history = [self.zobrist_key]
 
+        self._compute_eval_from_scratch()
+
+    def _compute_eval_from_scratch(self) -> None:
+        """
+        Rebuild the evaluation sums and the pawn key, and start a fresh
+        evaluation history.
+        """
+        self.psq_mg, self.psq_eg, self.phase = psq_from_scratch(
+            self.bitboards
+        )
+        key = 0
+        for piece_idx in PAWN_KEY_PIECES:
+            bb = self.bitboards[piece_idx]
+            while bb:
+                lsb = bb & -bb
+                key ^= ZOBRIST_PIECE_KEYS[piece_idx][lsb.bit_length() - 1]
+                bb ^= lsb
+        self.pawn_key = key
+
     def _compute_zobrist_from_scratch(self) -> None:
         key = 0
         # Piece XOR for all pieces
@@ -191,6 +276,66 @@ class Board:
 
         self.zobrist_key = key
 
+    def copy(self) -> "Board":
+        """
+        Return an independent snapshot of this position, including its
+        move and zobrist history (so the copy can undo past the split).
+        """
+        other = Board.__new__(Board)
+        other.bitboards = self.bitboards[:]
+        other.white_occ = self.white_occ
+        other.black_occ = self.black_occ
+        other.all_occ = self.all_occ
+        other.ep_square = self.ep_square
+        # Only the moves made; make_move_raw regrows the rest
+        other.undo_stack = self.undo_stack[: self.ply]
+        other.ply = self.ply
+        other.halfmove_clock = self.halfmove_clock
+        other.fullmove_number = self.fullmove_number
+        other.side_to_move = self.side_to_move
+        other.castling_rights = self.castling_rights
+        other.square_to_piece = self.square_to_piece[:]
+        other.zobrist_key = self.zobrist_key
+        other.zobrist_history = self.zobrist_history[:]
+        other.psq_mg = self.psq_mg
+        other.psq_eg = self.psq_eg
+        other.phase = self.phase
+        other.pawn_key = self.pawn_key
+        other.attack_maps = self.attack_maps[:]
+        other.profiler = None
+        return other
+
+    def make_move_copy(self, raw_move: AnyMove) -> "Board":
+        """
+        Copy-make: return a new Board with `raw_move` played, leaving
+        this one untouched, so the caller never needs to undo. The
+        child's undo stack holds only this move; its zobrist history
+        is the full line, so repetition checks still work.
+        """
+        child = Board.__new__(Board)
+        child.bitboards = self.bitboards[:]
+        child.white_occ = self.white_occ
+        child.black_occ = self.black_occ
+        child.all_occ = self.all_occ
+        child.ep_square = self.ep_square
+        child.undo_stack = [None]
+        child.ply = 0
+        child.halfmove_clock = self.halfmove_clock
+        child.fullmove_number = self.fullmove_number
+        child.side_to_move = self.side_to_move
+        child.castling_rights = self.castling_rights
+        child.square_to_piece = self.square_to_piece[:]
+        child.zobrist_key = self.zobrist_key
+        child.zobrist_history = self.zobrist_history[:]
+        child.psq_mg = self.psq_mg
+        child.psq_eg = self.psq_eg
+        child.phase = self.phase
+        child.pawn_key = self.pawn_key
+        child.attack_maps = [None, None]
+        child.profiler = None
+        child.make_move_raw(raw_move)
+        return child
+
     def get_piece_char(self, square: int) -> Optional[str]:
         """
         Return the piece character on the given square, or None if empty.
@@ -208,7 +353,8 @@ class Board:
           - self.ep_square
           - self.halfmove_clock
           - self.fullmove_number
-        Then rebuild occupancies and square_to_piece.
+        Then rebuild occupancies, square_to_piece and the zobrist key,
+        and start a fresh move history.
         """
         parts = fen.strip().split()
         if len(parts) != 6:
@@ -285,6 +431,12 @@ class Board:
                 self.square_to_piece[sq] = idx
                 b ^= lsb
 
+        # 9) Fresh hash and history for the new position
+        self._compute_zobrist_from_scratch()
+        self.zobrist_history = [self.zobrist_key]
+        self._compute_eval_from_scratch()
+        self.ply = 0
+
     def get_fen(self) -> str:
         """
         Serialize current board state into a FEN string.
@@ -345,30 +497,74 @@ class Board:
             b |= self.bitboards[i]
         self.black_occ = b
         self.all_occ = self.white_occ | self.black_occ
+        self.attack_maps[WHITE] = self.attack_maps[BLACK] = None
+
+    @property
+    def raw_history(self) -> RawHistoryView:
+        """The moves on the undo stack as RawHistoryEntry tuples."""
+        return RawHistoryView(self)
 
     def is_square_attacked(self, square: int, attacker_side: int) -> bool:
         return _is_square_attacked(self, square, attacker_side)
 
+    def attacks_by(self, side: int) -> int:
+        """
+        Bitboard of every square `side` attacks, computed on first use
+        and cached until the next make/undo/set_fen.
+        """
+        attacks = self.attack_maps[side]
+        if attacks is None:
+            attacks = attacked_squares(self.bitboards, side, self.all_occ)
+            self.attack_maps[side] = attacks
+        return attacks
+
     def in_check(self, side: int) -> bool:
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.in_checks[self.ply - profiler.root] += 1
         if side == WHITE:
             king_bb = self.bitboards[WHITE_KING]
         else:
             king_bb = self.bitboards[BLACK_KING]
         if king_bb == 0:
             return False
-        king_sq = king_bb.bit_length() - 1
         attacker = BLACK if side == WHITE else WHITE
+        # A single AND if the attack map already exists; otherwise a
+        # square test is cheaper than building the whole map
+        attacks = self.attack_maps[attacker]
+        if attacks is not None:
+            return bool(attacks & king_bb)
+        king_sq = king_bb.bit_length() - 1
         return _is_square_attacked(self, king_sq, attacker)
 
-    def make_move_raw(
-        self, raw_move: tuple[int, int, bool, Optional[str], bool, bool]
-    ) -> None:
-        src, dst, capture, promotion, en_passant, castling = raw_move
+    def make_move_raw(self, raw_move: AnyMove) -> None:
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.makes[self.ply - profiler.root] += 1
+        # Accept both RawMove tuples and packed int moves
+        if type(raw_move) is int:
+            src = raw_move & MOVE_SQ_MASK
+            dst = (raw_move >> MOVE_DST_SHIFT) & MOVE_SQ_MASK
+            capture = bool(raw_move & MOVE_FLAG_CAPTURE)
+            promotion = PROMO_PIECES[
+                (raw_move >> MOVE_PROMO_SHIFT) & MOVE_PROMO_MASK
+            ]
+            en_passant = bool(raw_move & MOVE_FLAG_EN_PASSANT)
+            castling = bool(raw_move & MOVE_FLAG_CASTLING)
+        else:
+            src, dst, capture, promotion, en_passant, castling = raw_move
 
         old_ep = self.ep_square
         prev_side = self.side_to_move
         old_castling = self.castling_rights
+        old_halfmove = self.halfmove_clock
+        old_fullmove = self.fullmove_number
+        old_mg = self.psq_mg
+        old_eg = self.psq_eg
+        old_phase = self.phase
+        old_pawn_key = self.pawn_key
         self.ep_square = None
+        self.attack_maps[WHITE] = self.attack_maps[BLACK] = None
 
         piece_idx = self.square_to_piece[src]
         if piece_idx is None:
@@ -382,6 +578,12 @@ class Board:
 
         # remove from src
         self.zobrist_key ^= ZOBRIST_PIECE_KEYS[piece_idx][src]
+        mg = self.psq_mg - PSQ_MG[piece_idx][src]
+        eg = self.psq_eg - PSQ_EG[piece_idx][src]
+        phase = self.phase
+        pawn_key = self.pawn_key
+        if piece_idx in PAWN_KEY_PIECES:
+            pawn_key ^= ZOBRIST_PIECE_KEYS[piece_idx][src]
         self.bitboards[piece_idx] ^= 1 << src
         self.square_to_piece[src] = None
         if piece_idx < 6:
@@ -408,6 +610,11 @@ class Board:
                     f"make_move_raw: no captured piece at {cap_sq}"
                 )
             self.zobrist_key ^= ZOBRIST_PIECE_KEYS[captured_idx][cap_sq]
+            mg -= PSQ_MG[captured_idx][cap_sq]
+            eg -= PSQ_EG[captured_idx][cap_sq]
+            phase -= PHASE_WEIGHTS[captured_idx]
+            if captured_idx in PAWN_KEY_PIECES:
+                pawn_key ^= ZOBRIST_PIECE_KEYS[captured_idx][cap_sq]
             self.bitboards[captured_idx] ^= 1 << cap_sq
             self.square_to_piece[cap_sq] = None
             if captured_idx < 6:
@@ -442,15 +649,27 @@ class Board:
         elif piece_idx == WHITE_ROOK:
             # Rook move clears the *correct* White side depending on src:
             if src == 0:  # a1
-                self.castling_rights &= ~CASTLE_WHITE_KINGSIDE
-            elif src == 7:  # h1
                 self.castling_rights &= ~CASTLE_WHITE_QUEENSIDE
+            elif src == 7:  # h1
+                self.castling_rights &= ~CASTLE_WHITE_KINGSIDE
         elif piece_idx == BLACK_ROOK:
             # Similarly for Black rooks:
             if src == 56:  # a8
-                self.castling_rights &= ~CASTLE_BLACK_KINGSIDE
+                self.castling_rights &= ~CASTLE_BLACK_QUEENSIDE
             elif src == 63:  # h8
+                self.castling_rights &= ~CASTLE_BLACK_KINGSIDE
+
+        # capturing a rook on its home corner removes that castling right
+        if captured_idx == WHITE_ROOK:
+            if cap_sq == 0:
+                self.castling_rights &= ~CASTLE_WHITE_QUEENSIDE
+            elif cap_sq == 7:
+                self.castling_rights &= ~CASTLE_WHITE_KINGSIDE
+        elif captured_idx == BLACK_ROOK:
+            if cap_sq == 56:
                 self.castling_rights &= ~CASTLE_BLACK_QUEENSIDE
+            elif cap_sq == 63:
+                self.castling_rights &= ~CASTLE_BLACK_KINGSIDE
 
         # castling rook move
         if castling:
@@ -462,6 +681,8 @@ class Board:
                 self.bitboards[WHITE_ROOK] |= 1 << 5
                 self.square_to_piece[5] = WHITE_ROOK
                 self.white_occ |= 1 << 5
+                mg += PSQ_MG[WHITE_ROOK][5] - PSQ_MG[WHITE_ROOK][7]
+                eg += PSQ_EG[WHITE_ROOK][5] - PSQ_EG[WHITE_ROOK][7]
             # white queenside
             elif piece_idx == WHITE_KING and src == 4 and dst == 2:
                 self.bitboards[WHITE_ROOK] ^= 1 << 0
@@ -470,6 +691,8 @@ class Board:
                 self.bitboards[WHITE_ROOK] |= 1 << 3
                 self.square_to_piece[3] = WHITE_ROOK
                 self.white_occ |= 1 << 3
+                mg += PSQ_MG[WHITE_ROOK][3] - PSQ_MG[WHITE_ROOK][0]
+                eg += PSQ_EG[WHITE_ROOK][3] - PSQ_EG[WHITE_ROOK][0]
             # black kingside
             elif piece_idx == BLACK_KING and src == 60 and dst == 62:
                 self.bitboards[BLACK_ROOK] ^= 1 << 63
@@ -478,6 +701,8 @@ class Board:
                 self.bitboards[BLACK_ROOK] |= 1 << 61
                 self.square_to_piece[61] = BLACK_ROOK
                 self.black_occ |= 1 << 61
+                mg += PSQ_MG[BLACK_ROOK][61] - PSQ_MG[BLACK_ROOK][63]
+                eg += PSQ_EG[BLACK_ROOK][61] - PSQ_EG[BLACK_ROOK][63]
             # black queenside
             elif piece_idx == BLACK_KING and src == 60 and dst == 58:
                 self.bitboards[BLACK_ROOK] ^= 1 << 56
@@ -486,6 +711,8 @@ class Board:
                 self.bitboards[BLACK_ROOK] |= 1 << 59
                 self.square_to_piece[59] = BLACK_ROOK
                 self.black_occ |= 1 << 59
+                mg += PSQ_MG[BLACK_ROOK][59] - PSQ_MG[BLACK_ROOK][56]
+                eg += PSQ_EG[BLACK_ROOK][59] - PSQ_EG[BLACK_ROOK][56]
 
         if old_castling != self.castling_rights:
             # remove any old castling bits
@@ -501,8 +728,17 @@ class Board:
         if promotion:
             promo_map = PROMO_MAP_WHITE if piece_idx < 6 else PROMO_MAP_BLACK
             target_idx = promo_map[promotion]
+            phase += PHASE_WEIGHTS[target_idx]
 
         self.zobrist_key ^= ZOBRIST_PIECE_KEYS[target_idx][dst]
+        mg += PSQ_MG[target_idx][dst]
+        eg += PSQ_EG[target_idx][dst]
+        if target_idx in PAWN_KEY_PIECES:
+            pawn_key ^= ZOBRIST_PIECE_KEYS[target_idx][dst]
+        self.psq_mg = mg
+        self.psq_eg = eg
+        self.phase = phase
+        self.pawn_key = pawn_key
         self.bitboards[target_idx] |= 1 << dst
         self.square_to_piece[dst] = target_idx
         if target_idx < 6:
@@ -519,25 +755,38 @@ class Board:
 
         self.zobrist_history.append(self.zobrist_key)
         # push raw history record
-        self.raw_history.append(
-            (
-                piece_idx,
-                src,
-                dst,
-                captured_idx,
-                cap_sq,
-                old_ep,
-                prev_side,
-                old_castling,
-                promotion,
-                en_passant,
-                castling,
-                self.halfmove_clock,
-                self.fullmove_number,
-            )
+        ply = self.ply
+        if ply == len(self.undo_stack):
+            self.undo_stack.extend([None] * (ply + 1))
+        self.ply = ply + 1
+        self.undo_stack[ply] = (
+            piece_idx,
+            src,
+            dst,
+            captured_idx,
+            cap_sq,
+            old_ep,
+            prev_side,
+            old_castling,
+            promotion,
+            en_passant,
+            castling,
+            old_halfmove,
+            old_fullmove,
+            old_mg,
+            old_eg,
+            old_phase,
+            old_pawn_key,
         )
 
     def undo_move_raw(self) -> None:
+        ply = self.ply - 1
+        if ply < 0:
+            raise IndexError("undo_move_raw: no move to undo")
+        self.ply = ply
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.undos[ply - profiler.root] += 1
         (
             piece_idx,
             src,
@@ -552,8 +801,13 @@ class Board:
             castling,
             old_halfmove,
             old_fullmove,
-        ) = self.raw_history.pop()
+            old_mg,
+            old_eg,
+            old_phase,
+            old_pawn_key,
+        ) = self.undo_stack[ply]  # type: ignore[misc]
 
+        self.attack_maps[WHITE] = self.attack_maps[BLACK] = None
         self.halfmove_clock = old_halfmove
         self.fullmove_number = old_fullmove
         self.ep_square = old_ep
@@ -562,6 +816,10 @@ class Board:
 
         self.zobrist_history.pop()
         self.zobrist_key = self.zobrist_history[-1]
+        self.psq_mg = old_mg
+        self.psq_eg = old_eg
+        self.phase = old_phase
+        self.pawn_key = old_pawn_key
 
         if castling:
             if src == 4 and dst == 6:
@@ -8,6 +8,13 @@ imports at run-time:
 * ``engine/bitboard/rook_attack_table.py``
 * ``engine/bitboard/bishop_attack_table.py``
 
+and the binary blob ``engine/bitboard/magic_tables.bin``: the same tables
+in the flat "fancy magic" layout (one ``(mask, magic, shift, offset)``
+tuple per square plus a single attack array, see ``magic_blob.py``),
+which the move generators memory-map in preference to the modules.
+``--binary`` rewrites only the blob, from the modules that already
+exist, without searching for new magics.
+
 After those files exist you normally **do not** run this script again.
 Use the ``--force`` flag only when you deliberately change the
 relevant-mask definition or discover a bug in the reference attack
@@ -36,6 +43,12 @@ from engine.bitboard.constants import (  # noqa: E402
     BISHOP_OFFSETS,
     ROOK_OFFSETS,
 )
+from engine.bitboard.magic_blob import (  # noqa: E402
+    BLOB_PATH,
+    flatten_tables,
+    layout_from_modules,
+    write_blob,
+)
 
 # ---------------------------------------------------------------------------
 # Helper: atomic write to avoid half-written files if the process is killed
@@ -205,6 +218,17 @@ def find_magic(
     raise RuntimeError(f"No magic found for square {sq} within search bounds")
 
 
+# ---------------------------------------------------------------------------
+# Binary blob from the existing modules
+# ---------------------------------------------------------------------------
+
+
+def write_binary_from_modules() -> None:
+    """Write magic_tables.bin from the generated Python modules."""
+    write_blob(BLOB_PATH, layout_from_modules())
+    print(f"✅ Wrote {BLOB_PATH} ({BLOB_PATH.stat().st_size} bytes).")
+
+
 # ---------------------------------------------------------------------------
 # Main generator
 # ---------------------------------------------------------------------------
@@ -227,8 +251,17 @@ def main(argv: list[str] | None = None) -> None:
     ap.add_argument(
         "--seed", type=int, default=None, help="RNG seed for reproducibility"
     )
+    ap.add_argument(
+        "--binary",
+        action="store_true",
+        help="only (re)write magic_tables.bin from the existing modules",
+    )
     args = ap.parse_args(argv)
 
+    if args.binary:
+        write_binary_from_modules()
+        return
+
     if args.seed is not None:
         random.seed(args.seed)
 
@@ -364,6 +397,19 @@ def main(argv: list[str] | None = None) -> None:
     bish_lines.append("]\n")
     _atomic_write(paths["bishop"], "".join(bish_lines))
 
+    # 4) magic_tables.bin
+    layout = flatten_tables(
+        rel_rook,
+        rook_magics,
+        rook_shifts,
+        rook_tables,
+        rel_bish,
+        bishop_magics,
+        bishop_shifts,
+        bishop_tables,
+    )
+    write_blob(BLOB_PATH, layout)
+
     print("\n✅ Magic tables written successfully.")
 
 
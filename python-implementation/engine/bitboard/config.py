@@ -1,11 +1,16 @@
 # engine/bitboard/config.py
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Union
 
 # When True, all move‐generation returns "raw tuples" instead of Move objects
 USE_RAW_MOVES = False
 
 # A RawMove is exactly (src, dst, capture, promotion, en_passant, castling)
 RawMove = Tuple[int, int, bool, Optional[str], bool, bool]
+# A PackedMove is the same information packed into one int
+# (see MOVE_* in constants.py)
+PackedMove = int
+# Anything make_move_raw() accepts
+AnyMove = Union[RawMove, PackedMove]
 RawHistoryEntry = Tuple[
     int,  # piece_idx
     int,  # src square index
@@ -18,6 +23,10 @@ RawHistoryEntry = Tuple[
     Optional[str],  # promotion character (None if no promotion)
     bool,  # en_passant flag
     bool,  # castling flag
-    int,  # halfmove_clock after move
-    int,  # fullmove_number after move
+    int,  # halfmove_clock before move
+    int,  # fullmove_number before move
+    int,  # psq_mg before move
+    int,  # psq_eg before move
+    int,  # phase before move
+    int,  # pawn_key before move
 ]
@@ -54,16 +54,18 @@ FILE_H = FILE_A << 7
 # Mask for only integers from 0 to 63
 MASK_64 = (1 << 64) - 1  # 0xFFFFFFFFFFFFFFFF
 # Rank masks
+RANK_1 = 0x00000000000000FF  # white back rank (black promotes)
 RANK_2 = 0x000000000000FF00  # white starting pawns
 RANK_4 = 0x00000000FF000000  # (black pawns capturing en passant)
 RANK_5 = 0x000000FF00000000  # (white pawns capturing en passant)
 RANK_7 = 0x00FF000000000000  # black starting pawns
+RANK_8 = 0xFF00000000000000  # black back rank (white promotes)
 
 # Castling‐rights bitflags
-CASTLE_WHITE_KINGSIDE = 0b0010  # ‘K’
-CASTLE_WHITE_QUEENSIDE = 0b0001  # ‘Q’
-CASTLE_BLACK_KINGSIDE = 0b1000  # ‘k’
-CASTLE_BLACK_QUEENSIDE = 0b0100  # ‘q’
+CASTLE_WHITE_KINGSIDE = 0b0001  # ‘K’
+CASTLE_WHITE_QUEENSIDE = 0b0010  # ‘Q’
+CASTLE_BLACK_KINGSIDE = 0b0100  # ‘k’
+CASTLE_BLACK_QUEENSIDE = 0b1000  # ‘q’
 
 # A convenience mask for “all castling allowed”:
 CASTLE_ALL = (
@@ -73,6 +75,29 @@ CASTLE_ALL = (
     | CASTLE_BLACK_QUEENSIDE
 )
 
+# Packed move encoding: one int per move instead of a RawMove tuple.
+#   bits  0-5   source square
+#   bits  6-11  destination square
+#   bit   12    capture flag
+#   bit   13    en-passant flag
+#   bit   14    castling flag
+#   bits 15-17  promotion piece code (0 = none, see PROMO_PIECES)
+MOVE_SQ_MASK = 0x3F
+MOVE_DST_SHIFT = 6
+MOVE_FLAG_CAPTURE = 1 << 12
+MOVE_FLAG_EN_PASSANT = 1 << 13
+MOVE_FLAG_CASTLING = 1 << 14
+MOVE_PROMO_SHIFT = 15
+MOVE_PROMO_MASK = 0b111
+
+# Promotion code -> promotion character, and the reverse
+PROMO_PIECES = (None, "N", "B", "R", "Q")
+PROMO_CODES = {"N": 1, "B": 2, "R": 3, "Q": 4}
+
+# Plies preallocated on a board's undo stack; it doubles if a game or
+# search line runs longer
+UNDO_STACK_SIZE = 512
+
 # Zobrist hash constants (auto-generated)
 ZOBRIST_PIECE_KEYS = [
     [
@@ -0,0 +1,58 @@
+# engine/bitboard/evaluate.py
+
+"""Static evaluation in centipawns from the side to move's view.
+
+The score is a tapered blend of midgame and endgame material and
+piece-square sums (psqt.py) plus pawn structure (pawns.py), weighted by
+the game phase. Board updates the sums in make/undo and a PawnTable
+caches the pawn structure, so ``evaluate`` mostly costs a few attribute
+reads and a table probe; ``evaluate_from_scratch`` recomputes it all
+from the bitboards and serves as a debug cross-check of the incremental
+state.
+"""
+
+from typing import Optional
+
+from engine.bitboard.board import Board  # noqa: TC002
+from engine.bitboard.constants import WHITE
+from engine.bitboard.pawns import PawnTable, pawn_structure
+from engine.bitboard.psqt import PHASE_MAX, psq_from_scratch
+
+# Nominal centipawn value per piece type (pawn, knight, bishop, rook,
+# queen, king), for exchange evaluation and move ordering
+PIECE_VALUES = (100, 320, 330, 500, 900, 0)
+
+
+def tapered(mg: int, eg: int, phase: int) -> int:
+    """Blend midgame and endgame scores by game phase."""
+    # Early promotions can push the phase past its starting value
+    phase = min(phase, PHASE_MAX)
+    blend = mg * phase + eg * (PHASE_MAX - phase)
+    # Round towards zero, so that swapping colours only flips the sign
+    if blend < 0:
+        return -(-blend // PHASE_MAX)
+    return blend // PHASE_MAX
+
+
+def evaluate(board: Board, pawns: Optional[PawnTable] = None) -> int:
+    """
+    Tapered material, piece-square and pawn-structure score from the
+    side to move's view. The pawn structure comes from `pawns` when
+    given and is computed afresh otherwise.
+    """
+    if pawns is not None:
+        pawn_mg, pawn_eg = pawns.probe(board)
+    else:
+        pawn_mg, pawn_eg = pawn_structure(board)
+    score = tapered(
+        board.psq_mg + pawn_mg, board.psq_eg + pawn_eg, board.phase
+    )
+    return score if board.side_to_move == WHITE else -score
+
+
+def evaluate_from_scratch(board: Board) -> int:
+    """``evaluate`` recomputed from the bitboards alone."""
+    mg, eg, phase = psq_from_scratch(board.bitboards)
+    pawn_mg, pawn_eg = pawn_structure(board)
+    score = tapered(mg + pawn_mg, eg + pawn_eg, phase)
+    return score if board.side_to_move == WHITE else -score
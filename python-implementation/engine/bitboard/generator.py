@@ -1,5 +1,5 @@
-from typing import List
-from engine.bitboard.config import RawMove  # noqa: TC002
+from typing import Callable, Dict, List
+from engine.bitboard.config import AnyMove  # noqa: TC002
 from engine.bitboard.board import Board  # noqa: TC002
 from engine.bitboard.constants import (
     WHITE_PAWN,
@@ -15,15 +15,38 @@ from engine.bitboard.constants import (
     WHITE_KING,
     BLACK_KING,
     WHITE,
+    BLACK,
+    MASK_64,
 )
+from engine.bitboard.attack_utils import PAWN_ATTACKS
 
-from engine.bitboard.moves.king import generate_king_moves
-from engine.bitboard.moves.rook import generate_rook_moves
-from engine.bitboard.moves.queen import generate_queen_moves
-from engine.bitboard.moves.bishop import generate_bishop_moves
+from engine.bitboard.moves.king import (
+    generate_king_moves,
+    generate_king_captures,
+)
+from engine.bitboard.moves.rook import (
+    rook_attacks,
+    generate_rook_moves,
+    generate_rook_captures,
+)
+from engine.bitboard.moves.queen import (
+    generate_queen_moves,
+    generate_queen_captures,
+)
+from engine.bitboard.moves.bishop import (
+    bishop_attacks,
+    generate_bishop_moves,
+    generate_bishop_captures,
+)
 from engine.bitboard.moves.knight import (
+    KNIGHT_ATTACKS,
     knight_attacks,
     generate_knight_moves,
+    generate_knight_captures,
+)
+from engine.bitboard.legal import (
+    count_legal_moves,
+    generate_legal_moves_direct,
 )
 from engine.bitboard.moves.pawn import (
     pawn_single_push_targets,
@@ -31,6 +54,8 @@ from engine.bitboard.moves.pawn import (
     pawn_en_passant_targets,
     pawn_capture_targets,
     generate_pawn_moves,
+    generate_pawn_captures,
+    generate_pawn_quiets,
 )
 
 
@@ -38,31 +63,55 @@ __all__ = [
     # Knight API
     "knight_attacks",
     "generate_knight_moves",
+    "generate_knight_captures",
     # Pawn API
     "pawn_single_push_targets",
     "pawn_double_push_targets",
     "pawn_en_passant_targets",
     "pawn_capture_targets",
     "generate_pawn_moves",
+    "generate_pawn_captures",
+    "generate_pawn_quiets",
     # Bishop API
     "generate_bishop_moves",
+    "generate_bishop_captures",
     # Rook API
     "generate_rook_moves",
+    "generate_rook_captures",
     # Queen API
     "generate_queen_moves",
+    "generate_queen_captures",
     # King API
     "generate_king_moves",
+    "generate_king_captures",
+    # Tactical / quiet subsets (pseudo-legal)
+    "generate_captures",
+    "generate_quiets",
+    "generate_quiet_checks",
+    # Legal move generators
+    "generate_legal_moves",
+    "generate_legal_moves_direct",
+    "LEGAL_MOVE_GENERATORS",
+    # Legal move counting
+    "count_legal_moves",
 ]
 
+# Signature shared by every legal move generator: (board, packed) -> moves
+MoveGenerator = Callable[[Board, bool], List[AnyMove]]
+# Signature of a legal move counter: (board, packed) -> number of moves
+MoveCounter = Callable[[Board, bool], int]
+
 
 def generate_moves(
     board: Board,
-) -> List[RawMove]:
+    packed: bool = False,
+) -> List[AnyMove]:
     """
     Master move generator for the side to move.
     Calls each piece-type generator and collects all legal moves.
+    With `packed=True` every move is a packed int instead of a RawMove.
     """
-    moves: List[RawMove] = []
+    moves: List[AnyMove] = []
 
     # Pawn moves (including en-passant)
     if board.side_to_move == WHITE:
@@ -82,6 +131,7 @@ def generate_moves(
         board.all_occ,
         is_white,
         ep_mask=ep_mask,
+        packed=packed,
     )
 
     my_occ = board.white_occ if is_white else board.black_occ
@@ -92,6 +142,7 @@ def generate_moves(
         board.bitboards[WHITE_KNIGHT if is_white else BLACK_KNIGHT],
         my_occ,
         their_occ,
+        packed,
     )
 
     # Bishop
@@ -99,6 +150,7 @@ def generate_moves(
         board.bitboards[WHITE_BISHOP if is_white else BLACK_BISHOP],
         my_occ,
         their_occ,
+        packed,
     )
 
     # Rook
@@ -106,12 +158,14 @@ def generate_moves(
         board.bitboards[WHITE_ROOK if is_white else BLACK_ROOK],
         my_occ,
         their_occ,
+        packed,
     )
 
     moves += generate_queen_moves(
         board.bitboards[WHITE_QUEEN if is_white else BLACK_QUEEN],
         my_occ,
         their_occ,
+        packed,
     )
 
     moves += generate_king_moves(
@@ -119,24 +173,168 @@ def generate_moves(
         board.bitboards[WHITE_KING if is_white else BLACK_KING],
         my_occ,
         their_occ,
+        packed,
     )
     return moves
 
 
 def generate_legal_moves(
     board: Board,
-) -> List[RawMove]:
+    packed: bool = False,
+) -> List[AnyMove]:
     """
     Wraps generate_moves(board) and returns only those moves
     that do not leave the side-to-move's king in check.
+    With `packed=True` every move is a packed int instead of a RawMove.
     """
-    legal_moves: List[RawMove] = []
+    legal_moves: List[AnyMove] = []
     side = board.side_to_move
 
-    pseudo_moves = generate_moves(board)
+    pseudo_moves = generate_moves(board, packed)
     for move in pseudo_moves:
         board.make_move_raw(move)
         if not board.in_check(side):
             legal_moves.append(move)
         board.undo_move_raw()
     return legal_moves
+
+
+def generate_captures(
+    board: Board,
+    packed: bool = False,
+) -> List[AnyMove]:
+    """
+    The tactical subset of generate_moves: captures (including en
+    passant) and promotions. Quiet moves are never generated.
+    """
+    is_white = board.side_to_move == WHITE
+    bbs = board.bitboards
+    my_occ = board.white_occ if is_white else board.black_occ
+    their_occ = board.black_occ if is_white else board.white_occ
+    ep_mask = (1 << board.ep_square) if board.ep_square else 0
+    off = 0 if is_white else 6
+
+    moves = generate_pawn_captures(
+        bbs[WHITE_PAWN + off],
+        their_occ,
+        board.all_occ,
+        is_white,
+        ep_mask=ep_mask,
+        packed=packed,
+    )
+    moves += generate_knight_captures(
+        bbs[WHITE_KNIGHT + off], my_occ, their_occ, packed
+    )
+    moves += generate_bishop_captures(
+        bbs[WHITE_BISHOP + off], my_occ, their_occ, packed
+    )
+    moves += generate_rook_captures(
+        bbs[WHITE_ROOK + off], my_occ, their_occ, packed
+    )
+    moves += generate_queen_captures(
+        bbs[WHITE_QUEEN + off], my_occ, their_occ, packed
+    )
+    moves += generate_king_captures(
+        board, bbs[WHITE_KING + off], my_occ, their_occ, packed
+    )
+    return moves
+
+
+def generate_quiets(
+    board: Board,
+    packed: bool = False,
+) -> List[AnyMove]:
+    """
+    Everything generate_moves returns that generate_captures does not:
+    non-promoting pushes, piece moves to empty squares and castling.
+    """
+    is_white = board.side_to_move == WHITE
+    bbs = board.bitboards
+    my_occ = board.white_occ if is_white else board.black_occ
+    their_occ = board.black_occ if is_white else board.white_occ
+    empty = ~board.all_occ & MASK_64
+    off = 0 if is_white else 6
+
+    moves = generate_pawn_quiets(
+        bbs[WHITE_PAWN + off], board.all_occ, is_white, packed
+    )
+    moves += generate_knight_moves(
+        bbs[WHITE_KNIGHT + off], my_occ, their_occ, packed, empty
+    )
+    moves += generate_bishop_moves(
+        bbs[WHITE_BISHOP + off], my_occ, their_occ, packed, empty
+    )
+    moves += generate_rook_moves(
+        bbs[WHITE_ROOK + off], my_occ, their_occ, packed, empty
+    )
+    moves += generate_queen_moves(
+        bbs[WHITE_QUEEN + off], my_occ, their_occ, packed, empty
+    )
+    moves += generate_king_moves(
+        board, bbs[WHITE_KING + off], my_occ, their_occ, packed, empty
+    )
+    return moves
+
+
+def generate_quiet_checks(
+    board: Board,
+    packed: bool = False,
+) -> List[AnyMove]:
+    """
+    The quiet moves that give direct check: every piece is only
+    generated onto the squares from which it would attack the enemy
+    king. Discovered checks and checks by castling are not included.
+    """
+    is_white = board.side_to_move == WHITE
+    bbs = board.bitboards
+    off = 0 if is_white else 6
+    enemy_king = bbs[BLACK_KING if is_white else WHITE_KING]
+    if not enemy_king:
+        return []
+    ksq = enemy_king.bit_length() - 1
+    occ = board.all_occ
+    empty = ~occ & MASK_64
+    my_occ = board.white_occ if is_white else board.black_occ
+    their_occ = board.black_occ if is_white else board.white_occ
+    diagonal = bishop_attacks(ksq, occ) & empty
+    straight = rook_attacks(ksq, occ) & empty
+
+    # A pawn of ours on s attacks ksq iff s is a square an enemy pawn on
+    # ksq would attack
+    moves = generate_pawn_quiets(
+        bbs[WHITE_PAWN + off],
+        occ,
+        is_white,
+        packed,
+        PAWN_ATTACKS[BLACK if is_white else WHITE][ksq] & empty,
+    )
+    moves += generate_knight_moves(
+        bbs[WHITE_KNIGHT + off],
+        my_occ,
+        their_occ,
+        packed,
+        KNIGHT_ATTACKS[ksq] & empty,
+    )
+    moves += generate_bishop_moves(
+        bbs[WHITE_BISHOP + off], my_occ, their_occ, packed, diagonal
+    )
+    moves += generate_rook_moves(
+        bbs[WHITE_ROOK + off], my_occ, their_occ, packed, straight
+    )
+    moves += generate_queen_moves(
+        bbs[WHITE_QUEEN + off],
+        my_occ,
+        their_occ,
+        packed,
+        diagonal | straight,
+    )
+    return moves
+
+
+# Selectable legal move generators:
+#   "filter" - pseudo-legal moves filtered through make/in_check/undo
+#   "direct" - pin- and check-aware generation, no make/undo per move
+LEGAL_MOVE_GENERATORS: Dict[str, MoveGenerator] = {
+    "filter": generate_legal_moves,
+    "direct": generate_legal_moves_direct,
+}
@@ -0,0 +1,211 @@
+# engine/bitboard/magic_blob.py
+
+"""Flat ("fancy magic") layout of the rook/bishop attack tables.
+
+Every square gets one ``(mask, magic, shift, offset)`` tuple and all
+attack sets live in a single flat array, rook tables first, then bishop
+tables, so a lookup is
+
+    attacks[offset + ((((occ & mask) * magic) & MASK_64) >> shift)]
+
+``build_magics.py`` writes the layout to ``magic_tables.bin`` next to
+this module as little-endian u64 words behind an 8-byte signature:
+
+  * rook entries ``[64 * 4]``, then bishop entries ``[64 * 4]``
+  * the number of attack sets, then the attack sets themselves
+
+``load_magic_tables`` maps the file read-only, so every process that
+imports the engine shares the same page-cache pages. If the blob is
+missing, was built for other magics than ``magic_constants.py``, or the
+host is big-endian, the layout is built from the generated Python
+modules instead.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import sys
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import List, Optional, Sequence, Tuple
+
+BLOB_PATH = Path(__file__).with_name("magic_tables.bin")
+BLOB_SIGNATURE = b"BBMAGIC2"
+
+# (relevant mask, magic, shift, offset into the flat attack array)
+MagicEntry = Tuple[int, int, int, int]
+
+# (rook entries, bishop entries, flat attack sets)
+MagicLayout = Tuple[List[MagicEntry], List[MagicEntry], Sequence[int]]
+
+# Keeps the mapping alive for as long as the views handed out exist
+_mapped: List[mmap.mmap] = []
+
+
+def flatten_tables(
+    rook_masks: Sequence[int],
+    rook_magics: Sequence[int],
+    rook_shifts: Sequence[int],
+    rook_tables: Sequence[Sequence[int]],
+    bishop_masks: Sequence[int],
+    bishop_magics: Sequence[int],
+    bishop_shifts: Sequence[int],
+    bishop_tables: Sequence[Sequence[int]],
+) -> MagicLayout:
+    """Concatenate per-square tables into the flat layout."""
+    attacks: List[int] = []
+    entries: List[List[MagicEntry]] = []
+    for masks, magics, shifts, tables in (
+        (rook_masks, rook_magics, rook_shifts, rook_tables),
+        (bishop_masks, bishop_magics, bishop_shifts, bishop_tables),
+    ):
+        piece: List[MagicEntry] = []
+        for sq in range(64):
+            piece.append((masks[sq], magics[sq], shifts[sq], len(attacks)))
+            attacks.extend(tables[sq])
+        entries.append(piece)
+    return entries[0], entries[1], attacks
+
+
+def write_blob(path: Path, layout: MagicLayout) -> None:
+    """
+    Serialise a flat layout to `path`. The blob is written next to it
+    and renamed into place: running engines keep `path` mapped, and
+    rewriting a mapped file in place would pull it out from under them.
+    """
+    rook_entries, bishop_entries, attacks = layout
+    words = array("Q")
+    for entry in rook_entries + bishop_entries:
+        words.extend(entry)
+    words.append(len(attacks))
+    words.extend(attacks)
+    if sys.byteorder != "little":
+        words.byteswap()
+    with NamedTemporaryFile(
+        "wb", delete=False, dir=path.parent, prefix=f"{path.name}."
+    ) as tmp:
+        tmp.write(BLOB_SIGNATURE + words.tobytes())
+    try:
+        # NamedTemporaryFile creates the file private to its owner
+        os.chmod(tmp.name, 0o644)
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.remove(tmp.name)
+        raise
+
+
+def _entries(words: memoryview, start: int) -> List[MagicEntry]:
+    """Read 64 consecutive (mask, magic, shift, offset) entries."""
+    return [
+        (
+            words[start + 4 * sq],
+            words[start + 4 * sq + 1],
+            words[start + 4 * sq + 2],
+            words[start + 4 * sq + 3],
+        )
+        for sq in range(64)
+    ]
+
+
+def load_blob(path: Path) -> Optional[MagicLayout]:
+    """
+    Map `path` and return its layout, with the attack sets as a
+    memoryview over the mapping, or None if the file is absent or
+    not a magic blob.
+    """
+    if sys.byteorder != "little" or not path.exists():
+        return None
+    if path.stat().st_size <= len(BLOB_SIGNATURE):
+        return None
+
+    with open(path, "rb") as fh:
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+    sig = len(BLOB_SIGNATURE)
+    raw = memoryview(mapped)
+    if raw[:sig] != BLOB_SIGNATURE or (len(raw) - sig) % 8:
+        raw.release()
+        mapped.close()
+        return None
+
+    words = raw[sig:].cast("Q")
+    if len(words) <= 512 or len(words) != 513 + words[512]:
+        words.release()
+        raw.release()
+        mapped.close()
+        return None
+
+    _mapped.append(mapped)
+    return _entries(words, 0), _entries(words, 256), words[513:]
+
+
+def load_python_tables() -> Tuple[
+    Sequence[Sequence[int]], Sequence[Sequence[int]]
+]:
+    """Import the generated per-square table modules (the slow path)."""
+    from engine.bitboard.rook_attack_table import ROOK_ATTACK_TABLE
+    from engine.bitboard.bishop_attack_table import BISHOP_ATTACK_TABLE
+
+    return ROOK_ATTACK_TABLE, BISHOP_ATTACK_TABLE
+
+
+def layout_from_modules() -> MagicLayout:
+    """Build the flat layout from magic_constants and the table modules."""
+    from engine.bitboard.magic_constants import (
+        RELEVANT_ROOK_MASKS,
+        ROOK_MAGICS,
+        ROOK_SHIFTS,
+        RELEVANT_BISHOP_MASKS,
+        BISHOP_MAGICS,
+        BISHOP_SHIFTS,
+    )
+
+    rook_tables, bishop_tables = load_python_tables()
+    return flatten_tables(
+        RELEVANT_ROOK_MASKS,
+        ROOK_MAGICS,
+        ROOK_SHIFTS,
+        rook_tables,
+        RELEVANT_BISHOP_MASKS,
+        BISHOP_MAGICS,
+        BISHOP_SHIFTS,
+        bishop_tables,
+    )
+
+
+def _matches_constants(layout: MagicLayout) -> bool:
+    """True if `layout` was built for the magics in magic_constants."""
+    from engine.bitboard.magic_constants import (
+        RELEVANT_ROOK_MASKS,
+        ROOK_MAGICS,
+        ROOK_SHIFTS,
+        RELEVANT_BISHOP_MASKS,
+        BISHOP_MAGICS,
+        BISHOP_SHIFTS,
+    )
+
+    rook_entries, bishop_entries, _ = layout
+    return [e[:3] for e in rook_entries] == list(
+        zip(RELEVANT_ROOK_MASKS, ROOK_MAGICS, ROOK_SHIFTS)
+    ) and [e[:3] for e in bishop_entries] == list(
+        zip(RELEVANT_BISHOP_MASKS, BISHOP_MAGICS, BISHOP_SHIFTS)
+    )
+
+
+@lru_cache(maxsize=None)
+def load_magic_tables() -> Tuple[
+    List[MagicEntry], List[MagicEntry], Sequence[int], str
+]:
+    """
+    Return (rook_entries, bishop_entries, attacks, source) where source
+    is "binary" if the blob was mapped and "python" otherwise. The
+    result is cached, so every slider module shares one mapping.
+    """
+    blob = load_blob(BLOB_PATH)
+    if blob is not None and _matches_constants(blob):
+        return blob[0], blob[1], blob[2], "binary"
+    rook, bishop, attacks = layout_from_modules()
+    return rook, bishop, attacks, "python"
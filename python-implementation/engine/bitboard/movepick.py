@@ -0,0 +1,199 @@
+# engine/bitboard/movepick.py
+
+"""Staged move picker for search.
+
+A MovePicker yields pseudo-legal packed moves in stages and only builds
+a stage once the previous one is exhausted, so a node that fails high
+on an early move never pays for the later ones:
+
+  1. TT      - the transposition-table (or PV) move, if pseudo-legal here
+  2. CAPTURE     - generate_captures: captures and promotions that do
+                   not lose material by static exchange, best MVV-LVA
+                   first
+  3. KILLER      - the quiet moves that last caused a cutoff at this
+                   ply, if pseudo-legal here
+  4. QUIET       - generate_quiets, best history score first
+  5. BAD_CAPTURE - the captures held back from stage 2, in the same
+                   order
+
+Moves may leave the king in check; the caller makes the move and
+rejects it with ``board.in_check``. ``generated`` counts the moves the
+picker generated, for search statistics.
+"""
+
+from __future__ import annotations
+
+from typing import Iterator, Sequence
+
+from engine.bitboard.board import Board  # noqa: TC002
+from engine.bitboard.config import PackedMove  # noqa: TC002
+from engine.bitboard.constants import (
+    BLACK,
+    BLACK_PAWN,
+    MOVE_DST_SHIFT,
+    MOVE_FLAG_CAPTURE,
+    MOVE_PROMO_MASK,
+    MOVE_PROMO_SHIFT,
+    MOVE_SQ_MASK,
+    PROMO_CODES,
+    WHITE,
+    WHITE_BISHOP,
+    WHITE_KNIGHT,
+    WHITE_PAWN,
+    WHITE_QUEEN,
+    WHITE_ROOK,
+)
+from engine.bitboard.generator import generate_captures, generate_quiets
+from engine.bitboard.moves.bishop import generate_bishop_moves
+from engine.bitboard.moves.king import generate_king_moves
+from engine.bitboard.moves.knight import generate_knight_moves
+from engine.bitboard.moves.pawn import generate_pawn_moves
+from engine.bitboard.moves.queen import generate_queen_moves
+from engine.bitboard.moves.rook import generate_rook_moves
+from engine.bitboard.see import is_losing
+
+(
+    STAGE_TT,
+    STAGE_CAPTURE,
+    STAGE_KILLER,
+    STAGE_QUIET,
+    STAGE_BAD_CAPTURE,
+    STAGE_DONE,
+) = range(6)
+
+QUEEN_PROMO = PROMO_CODES["Q"]
+PROMO_BITS = MOVE_PROMO_MASK << MOVE_PROMO_SHIFT
+
+# Killer moves remembered per ply
+KILLER_SLOTS = 2
+
+
+def is_tactical(move: PackedMove) -> bool:
+    """Captures and promotions, i.e. what generate_captures returns."""
+    return bool(move & (MOVE_FLAG_CAPTURE | PROMO_BITS))
+
+
+def mvv_lva(board: Board, move: PackedMove) -> int:
+    """
+    Most valuable victim, least valuable attacker: victim type * 6 +
+    (5 - attacker type), plus a queen's worth for a queen promotion.
+    """
+    pieces = board.square_to_piece
+    attacker = pieces[move & MOVE_SQ_MASK] or 0
+    captured = pieces[(move >> MOVE_DST_SHIFT) & MOVE_SQ_MASK]
+    # Empty for en passant and quiet promotions: a pawn, or nothing
+    victim = captured % 6 if captured is not None else WHITE_PAWN
+    score = 6 * victim + 5 - attacker % 6
+    if (move >> MOVE_PROMO_SHIFT) & MOVE_PROMO_MASK == QUEEN_PROMO:
+        score += 6 * WHITE_QUEEN
+    return score
+
+
+def history_index(side: int, move: PackedMove) -> int:
+    """Index of `move` in a flat [side][src][dst] history table."""
+    return (side << 12) | (move & 0xFFF)
+
+
+def is_pseudo_legal(board: Board, move: PackedMove) -> bool:
+    """
+    True if `move` is one of the pseudo-legal moves of the side to move.
+    Only the piece on the source square is generated, so this is cheap
+    enough to validate a TT move or killer before trying it.
+    """
+    src = move & MOVE_SQ_MASK
+    piece = board.square_to_piece[src]
+    us = board.side_to_move
+    if piece is None or (piece >= BLACK_PAWN) != (us == BLACK):
+        return False
+    white = us == WHITE
+    src_bb = 1 << src
+    my_occ = board.white_occ if white else board.black_occ
+    their_occ = board.black_occ if white else board.white_occ
+    kind = piece % 6
+    if kind == WHITE_PAWN:
+        ep = board.ep_square
+        moves = generate_pawn_moves(
+            src_bb,
+            their_occ,
+            board.all_occ,
+            white,
+            ep_mask=(1 << ep) if ep else 0,
+            packed=True,
+        )
+    elif kind == WHITE_KNIGHT:
+        moves = generate_knight_moves(src_bb, my_occ, their_occ, True)
+    elif kind == WHITE_BISHOP:
+        moves = generate_bishop_moves(src_bb, my_occ, their_occ, True)
+    elif kind == WHITE_ROOK:
+        moves = generate_rook_moves(src_bb, my_occ, their_occ, True)
+    elif kind == WHITE_QUEEN:
+        moves = generate_queen_moves(src_bb, my_occ, their_occ, True)
+    else:
+        moves = generate_king_moves(board, src_bb, my_occ, their_occ, True)
+    return move in moves
+
+
+class MovePicker:
+
+    board: Board
+    tt_move: PackedMove
+    killers: Sequence[PackedMove]
+    history: Sequence[int]
+    stage: int
+    generated: int
+
+    def __init__(
+        self,
+        board: Board,
+        tt_move: PackedMove,
+        killers: Sequence[PackedMove],
+        history: Sequence[int],
+    ) -> None:
+        self.board = board
+        self.tt_move = tt_move
+        self.killers = killers
+        self.history = history
+        self.stage = STAGE_TT
+        self.generated = 0
+
+    def __iter__(self) -> Iterator[PackedMove]:
+        board = self.board
+        tt_move = self.tt_move
+
+        if tt_move and is_pseudo_legal(board, tt_move):
+            yield tt_move
+
+        self.stage = STAGE_CAPTURE
+        moves = generate_captures(board, True)
+        self.generated += len(moves)
+        captures = [m for m in moves if m != tt_move]
+        captures.sort(key=lambda m: mvv_lva(board, m), reverse=True)
+        bad_captures = []
+        for move in captures:
+            if is_losing(board, move):
+                bad_captures.append(move)
+            else:
+                yield move
+
+        self.stage = STAGE_KILLER
+        killers = [
+            k
+            for k in self.killers
+            if k and k != tt_move and is_pseudo_legal(board, k)
+        ]
+        yield from killers
+
+        self.stage = STAGE_QUIET
+        quiets = generate_quiets(board, True)
+        self.generated += len(quiets)
+        history = self.history
+        side = board.side_to_move << 12
+        quiets.sort(key=lambda m: history[side | (m & 0xFFF)], reverse=True)
+        for move in quiets:
+            if move != tt_move and move not in killers:
+                yield move
+
+        self.stage = STAGE_BAD_CAPTURE
+        yield from bad_captures
+
+        self.stage = STAGE_DONE
@@ -1,39 +1,47 @@
 from typing import List
-from engine.bitboard.config import RawMove  # noqa: TC002
+from engine.bitboard.config import AnyMove  # noqa: TC002
 from engine.bitboard.utils import pop_lsb
-from engine.bitboard.constants import MASK_64
-from engine.bitboard.bishop_attack_table import BISHOP_ATTACK_TABLE
-from engine.bitboard.magic_constants import (
-    RELEVANT_BISHOP_MASKS,
-    BISHOP_MAGICS,
-    BISHOP_SHIFTS,
+from engine.bitboard.constants import (
+    MASK_64,
+    MOVE_DST_SHIFT,
+    MOVE_FLAG_CAPTURE,
 )
+from engine.bitboard.magic_blob import load_magic_tables
 
 # from engine.bitboard.constants import BISHOP_OFFSETS
 
+# Flat magic layout, memory-mapped from magic_tables.bin when present:
+# BISHOP_MAGIC[sq] = (mask, magic, shift, offset into SLIDER_ATTACKS)
+BISHOP_MAGIC = load_magic_tables()[1]
+SLIDER_ATTACKS = load_magic_tables()[2]
+
 
 def bishop_attacks(sq: int, all_occ: int) -> int:
     """
     Given a square index (0-63) and full occupancy
     return the precomputed bishop mask.
     """
-    mask = RELEVANT_BISHOP_MASKS[sq]
-    magic = BISHOP_MAGICS[sq]
-    shift = BISHOP_SHIFTS[sq]
-
-    masked_occ = all_occ & mask
-    idx = ((masked_occ * magic) & MASK_64) >> shift
-    return BISHOP_ATTACK_TABLE[sq][idx]
+    mask, magic, shift, offset = BISHOP_MAGIC[sq]
+    return SLIDER_ATTACKS[
+        offset + ((((all_occ & mask) * magic) & MASK_64) >> shift)
+    ]
 
 
 def generate_bishop_moves(
-    bishop_bb: int, my_occ: int, their_occ: int
-) -> List[RawMove]:
+    bishop_bb: int,
+    my_occ: int,
+    their_occ: int,
+    packed: bool = False,
+    targets: int = MASK_64,
+) -> List[AnyMove]:
     """
     Given a bitboard of all bishops for side-to-move,
     plus my_occ and their_occ, return RawMove moves for all legal bishop moves.
+    With `packed=True` the moves are packed ints instead of tuples.
+    Only destinations in `targets` are generated (e.g. their_occ for
+    captures only).
     """
-    moves: List[RawMove] = []
+    moves: List[AnyMove] = []
     full_occ = my_occ | their_occ
     temp = bishop_bb
 
@@ -42,17 +50,33 @@ def generate_bishop_moves(
         temp &= temp - 1
 
         attacks = bishop_attacks(src, full_occ)
-        legal = attacks & ~my_occ
+        legal = attacks & ~my_occ & targets
 
         legal_temp = legal
         while legal_temp:
             dst = pop_lsb(legal_temp)
             legal_temp &= legal_temp - 1
             is_capture = bool(their_occ & (1 << dst))
-            moves.append((src, dst, is_capture, None, False, False))
+            if packed:
+                moves.append(
+                    src
+                    | (dst << MOVE_DST_SHIFT)
+                    | (MOVE_FLAG_CAPTURE if is_capture else 0)
+                )
+            else:
+                moves.append((src, dst, is_capture, None, False, False))
     return moves
 
 
+def generate_bishop_captures(
+    bishop_bb: int, my_occ: int, their_occ: int, packed: bool = False
+) -> List[AnyMove]:
+    """Captures only: generate_bishop_moves restricted to their_occ."""
+    return generate_bishop_moves(
+        bishop_bb, my_occ, their_occ, packed, their_occ
+    )
+
+
 # Ray based bishop move generation
 # def generate_bishop_moves(
 #     bishops_bb: int, my_occ: int, their_occ: int
@@ -1,9 +1,10 @@
 # engine/bitboard/moves/king.py
 
 from typing import List, TYPE_CHECKING
-from engine.bitboard.config import RawMove  # noqa: TC002
+from engine.bitboard.config import AnyMove  # noqa: TC002
 from engine.bitboard.utils import pop_lsb
 from engine.bitboard.constants import (
+    MASK_64,
     KING_OFFSETS,
     FILE_A,
     FILE_H,
@@ -11,8 +12,14 @@ from engine.bitboard.constants import (
     BLACK,
     WHITE_ROOK,
     BLACK_ROOK,
+    CASTLE_WHITE_KINGSIDE,
+    CASTLE_WHITE_QUEENSIDE,
+    CASTLE_BLACK_KINGSIDE,
+    CASTLE_BLACK_QUEENSIDE,
+    MOVE_DST_SHIFT,
+    MOVE_FLAG_CAPTURE,
+    MOVE_FLAG_CASTLING,
 )
-from engine.bitboard.attack_utils import is_square_attacked
 
 if TYPE_CHECKING:  # pragma: no cover - type hints only
     from engine.bitboard.board import Board
@@ -49,20 +56,38 @@ for i in range(64):
     KING_ATTACKS[i] = one_king_mask(i)
 
 
+# Destination squares of the four castling moves (c1, g1, c8, g8)
+CASTLE_TARGETS = (1 << 2) | (1 << 6) | (1 << 58) | (1 << 62)
+
+
+def _castle_move(src: int, dst: int, packed: bool) -> AnyMove:
+    """Build a castling move in either tuple or packed form."""
+    if packed:
+        return src | (dst << MOVE_DST_SHIFT) | MOVE_FLAG_CASTLING
+    return (src, dst, False, None, False, True)
+
+
 def generate_king_moves(
     board: "Board",
     king_bb: int,
     my_occ: int,
     their_occ: int,
-) -> List[RawMove]:
+    packed: bool = False,
+    targets: int = MASK_64,
+) -> List[AnyMove]:
     """
     Generate all *legal* king moves
     (one-square steps and castling) for the side to move.
     One-square steps that land on an attacked square are filtered out here.
     Castling moves are also fully validated
         (empty squares + no attacked squares).
+    Both tests are single ANDs against the opponent's attack map,
+    which the board computes once per position (Board.attacks_by).
+    With `packed=True` the moves are packed ints instead of tuples.
+    Only destinations in `targets` are generated: their_occ gives the
+    captures, the empty squares give steps and castling.
     """
-    moves: List[RawMove] = []
+    moves: List[AnyMove] = []
 
     # No king bit found → no moves
     if king_bb == 0:
@@ -71,81 +96,87 @@ def generate_king_moves(
     # There should be exactly one king bit
     src = pop_lsb(king_bb)
 
+    opponent = BLACK if board.side_to_move == WHITE else WHITE
+    danger = board.attacks_by(opponent)
+
     # Phase 1: Generate one‐square steps,
     # filtering out any destination attacked by opponent
-    potential = KING_ATTACKS[src] & ~my_occ
-    opponent = BLACK if board.side_to_move == WHITE else WHITE
+    potential = KING_ATTACKS[src] & ~my_occ & ~danger & targets
 
     while potential:
         dst = pop_lsb(potential)
         potential &= potential - 1
-
-        # If destination is not attacked, it is legal
-        if not board.is_square_attacked(dst, opponent):
-            is_capture = bool((1 << dst) & their_occ)
+        is_capture = bool((1 << dst) & their_occ)
+        if packed:
+            moves.append(
+                src
+                | (dst << MOVE_DST_SHIFT)
+                | (MOVE_FLAG_CAPTURE if is_capture else 0)
+            )
+        else:
             moves.append((src, dst, is_capture, None, False, False))
 
-    # Phase 2: Castling (fully validated as before)
+    # Phase 2: Castling (never out of or through check)
     rights = board.castling_rights
+    castle_targets = targets & CASTLE_TARGETS
+    if not castle_targets:
+        return moves
 
     if board.side_to_move == WHITE:
         # King must be on e1 (4) to castle
         if src == 4:
-            # White kingside (bit 0)
-            if rights & 0b0001:
+            # White kingside
+            if rights & CASTLE_WHITE_KINGSIDE:
                 # f1 (5) and g1 (6) must be empty
                 if not (board.all_occ & ((1 << 5) | (1 << 6))):
                     # Rook on h1 (7) must be present
                     if board.bitboards[WHITE_ROOK] & (1 << 7):
                         # e1, f1, g1 must not be attacked
-                        if (
-                            not is_square_attacked(board, 4, BLACK)
-                            and not is_square_attacked(board, 5, BLACK)
-                            and not is_square_attacked(board, 6, BLACK)
-                        ):
-
-                            moves.append((src, 6, False, None, False, True))
+                        if not danger & ((1 << 4) | (1 << 5) | (1 << 6)):
+                            if castle_targets & (1 << 6):
+                                moves.append(_castle_move(src, 6, packed))
 
-            # White queenside (bit 1)
-            if rights & 0b0010:
+            # White queenside
+            if rights & CASTLE_WHITE_QUEENSIDE:
                 # b1 (1), c1 (2), d1 (3) must be empty
                 if not (board.all_occ & ((1 << 1) | (1 << 2) | (1 << 3))):
                     # Rook on a1 (0) must be present
                     if board.bitboards[WHITE_ROOK] & (1 << 0):
                         # e1, d1, c1 must not be attacked
-                        if (
-                            not is_square_attacked(board, 4, BLACK)
-                            and not is_square_attacked(board, 3, BLACK)
-                            and not is_square_attacked(board, 2, BLACK)
-                        ):
-
-                            moves.append((src, 2, False, None, False, True))
+                        if not danger & ((1 << 4) | (1 << 3) | (1 << 2)):
+                            if castle_targets & (1 << 2):
+                                moves.append(_castle_move(src, 2, packed))
 
     else:
         # Black to move; king must be on e8 (60)
         if src == 60:
-            # Black kingside (bit 2)
-            if rights & 0b0100:
+            # Black kingside
+            if rights & CASTLE_BLACK_KINGSIDE:
                 if not (board.all_occ & ((1 << 61) | (1 << 62))):
                     if board.bitboards[BLACK_ROOK] & (1 << 63):
-                        if (
-                            not is_square_attacked(board, 60, WHITE)
-                            and not is_square_attacked(board, 61, WHITE)
-                            and not is_square_attacked(board, 62, WHITE)
-                        ):
-
-                            moves.append((src, 62, False, None, False, True))
+                        if not danger & ((1 << 60) | (1 << 61) | (1 << 62)):
+                            if castle_targets & (1 << 62):
+                                moves.append(_castle_move(src, 62, packed))
 
-            # Black queenside (bit 3)
-            if rights & 0b1000:
+            # Black queenside
+            if rights & CASTLE_BLACK_QUEENSIDE:
                 if not (board.all_occ & ((1 << 57) | (1 << 58) | (1 << 59))):
                     if board.bitboards[BLACK_ROOK] & (1 << 56):
-                        if (
-                            not is_square_attacked(board, 60, WHITE)
-                            and not is_square_attacked(board, 59, WHITE)
-                            and not is_square_attacked(board, 58, WHITE)
-                        ):
-
-                            moves.append((src, 58, False, None, False, True))
+                        if not danger & ((1 << 60) | (1 << 59) | (1 << 58)):
+                            if castle_targets & (1 << 58):
+                                moves.append(_castle_move(src, 58, packed))
 
     return moves
+
+
+def generate_king_captures(
+    board: "Board",
+    king_bb: int,
+    my_occ: int,
+    their_occ: int,
+    packed: bool = False,
+) -> List[AnyMove]:
+    """Captures only: generate_king_moves restricted to their_occ."""
+    return generate_king_moves(
+        board, king_bb, my_occ, their_occ, packed, their_occ
+    )
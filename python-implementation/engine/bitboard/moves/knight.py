@@ -1,7 +1,12 @@
 from typing import List
-from engine.bitboard.config import RawMove  # noqa: TC002
+from engine.bitboard.config import AnyMove  # noqa: TC002
 from engine.bitboard.utils import pop_lsb
-from engine.bitboard.constants import KNIGHT_OFFSETS
+from engine.bitboard.constants import (
+    KNIGHT_OFFSETS,
+    MASK_64,
+    MOVE_DST_SHIFT,
+    MOVE_FLAG_CAPTURE,
+)
 
 # Precompute knight attack bitboards for all 64 squares
 KNIGHT_ATTACKS = [0] * 64
@@ -25,24 +30,47 @@ def knight_attacks(sq: int) -> int:
 
 
 def generate_knight_moves(
-    knights_bb: int, my_occ: int, their_occ: int
-) -> List[RawMove]:
+    knights_bb: int,
+    my_occ: int,
+    their_occ: int,
+    packed: bool = False,
+    targets: int = MASK_64,
+) -> List[AnyMove]:
     """
     Given a bitboard of all knights for side-to-move,
     plus my_occ and their_occ, return RawMove moves for all legal knight moves.
+    With `packed=True` the moves are packed ints instead of tuples.
+    Only destinations in `targets` are generated (e.g. their_occ for
+    captures only).
     """
 
-    moves: List[RawMove] = []
+    moves: List[AnyMove] = []
     tmp_knights = knights_bb
     while tmp_knights:
         src = pop_lsb(tmp_knights)
         attacks = KNIGHT_ATTACKS[src]
-        legal = attacks & ~my_occ
+        legal = attacks & ~my_occ & targets
         tmp = legal
         while tmp:
             dest = pop_lsb(tmp)
             is_capture = bool(their_occ & (1 << dest))
-            moves.append((src, dest, is_capture, None, False, False))
+            if packed:
+                moves.append(
+                    src
+                    | (dest << MOVE_DST_SHIFT)
+                    | (MOVE_FLAG_CAPTURE if is_capture else 0)
+                )
+            else:
+                moves.append((src, dest, is_capture, None, False, False))
             tmp &= tmp - 1
         tmp_knights &= tmp_knights - 1
     return moves
+
+
+def generate_knight_captures(
+    knights_bb: int, my_occ: int, their_occ: int, packed: bool = False
+) -> List[AnyMove]:
+    """Captures only: generate_knight_moves restricted to their_occ."""
+    return generate_knight_moves(
+        knights_bb, my_occ, their_occ, packed, their_occ
+    )
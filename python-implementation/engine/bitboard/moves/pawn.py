@@ -1,14 +1,27 @@
 from typing import List
-from engine.bitboard.config import RawMove  # noqa: TC002
+from engine.bitboard.config import AnyMove  # noqa: TC002
 from engine.bitboard.utils import pop_lsb
 from engine.bitboard.constants import (
     MASK_64,
+    RANK_1,
     RANK_2,
     RANK_4,
     RANK_5,
     RANK_7,
+    RANK_8,
     FILE_A,
     FILE_H,
+    MOVE_DST_SHIFT,
+    MOVE_FLAG_CAPTURE,
+    MOVE_FLAG_EN_PASSANT,
+    MOVE_PROMO_SHIFT,
+    PROMO_CODES,
+)
+
+# Promotion pieces in generation order, as characters and as packed bits
+PROMOTIONS = ("Q", "R", "B", "N")
+PACKED_PROMOTIONS = tuple(
+    PROMO_CODES[p] << MOVE_PROMO_SHIFT for p in PROMOTIONS
 )
 
 
@@ -77,25 +90,21 @@ def pawn_en_passant_targets(
     return (left | right) & ep_mask & MASK_64
 
 
-def generate_pawn_moves(
+def _add_pawn_pushes(
+    moves: List[AnyMove],
     pawns_bb: int,
-    enemy_bb: int,
     all_occ: int,
     is_white: bool,
-    ep_mask: int = 0,
-) -> List[RawMove]:
-    """
-    Return all legal pawn moves: single/double pushes and diagonal captures.
-    Every returned move is a RawMove tuple.
-    """
-    moves: List[RawMove] = []
-
+    packed: bool,
+    targets: int,
+) -> None:
+    """Append the single/double pushes landing on `targets` to `moves`."""
     # --- Pushes (single and double) ---
     for step, helper in [
         (8, pawn_single_push_targets),
         (16, pawn_double_push_targets),
     ]:
-        bb = helper(pawns_bb, all_occ, is_white)
+        bb = helper(pawns_bb, all_occ, is_white) & targets
         tmp = bb
         while tmp:
             dest = pop_lsb(tmp)
@@ -104,12 +113,29 @@ def generate_pawn_moves(
             if step == 8 and (
                 (is_white and dest >= 56) or (not is_white and dest < 8)
             ):
-                for promo in ("Q", "R", "B", "N"):
-                    moves.append((src, dest, False, promo, False, False))
+                if packed:
+                    base = src | (dest << MOVE_DST_SHIFT)
+                    for promo_bits in PACKED_PROMOTIONS:
+                        moves.append(base | promo_bits)
+                else:
+                    for promo in PROMOTIONS:
+                        moves.append((src, dest, False, promo, False, False))
+            elif packed:
+                moves.append(src | (dest << MOVE_DST_SHIFT))
             else:
                 moves.append((src, dest, False, None, False, False))
             tmp &= tmp - 1
 
+
+def _add_pawn_captures(
+    moves: List[AnyMove],
+    pawns_bb: int,
+    enemy_bb: int,
+    is_white: bool,
+    ep_mask: int,
+    packed: bool,
+) -> None:
+    """Append diagonal and en-passant captures to `moves`."""
     # --- Captures (fix: only if files are adjacent) ---
     cap_bb = pawn_capture_targets(pawns_bb, enemy_bb, is_white)
     tmp = cap_bb
@@ -121,78 +147,115 @@ def generate_pawn_moves(
             # candidate src squares:
             src_left = dest - 7  # capture from file one to the right (df+1)
             src_right = dest - 9  # capture from file one to the left (df−1)
-
-            # ONLY generate if files match up:
-            #  - left capture is valid only if dest’s file < 7
-            # (so src_left’s file = df+1 ≤7)
-            if df < 7 and 0 <= src_left < 64 and ((pawns_bb >> src_left) & 1):
-                if dest >= 56:  # promotion rank
-                    for promo in ("Q", "R", "B", "N"):
-                        moves.append(
-                            (src_left, dest, True, promo, False, False)
-                        )
-
-                else:
-                    moves.append((src_left, dest, True, None, False, False))
-
-            #  - right capture is valid only if dest’s file > 0
-            # (so src_right’s file = df−1 ≥0)
-            if (
-                df > 0
-                and 0 <= src_right < 64
-                and ((pawns_bb >> src_right) & 1)
-            ):
-                if dest >= 56:
-                    for promo in ("Q", "R", "B", "N"):
-                        moves.append(
-                            (src_right, dest, True, promo, False, False)
-                        )
-                else:
-                    moves.append((src_right, dest, True, None, False, False))
-
+            promoting = dest >= 56  # promotion rank
         else:
             # Black’s turn: downward captures
             src_left = dest + 9  # file one to the right (df+1)
             src_right = dest + 7  # file one to the left  (df−1)
+            promoting = dest < 8  # promotion rank for Black
 
-            if df < 7 and 0 <= src_left < 64 and ((pawns_bb >> src_left) & 1):
-                if dest < 8:  # promotion rank for Black
-                    for promo in ("Q", "R", "B", "N"):
-                        moves.append(
-                            (src_left, dest, True, promo, False, False)
-                        )
-
+        # ONLY generate if files match up:
+        #  - left capture is valid only if dest’s file < 7
+        # (so src_left’s file = df+1 ≤7)
+        #  - right capture is valid only if dest’s file > 0
+        # (so src_right’s file = df−1 ≥0)
+        for src, valid in ((src_left, df < 7), (src_right, df > 0)):
+            if not (valid and 0 <= src < 64 and ((pawns_bb >> src) & 1)):
+                continue
+            if packed:
+                base = src | (dest << MOVE_DST_SHIFT) | MOVE_FLAG_CAPTURE
+                if promoting:
+                    for promo_bits in PACKED_PROMOTIONS:
+                        moves.append(base | promo_bits)
                 else:
-                    moves.append((src_left, dest, True, None, False, False))
-
-            if (
-                df > 0
-                and 0 <= src_right < 64
-                and ((pawns_bb >> src_right) & 1)
-            ):
-                if dest < 8:
-                    for promo in ("Q", "R", "B", "N"):
-                        moves.append(
-                            (src_right, dest, True, promo, False, False)
-                        )
-
-                else:
-                    moves.append((src_right, dest, True, None, False, False))
+                    moves.append(base)
+            elif promoting:
+                for promo in PROMOTIONS:
+                    moves.append((src, dest, True, promo, False, False))
+            else:
+                moves.append((src, dest, True, None, False, False))
 
         tmp &= tmp - 1
 
-    # --- En-passant captures (unchanged) ---
+    # --- En-passant captures (both neighbouring pawns may capture) ---
     ep_bb = pawn_en_passant_targets(pawns_bb, ep_mask, is_white)
     tmp = ep_bb
     while tmp:
         dest = pop_lsb(tmp)
+        df = dest % 8
         if is_white:
-            src = dest - 7 if ((pawns_bb >> (dest - 7)) & 1) else dest - 9
+            src_left, src_right = dest - 7, dest - 9
         else:
-            src = dest + 9 if ((pawns_bb >> (dest + 9)) & 1) else dest + 7
+            src_left, src_right = dest + 9, dest + 7
 
-        moves.append((src, dest, True, None, True, False))
+        for src, valid in ((src_left, df < 7), (src_right, df > 0)):
+            if not (valid and ((pawns_bb >> src) & 1)):
+                continue
+            if packed:
+                moves.append(
+                    src
+                    | (dest << MOVE_DST_SHIFT)
+                    | MOVE_FLAG_CAPTURE
+                    | MOVE_FLAG_EN_PASSANT
+                )
+            else:
+                moves.append((src, dest, True, None, True, False))
 
         tmp &= tmp - 1
 
+
+def generate_pawn_moves(
+    pawns_bb: int,
+    enemy_bb: int,
+    all_occ: int,
+    is_white: bool,
+    ep_mask: int = 0,
+    packed: bool = False,
+) -> List[AnyMove]:
+    """
+    Return all legal pawn moves: single/double pushes and diagonal captures.
+    Every returned move is a RawMove tuple, or a packed int when
+    `packed=True`.
+    """
+    moves: List[AnyMove] = []
+    _add_pawn_pushes(moves, pawns_bb, all_occ, is_white, packed, MASK_64)
+    _add_pawn_captures(moves, pawns_bb, enemy_bb, is_white, ep_mask, packed)
+    return moves
+
+
+def generate_pawn_captures(
+    pawns_bb: int,
+    enemy_bb: int,
+    all_occ: int,
+    is_white: bool,
+    ep_mask: int = 0,
+    packed: bool = False,
+) -> List[AnyMove]:
+    """
+    The tactical pawn moves: captures, en passant and every promotion,
+    including promotions by a push.
+    """
+    moves: List[AnyMove] = []
+    last_rank = RANK_8 if is_white else RANK_1
+    _add_pawn_pushes(moves, pawns_bb, all_occ, is_white, packed, last_rank)
+    _add_pawn_captures(moves, pawns_bb, enemy_bb, is_white, ep_mask, packed)
+    return moves
+
+
+def generate_pawn_quiets(
+    pawns_bb: int,
+    all_occ: int,
+    is_white: bool,
+    packed: bool = False,
+    targets: int = MASK_64,
+) -> List[AnyMove]:
+    """
+    Pushes that neither capture nor promote, landing on `targets`:
+    everything generate_pawn_moves adds to generate_pawn_captures.
+    """
+    moves: List[AnyMove] = []
+    last_rank = RANK_8 if is_white else RANK_1
+    _add_pawn_pushes(
+        moves, pawns_bb, all_occ, is_white, packed, targets & ~last_rank
+    )
     return moves
@@ -1,27 +1,49 @@
 from typing import List
-from engine.bitboard.config import RawMove  # noqa: TC002
+from engine.bitboard.config import AnyMove  # noqa: TC002
 from engine.bitboard.utils import pop_lsb
-from engine.bitboard.moves.rook import rook_attacks
-from engine.bitboard.moves.bishop import bishop_attacks
+from engine.bitboard.moves.rook import ROOK_MAGIC, SLIDER_ATTACKS
+from engine.bitboard.moves.bishop import BISHOP_MAGIC
+from engine.bitboard.constants import (
+    MASK_64,
+    MOVE_DST_SHIFT,
+    MOVE_FLAG_CAPTURE,
+)
+
+# QUEEN_MAGIC[sq] = rook entry + bishop entry, unpacked in one go
+QUEEN_MAGIC = [ROOK_MAGIC[sq] + BISHOP_MAGIC[sq] for sq in range(64)]
 
 
 def queen_attacks(sq: int, full_occ: int) -> int:
     """
-    Combine my_occ and their_occ into a single occupancy bitboard,
-    then return the union of rook_attacks and bishop_attacks on that occupancy.
+    Return the union of the rook and bishop attacks from `sq` on
+    `full_occ`, with both magic lookups done in a single call.
     """
-    return rook_attacks(sq, full_occ) | bishop_attacks(sq, full_occ)
+    r_mask, r_magic, r_shift, r_off, b_mask, b_magic, b_shift, b_off = (
+        QUEEN_MAGIC[sq]
+    )
+    return SLIDER_ATTACKS[
+        r_off + ((((full_occ & r_mask) * r_magic) & MASK_64) >> r_shift)
+    ] | SLIDER_ATTACKS[
+        b_off + ((((full_occ & b_mask) * b_magic) & MASK_64) >> b_shift)
+    ]
 
 
 def generate_queen_moves(
-    queen_bb: int, my_occ: int, their_occ: int
-) -> List[RawMove]:
+    queen_bb: int,
+    my_occ: int,
+    their_occ: int,
+    packed: bool = False,
+    targets: int = MASK_64,
+) -> List[AnyMove]:
     """
     Given a bitboard of all queens for side-to-move, plus my_occ
     and their_occ, generate all legal queen moves.
-    Return RawMove moves for all legal queen moves.
+    Return RawMove moves for all legal queen moves
+    (packed ints instead of tuples when `packed=True`).
+    Only destinations in `targets` are generated (e.g. their_occ for
+    captures only).
     """
-    moves: List[RawMove] = []
+    moves: List[AnyMove] = []
     full_occ = my_occ | their_occ
     temp = queen_bb
 
@@ -30,12 +52,26 @@ def generate_queen_moves(
         temp &= temp - 1
 
         attacks = queen_attacks(src, full_occ)
-        legal = attacks & ~my_occ
+        legal = attacks & ~my_occ & targets
 
         legal_temp = legal
         while legal_temp:
             dst = pop_lsb(legal_temp)
             legal_temp &= legal_temp - 1
             is_capture = bool(their_occ & (1 << dst))
-            moves.append((src, dst, is_capture, None, False, False))
+            if packed:
+                moves.append(
+                    src
+                    | (dst << MOVE_DST_SHIFT)
+                    | (MOVE_FLAG_CAPTURE if is_capture else 0)
+                )
+            else:
+                moves.append((src, dst, is_capture, None, False, False))
     return moves
+
+
+def generate_queen_captures(
+    queen_bb: int, my_occ: int, their_occ: int, packed: bool = False
+) -> List[AnyMove]:
+    """Captures only: generate_queen_moves restricted to their_occ."""
+    return generate_queen_moves(queen_bb, my_occ, their_occ, packed, their_occ)
@@ -1,50 +1,72 @@
 from typing import List
-from engine.bitboard.config import RawMove  # noqa: TC002
+from engine.bitboard.config import AnyMove  # noqa: TC002
 from engine.bitboard.utils import pop_lsb
-from engine.bitboard.constants import MASK_64
-from engine.bitboard.rook_attack_table import ROOK_ATTACK_TABLE
-from engine.bitboard.magic_constants import (
-    RELEVANT_ROOK_MASKS,
-    ROOK_MAGICS,
-    ROOK_SHIFTS,
+from engine.bitboard.constants import (
+    MASK_64,
+    MOVE_DST_SHIFT,
+    MOVE_FLAG_CAPTURE,
 )
+from engine.bitboard.magic_blob import load_magic_tables
 
 # from engine.bitboard.constants import ROOK_OFFSETS
 
+# Flat magic layout, memory-mapped from magic_tables.bin when present:
+# ROOK_MAGIC[sq] = (mask, magic, shift, offset into SLIDER_ATTACKS)
+ROOK_MAGIC = load_magic_tables()[0]
+SLIDER_ATTACKS = load_magic_tables()[2]
+
 
 def rook_attacks(sq: int, all_occ: int) -> int:
     """
     Given a square 0-63 and the full occupancy bitboard,
     return the precomputed rook attack mask via magic lookup.
     """
-    mask = RELEVANT_ROOK_MASKS[sq]
-    magic = ROOK_MAGICS[sq]
-    shift = ROOK_SHIFTS[sq]
-
-    masked_occ = all_occ & mask
-    idx = ((masked_occ * magic) & MASK_64) >> shift
-    return ROOK_ATTACK_TABLE[sq][idx]
+    mask, magic, shift, offset = ROOK_MAGIC[sq]
+    return SLIDER_ATTACKS[
+        offset + ((((all_occ & mask) * magic) & MASK_64) >> shift)
+    ]
 
 
 def generate_rook_moves(
-    rook_bb: int, my_occ: int, their_occ: int
-) -> List[RawMove]:
+    rook_bb: int,
+    my_occ: int,
+    their_occ: int,
+    packed: bool = False,
+    targets: int = MASK_64,
+) -> List[AnyMove]:
     """
     Given a bitboard of all rook for side-to-move,
     plus my_occ and their_occ, return RawMove moves for all legal rook moves.
+    With `packed=True` the moves are packed ints instead of tuples.
+    Only destinations in `targets` are generated (e.g. their_occ for
+    captures only).
     """
-    moves: List[RawMove] = []
+    moves: List[AnyMove] = []
     full_occ = my_occ | their_occ
     tmp = rook_bb
     while tmp:
         src = pop_lsb(tmp)
         attacks = rook_attacks(src, full_occ)
-        legal = attacks & ~my_occ
+        legal = attacks & ~my_occ & targets
         legal_temp = legal
         while legal_temp:
             dst = pop_lsb(legal_temp)
             is_capture = bool(their_occ & (1 << dst))
-            moves.append((src, dst, is_capture, None, False, False))
+            if packed:
+                moves.append(
+                    src
+                    | (dst << MOVE_DST_SHIFT)
+                    | (MOVE_FLAG_CAPTURE if is_capture else 0)
+                )
+            else:
+                moves.append((src, dst, is_capture, None, False, False))
             legal_temp &= legal_temp - 1
         tmp &= tmp - 1
     return moves
+
+
+def generate_rook_captures(
+    rook_bb: int, my_occ: int, their_occ: int, packed: bool = False
+) -> List[AnyMove]:
+    """Captures only: generate_rook_moves restricted to their_occ."""
+    return generate_rook_moves(rook_bb, my_occ, their_occ, packed, their_occ)
@@ -0,0 +1,154 @@
+# engine/bitboard/pawns.py
+
+"""Pawn-structure evaluation and the pawn hash table.
+
+``pawn_structure`` scores doubled, isolated and passed pawns as
+(midgame, endgame) terms, white minus black. It depends on nothing but
+the pawns, and the pawn skeleton changes on few moves, so a PawnTable
+caches it under ``Board.pawn_key`` (a Zobrist key over pawns and kings;
+the kings are in it so king-pawn terms can join later) and the search
+pays for each distinct skeleton once.
+
+PawnTable is a fixed-size, direct-mapped table: a power-of-two number
+of entries, indexed by the low bits of the key and verified against
+the full key, with the newest entry always replacing the old one.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import List, Tuple
+
+from engine.bitboard.board import Board  # noqa: TC002
+from engine.bitboard.constants import (
+    BLACK,
+    BLACK_PAWN,
+    FILE_A,
+    MASK_64,
+    WHITE,
+    WHITE_PAWN,
+)
+
+# Default number of cached pawn skeletons
+DEFAULT_PAWN_ENTRIES = 1 << 14
+
+# (midgame, endgame) per extra pawn on a file, per pawn without a
+# friendly pawn on either neighbouring file
+DOUBLED_PENALTY = (-10, -25)
+ISOLATED_PENALTY = (-12, -15)
+# (midgame, endgame) for a passed pawn by rank from its own side (0-7)
+PASSED_BONUS_MG = (0, 0, 5, 10, 20, 35, 60, 0)
+PASSED_BONUS_EG = (0, 10, 15, 25, 45, 75, 120, 0)
+
+FILE_MASKS = [FILE_A << f for f in range(8)]
+# Files either side of each file
+ADJACENT_FILES = [
+    (FILE_MASKS[f - 1] if f > 0 else 0) | (FILE_MASKS[f + 1] if f < 7 else 0)
+    for f in range(8)
+]
+
+
+def _passed_mask(sq: int, side: int) -> int:
+    """Squares ahead of `sq` on its own and neighbouring files."""
+    files = FILE_MASKS[sq % 8] | ADJACENT_FILES[sq % 8]
+    rank = sq // 8
+    if side == WHITE:
+        ahead = (MASK_64 << (8 * (rank + 1))) & MASK_64
+    else:
+        ahead = (1 << (8 * rank)) - 1
+    return files & ahead
+
+
+# PASSED_MASKS[side][sq] = enemy pawns there stop a pawn on sq passing
+PASSED_MASKS = [
+    [_passed_mask(sq, WHITE) for sq in range(64)],
+    [_passed_mask(sq, BLACK) for sq in range(64)],
+]
+
+
+def _side_structure(own: int, enemy: int, side: int) -> Tuple[int, int]:
+    """(midgame, endgame) structure score of one side's pawns."""
+    mg = eg = 0
+    for f in range(8):
+        count = (own & FILE_MASKS[f]).bit_count()
+        if not count:
+            continue
+        if count > 1:
+            mg += DOUBLED_PENALTY[0] * (count - 1)
+            eg += DOUBLED_PENALTY[1] * (count - 1)
+        if not own & ADJACENT_FILES[f]:
+            mg += ISOLATED_PENALTY[0] * count
+            eg += ISOLATED_PENALTY[1] * count
+    passed = PASSED_MASKS[side]
+    bb = own
+    while bb:
+        lsb = bb & -bb
+        sq = lsb.bit_length() - 1
+        if not enemy & passed[sq]:
+            rank = sq // 8 if side == WHITE else 7 - sq // 8
+            mg += PASSED_BONUS_MG[rank]
+            eg += PASSED_BONUS_EG[rank]
+        bb ^= lsb
+    return mg, eg
+
+
+def pawn_structure(board: Board) -> Tuple[int, int]:
+    """(midgame, endgame) pawn-structure score, white minus black."""
+    white = board.bitboards[WHITE_PAWN]
+    black = board.bitboards[BLACK_PAWN]
+    w_mg, w_eg = _side_structure(white, black, WHITE)
+    b_mg, b_eg = _side_structure(black, white, BLACK)
+    return w_mg - b_mg, w_eg - b_eg
+
+
+class PawnTable:
+
+    keys: array
+    scores: List[Tuple[int, int]]
+    mask: int
+    probes: int
+    hits: int
+
+    def __init__(self, entries: int = DEFAULT_PAWN_ENTRIES) -> None:
+        if entries < 1 or entries & (entries - 1):
+            raise ValueError(f"entries must be a power of two: {entries}")
+        self.mask = entries - 1
+        self.keys = array("Q", bytes(8 * entries))
+        self.scores = [(0, 0)] * entries
+        self.probes = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return self.mask + 1
+
+    def probe(self, board: Board) -> Tuple[int, int]:
+        """
+        Pawn-structure score of `board`, from the table when its pawn
+        key is there and computed (and stored) otherwise.
+        """
+        key = board.pawn_key
+        index = key & self.mask
+        self.probes += 1
+        # Empty slots hold key 0, so a zero key is never trusted
+        if key and self.keys[index] == key:
+            self.hits += 1
+            return self.scores[index]
+        score = pawn_structure(board)
+        self.keys[index] = key
+        self.scores[index] = score
+        return score
+
+    def hit_rate(self) -> float:
+        """Fraction of probes answered from the table."""
+        return self.hits / self.probes if self.probes else 0.0
+
+    def reset_stats(self) -> None:
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self) -> None:
+        """Forget every entry and the counters."""
+        n = len(self)
+        self.keys = array("Q", bytes(8 * n))
+        self.scores = [(0, 0)] * n
+        self.reset_stats()
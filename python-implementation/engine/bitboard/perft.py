@@ -1,7 +1,16 @@
-from typing import Dict
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from engine.bitboard.board import Board  # noqa:TC002
-from engine.bitboard.config import RawMove  # noqa: TC002
-from engine.bitboard.generator import generate_legal_moves
+from engine.bitboard.config import AnyMove  # noqa: TC002
+from engine.bitboard.generator import (
+    MoveCounter,
+    MoveGenerator,
+    generate_legal_moves,
+    generate_moves,
+)
+from engine.bitboard.profiler import Profiler  # noqa: TC001
 
 from engine.bitboard.status import (
     is_fifty_move_draw,
@@ -9,12 +18,27 @@ from engine.bitboard.status import (
     is_insufficient_material,
     is_threefold_repetition,
 )
+from engine.bitboard.perft_cache import PerftCache
+from engine.bitboard.perft_table import PerftTable
+
 
+def _is_draw(board: Board) -> bool:
+    """The draws ``respect_draws`` stops at."""
+    return (
+        is_fifty_move_draw(board)
+        or is_threefold_repetition(board)
+        or is_fivefold_repetition(board)
+        or is_insufficient_material(board)
+    )
 
-from collections import Counter
 
-lookups_by_depth: Counter[int] = Counter()
-hits_by_depth: Counter[int] = Counter()
+def _leaf_counter(
+    move_gen: MoveGenerator, count_moves: Optional[MoveCounter]
+) -> MoveCounter:
+    """The move counter used for bulk counting at depth 1."""
+    if count_moves is not None:
+        return count_moves
+    return lambda board, packed: len(move_gen(board, packed))
 
 
 def perft_count(
@@ -22,6 +46,11 @@ def perft_count(
     depth: int,
     *,
     respect_draws: bool = False,
+    packed: bool = False,
+    move_gen: MoveGenerator = generate_legal_moves,
+    bulk: bool = False,
+    count_moves: Optional[MoveCounter] = None,
+    profile: Optional[Profiler] = None,
 ) -> int:
     """
     A “count-only” perft that returns the total leaf
@@ -30,26 +59,39 @@ def perft_count(
     If ``respect_draws`` is True, recursion stops early when a
     draw by the fifty-move rule, repetition, or insufficient
     material is detected.
+    If ``packed`` is True, moves are generated as packed ints,
+    which avoids building a tuple per move.
+    ``move_gen`` selects the legal move generator (see
+    LEGAL_MOVE_GENERATORS in generator.py).
+    If ``bulk`` is True, nodes one ply above the leaves return their
+    legal move count instead of making and unmaking every leaf. The
+    count comes from ``count_moves`` (e.g. count_legal_moves, which
+    never builds the move list) or, by default, ``len(move_gen(...))``.
+    With a ``profile`` the walk reports to it (see profiler.py); it then
+    makes every move, bulk or not, and ignores ``respect_draws``.
     """
+    if profile is not None:
+        with profile.attach(board):
+            return _perft_profiled(board, depth, packed, move_gen, profile)
+
     # Bind hot attributes to locals to avoid repeated lookups
-    gen_moves = generate_legal_moves
+    gen_moves = move_gen
     make_move = board.make_move_raw
     undo_move = board.undo_move_raw
+    count = _leaf_counter(move_gen, count_moves)
 
     def _dfs(d: int) -> int:
         if d == 0:
             return 1
 
-        if respect_draws and (
-            is_fifty_move_draw(board)
-            or is_threefold_repetition(board)
-            or is_fivefold_repetition(board)
-            or is_insufficient_material(board)
-        ):
+        if respect_draws and _is_draw(board):
             return 1
 
+        if bulk and d == 1:
+            return count(board, packed)
+
         total = 0
-        for move in gen_moves(board):
+        for move in gen_moves(board, packed):
             make_move(move)
             total += _dfs(d - 1)
             undo_move()
@@ -58,70 +100,315 @@ def perft_count(
     return _dfs(depth)
 
 
+def _perft_profiled(
+    board: Board,
+    depth: int,
+    packed: bool,
+    move_gen: MoveGenerator,
+    profile: Profiler,
+) -> int:
+    """perft_count's walk, reporting every node to `profile`."""
+    gen_seconds = profile.gen_seconds
+    moves_at = profile.moves
+    samples = profile.samples
+    pseudo = profile.sampled_pseudo
+    legal = profile.sampled_legal
+
+    def _dfs(d: int, ply: int) -> int:
+        sampled = profile.node(ply)
+        if d == 0:
+            return 1
+        if sampled:
+            t0 = time.perf_counter()
+            moves = move_gen(board, packed)
+            gen_seconds[ply] += time.perf_counter() - t0
+            samples[ply] += 1
+            pseudo[ply] += len(generate_moves(board, packed))
+            legal[ply] += len(moves)
+        else:
+            moves = move_gen(board, packed)
+        moves_at[ply] += len(moves)
+        total = 0
+        for move in moves:
+            board.make_move_raw(move)
+            total += _dfs(d - 1, ply + 1)
+            board.undo_move_raw()
+        return total
+
+    return _dfs(depth, 0)
+
+
+def perft_copy_make(
+    board: Board,
+    depth: int,
+    *,
+    packed: bool = False,
+    move_gen: MoveGenerator = generate_legal_moves,
+) -> int:
+    """
+    Same count as perft_count, but every child is a fresh Board from
+    Board.make_move_copy, so nothing is ever undone and `board` is
+    never modified.
+    """
+    if depth == 0:
+        return 1
+    total = 0
+    for move in move_gen(board, packed):
+        total += perft_copy_make(
+            board.make_move_copy(move),
+            depth - 1,
+            packed=packed,
+            move_gen=move_gen,
+        )
+    return total
+
+
 # TESTING FUNCTION ONLY
 def perft_divide(
-    board: Board, depth: int, *, respect_draws: bool = False
-) -> Dict[RawMove, int]:
+    board: Board,
+    depth: int,
+    *,
+    respect_draws: bool = False,
+    packed: bool = False,
+    move_gen: MoveGenerator = generate_legal_moves,
+    bulk: bool = False,
+    count_moves: Optional[MoveCounter] = None,
+) -> Dict[AnyMove, int]:
     if depth == 0:
         return {}
 
-    results: Dict[RawMove, int] = {}
-    for move in generate_legal_moves(board):
+    results: Dict[AnyMove, int] = {}
+    for move in move_gen(board, packed):
         board.make_move_raw(move)
         results[move] = perft_count(
             board,
             depth - 1,
             respect_draws=respect_draws,
+            packed=packed,
+            move_gen=move_gen,
+            bulk=bulk,
+            count_moves=count_moves,
         )
         board.undo_move_raw()
     return results
 
 
+def _root_paths(
+    board: Board,
+    split_depth: int,
+    packed: bool,
+    move_gen: MoveGenerator,
+    respect_draws: bool,
+) -> List[Tuple[AnyMove, ...]]:
+    """
+    All legal move sequences of length `split_depth` from `board`. With
+    ``respect_draws`` a sequence ends early at a drawn position, which
+    perft_count then counts as one leaf; a mated or stalemated one has
+    no sequences below it, as it has no leaves.
+    """
+    if split_depth == 0 or (respect_draws and _is_draw(board)):
+        return [()]
+    paths: List[Tuple[AnyMove, ...]] = []
+    for move in move_gen(board, packed):
+        board.make_move_raw(move)
+        for tail in _root_paths(
+            board, split_depth - 1, packed, move_gen, respect_draws
+        ):
+            paths.append((move,) + tail)
+        board.undo_move_raw()
+    return paths
+
+
+# (fen, zobrist history, moves from the root, depth,
+#  respect_draws, packed, move_gen, bulk, count_moves)
+_SubtreeTask = Tuple[
+    str,
+    List[int],
+    Tuple[AnyMove, ...],
+    int,
+    bool,
+    bool,
+    MoveGenerator,
+    bool,
+    Optional[MoveCounter],
+]
+
+
+def _perft_subtree(task: _SubtreeTask) -> int:
+    """Process-pool worker: rebuild the root, play `path`, count."""
+    (
+        fen,
+        history,
+        path,
+        depth,
+        respect_draws,
+        packed,
+        move_gen,
+        bulk,
+        count_moves,
+    ) = task
+    board = Board()
+    board.set_fen(fen)
+    board.zobrist_history = list(history)
+    for move in path:
+        board.make_move_raw(move)
+    return perft_count(
+        board,
+        depth - len(path),
+        respect_draws=respect_draws,
+        packed=packed,
+        move_gen=move_gen,
+        bulk=bulk,
+        count_moves=count_moves,
+    )
+
+
+def perft_parallel(
+    board: Board,
+    depth: int,
+    workers: Optional[int] = None,
+    *,
+    split_depth: int = 1,
+    respect_draws: bool = False,
+    packed: bool = False,
+    move_gen: MoveGenerator = generate_legal_moves,
+    bulk: bool = False,
+    count_moves: Optional[MoveCounter] = None,
+) -> Tuple[int, Dict[AnyMove, int]]:
+    """
+    Perft spread over a process pool. The tree is cut `split_depth`
+    plies below the root (2 balances the load better than 1 when
+    there are many workers) and every subtree is counted in a worker
+    that rebuilds the root from its FEN plus zobrist history.
+
+    Returns (total, divide) where divide maps each root move to its
+    leaf count, exactly like perft_divide.
+    """
+    if depth == 0:
+        return 1, {}
+
+    split_depth = max(1, min(split_depth, depth))
+    paths = _root_paths(board, split_depth, packed, move_gen, respect_draws)
+    fen = board.get_fen()
+    history = list(board.zobrist_history)
+    tasks: List[_SubtreeTask] = [
+        (
+            fen,
+            history,
+            path,
+            depth,
+            respect_draws,
+            packed,
+            move_gen,
+            bulk,
+            count_moves,
+        )
+        for path in paths
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        counts = list(pool.map(_perft_subtree, tasks, chunksize=1))
+
+    # Root moves without a path (mated or stalemated replies) count 0;
+    # a drawn root has just the empty path, and no divide
+    divide: Dict[AnyMove, int] = {}
+    if paths != [()]:
+        divide = dict.fromkeys(move_gen(board, packed), 0)
+    for path, count in zip(paths, counts):
+        if path:
+            divide[path[0]] += count
+    return sum(counts), divide
+
+
 def perft_hashed(
     board: Board,
     depth: int,
-    table: Dict[tuple[int, int], int],
-    cur_depth: int,
+    table: PerftTable,
     *,
     respect_draws: bool = False,
+    packed: bool = False,
+    move_gen: MoveGenerator = generate_legal_moves,
+    bulk: bool = False,
+    count_moves: Optional[MoveCounter] = None,
 ) -> int:
+    """
+    Perft that caches subtree counts in a fixed-size PerftTable keyed
+    on (zobrist_key, depth). Memory use is bounded by the table size.
+    With ``bulk`` (see perft_count) depth-1 nodes are counted directly
+    and never stored, since counting is cheaper than a probe.
+    """
     if depth == 0:
         return 1
 
-    key = (board.zobrist_key, depth)
-    lookups_by_depth[cur_depth] += 1
-    if key in table:
-        hits_by_depth[cur_depth] += 1
-        return table[key]
+    if bulk and depth == 1:
+        return _leaf_counter(move_gen, count_moves)(board, packed)
+
+    key = board.zobrist_key
+    cached = table.probe(key, depth)
+    if cached is not None:
+        return cached
 
     total = 0
-    for move in generate_legal_moves(board):
+    for move in move_gen(board, packed):
         board.make_move_raw(move)
         total += perft_hashed(
             board,
             depth - 1,
             table,
-            cur_depth + 1,
             respect_draws=respect_draws,
+            packed=packed,
+            move_gen=move_gen,
+            bulk=bulk,
+            count_moves=count_moves,
         )
         board.undo_move_raw()
 
-    table[key] = total
+    table.store(key, depth, total)
     return total
 
 
-def perft_hashed_root(board: Board, depth: int) -> int:
-    lookups_by_depth.clear()
-    hits_by_depth.clear()
-    table: Dict[tuple[int, int], int] = {}
-    total = perft_hashed(board, depth, table, cur_depth=0)
+def perft_hashed_root(
+    board: Board,
+    depth: int,
+    *,
+    size_mb: float = 16,
+    packed: bool = False,
+    move_gen: MoveGenerator = generate_legal_moves,
+    bulk: bool = False,
+    count_moves: Optional[MoveCounter] = None,
+    cache: Optional[str] = None,
+) -> int:
+    """
+    perft_hashed with a fresh `size_mb` megabyte table, or with the
+    persistent PerftCache file at `cache` (of that size), which keeps
+    its counts for the next run; prints the table's statistics.
+    """
+    table = PerftCache(cache, size_mb) if cache else PerftTable(size_mb)
+    try:
+        total = perft_hashed(
+            board,
+            depth,
+            table,
+            packed=packed,
+            move_gen=move_gen,
+            bulk=bulk,
+            count_moves=count_moves,
+        )
+    finally:
+        if isinstance(table, PerftCache):
+            table.close()
 
     print("\nTransposition Table Stats:")
-    for d in sorted(lookups_by_depth):
-        looks = lookups_by_depth[d]
-        hits = hits_by_depth[d]
+    for d in sorted(table.lookups_by_depth, reverse=True):
+        looks = table.lookups_by_depth[d]
+        hits = table.hits_by_depth.get(d, 0)
         print(
             f" depth={d:2d}  lookups={looks:7d}  hits={hits:7d}  hit-rate={hits/looks:.1%}"  # noqa: E501
         )
+    print(
+        f" hits={table.hits}  misses={table.misses}"
+        f"  stores={table.stores}  overwrites={table.overwrites}"
+    )
 
     return total
@@ -0,0 +1,161 @@
+# engine/bitboard/perft_cache.py
+
+"""A PerftTable kept in a file, so counts survive from one run to the next.
+
+``PerftCache(path, size_mb)`` memory-maps `path` and lays a PerftTable
+over it. Every subtree that perft_hashed stores goes straight into the
+file, so a later run of the same positions, or a run resumed after
+being killed, finds those subtrees already counted. Processes may map
+the same file at once, as the perft suite's workers do: a slot torn
+between two writers reads as a miss (see perft_table.py).
+
+The file is a 64-byte header and then the two columns of the table:
+
+  * magic ``b"PERFTC\\0\\0"``, the layout version (CACHE_FORMAT)
+  * the zobrist fingerprint: a hash of every ``ZOBRIST_*`` key in
+    constants.py, so counts stored under other keys are never read
+  * the number of buckets
+
+Its size is fixed when it is created. Once the table is full, the
+table's own replacement policy decides what stays: the first slot of a
+bucket keeps the deepest (most expensive) subtree and the second
+always takes the latest store. A file whose header does not match (a
+different fingerprint, layout or size, or not a cache at all) is
+replaced by an empty one; ``reset_reason`` says why.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+from typing import BinaryIO, Optional
+
+from engine.bitboard.constants import (
+    ZOBRIST_CASTLE_KEYS,
+    ZOBRIST_EP_KEYS,
+    ZOBRIST_PIECE_KEYS,
+    ZOBRIST_SIDE_KEY,
+)
+from engine.bitboard.perft_table import ENTRY_BYTES, PerftTable
+
+CACHE_MAGIC = b"PERFTC\0\0"
+# Bumped whenever the file layout or the entry packing changes
+CACHE_FORMAT = 1
+# magic, format, (padding), zobrist fingerprint, buckets
+_HEADER = struct.Struct("<8sI4xQQ")
+HEADER_BYTES = 64
+DEFAULT_CACHE_MB = 64
+
+
+def zobrist_fingerprint() -> int:
+    """64-bit hash of all the zobrist keys the board hashes with."""
+    h = hashlib.blake2b(digest_size=8)
+    keys = [key for row in ZOBRIST_PIECE_KEYS for key in row]
+    keys.append(ZOBRIST_SIDE_KEY)
+    keys.extend(ZOBRIST_CASTLE_KEYS[right] for right in "KQkq")
+    keys.extend(ZOBRIST_EP_KEYS)
+    for key in keys:
+        h.update(key.to_bytes(8, "little"))
+    return int.from_bytes(h.digest(), "little")
+
+
+def _buckets_for(size_mb: float) -> int:
+    """Buckets of a `size_mb` megabyte table, as PerftTable counts them."""
+    slots = max(2, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+    return slots // 2
+
+
+def _header(num_buckets: int) -> bytes:
+    return _HEADER.pack(
+        CACHE_MAGIC, CACHE_FORMAT, zobrist_fingerprint(), num_buckets
+    ).ljust(HEADER_BYTES, b"\0")
+
+
+class PerftCache(PerftTable):
+    """
+    A PerftTable backed by the file at `path`, created (or replaced)
+    with `size_mb` megabytes of slots. With `size_mb` None an existing
+    valid file is used at whatever size it has.
+    """
+
+    path: str
+    reset_reason: Optional[str]
+    _file: BinaryIO
+    _map: mmap.mmap
+
+    def __init__(self, path: str, size_mb: Optional[float] = None) -> None:
+        self.path = path
+        wanted = _buckets_for(size_mb) if size_mb is not None else None
+        self.reset_reason = self._check(wanted)
+        if self.reset_reason is not None:
+            self._create(wanted or _buckets_for(DEFAULT_CACHE_MB))
+        self._file = open(path, "r+b")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        except BaseException:
+            self._file.close()
+            raise
+        with memoryview(self._map) as whole:
+            with whole[HEADER_BYTES:] as table:
+                super().__init__(buffer=table)
+
+    def _check(self, wanted: Optional[int]) -> Optional[str]:
+        """Why the file cannot be used as it is, or None if it can."""
+        try:
+            with open(self.path, "rb") as f:
+                header = f.read(HEADER_BYTES)
+                size = os.fstat(f.fileno()).st_size
+        except FileNotFoundError:
+            return "new file"
+        if len(header) < _HEADER.size:
+            return "not a perft cache"
+        magic, version, fingerprint, buckets = _HEADER.unpack_from(header)
+        if magic != CACHE_MAGIC:
+            return "not a perft cache"
+        if version != CACHE_FORMAT:
+            return f"cache format {version}, expected {CACHE_FORMAT}"
+        if fingerprint != zobrist_fingerprint():
+            return "zobrist keys changed"
+        if wanted is not None and buckets != wanted:
+            return "size changed"
+        if size != HEADER_BYTES + buckets * 2 * ENTRY_BYTES:
+            return "truncated"
+        return None
+
+    def _create(self, num_buckets: int) -> None:
+        """
+        Write an empty cache next to `path` and move it into place, so
+        no process ever maps a half-written header.
+        """
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(_header(num_buckets))
+                f.truncate(HEADER_BYTES + num_buckets * 2 * ENTRY_BYTES)
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def flush(self) -> None:
+        """Write the stored counts through to the file now."""
+        self._map.flush()
+
+    def close(self) -> None:
+        """Flush and unmap the file; the table is unusable after."""
+        if self._map.closed:
+            return
+        self._map.flush()
+        self.keys.release()
+        self.data.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> PerftCache:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
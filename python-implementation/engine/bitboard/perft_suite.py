@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""Run a perft EPD suite and check every ``Dn`` count.
+
+Each line of the suite is a position followed by its expected leaf
+counts, as in the usual ``perftsuite.epd``::
+
+    rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - ;D1 20 ;D2 400
+
+The file is read a line at a time and the positions go to a process
+pool, a bounded number at a time, so a suite of any length runs in
+constant memory; results come back in file order. Each position is
+counted with perft_count at every listed depth up to ``--max-depth``,
+shallowest first, and stops at its first wrong count or when its
+``--timeout`` runs out (a timeout is reported but is not a failure).
+Blank lines and lines starting with "#" are skipped.
+
+The default settings are the fastest exact ones: packed moves, the
+"direct" generator and bulk counting at depth 1. ``--hash`` adds a
+PerftTable per position, shared by its depths. ``--cache FILE`` uses a
+persistent PerftCache instead (see perft_cache.py), shared by every
+worker and kept for the next run, so a rerun of an unchanged suite only
+has to look its counts up.
+
+When a count is wrong the runner looks for the first move where the
+engine goes astray. It compares the engine's perft_divide with that of
+a ``--reference`` generator (the make/in_check "filter" one by default,
+without bulk counting), follows the first move whose counts differ, and
+repeats one ply lower until the two disagree on the moves themselves.
+It reports the moves leading there, the position, and the moves only
+one side generates. If the reference agrees with the engine at the
+root, the expected count is the suspect and the result says so.
+
+Usage::
+
+    PYTHONPATH=. python -m engine.bitboard.perft_suite perftsuite.epd
+        [--max-depth 5] [--timeout 60] [--workers N] [--cache FILE]
+        [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future  # noqa: TC003
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from engine.bitboard.board import Board
+from engine.bitboard.generator import (
+    LEGAL_MOVE_GENERATORS,
+    MoveCounter,
+    count_legal_moves,
+)
+from engine.bitboard.perft import perft_count, perft_divide, perft_hashed
+from engine.bitboard.perft_cache import DEFAULT_CACHE_MB, PerftCache
+from engine.bitboard.perft_table import PerftTable
+from engine.bitboard.utils import move_to_uci
+from engine.pgn.epd import read_epd
+
+# Statuses of a CaseResult
+OK = "ok"
+MISMATCH = "mismatch"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+DEFAULT_GENERATOR = "direct"
+DEFAULT_REFERENCE = "filter"
+# Positions in flight per worker: enough to keep every worker busy
+# without reading far ahead of the results
+QUEUE_PER_WORKER = 2
+
+# Bulk move counters that skip building the move list, by generator
+_COUNTERS: Dict[str, MoveCounter] = {"direct": count_legal_moves}
+
+_DEPTH_OP = re.compile(r"D(\d+)$")
+
+# This process's open PerftCache files, by path
+_caches: Dict[str, PerftCache] = {}
+
+
+class PerftTimeout(Exception):
+    """A position ran past its time budget."""
+
+
+@dataclass
+class SuiteCase:
+    """One suite line, parsed in the worker so a bad line is a result."""
+
+    line: int
+    text: str
+
+
+@dataclass
+class SuiteOptions:
+    max_depth: Optional[int] = None
+    # Seconds per position, None for no limit
+    timeout: Optional[float] = None
+    generator: str = DEFAULT_GENERATOR
+    bulk: bool = True
+    # PerftTable size in megabytes, 0 for none
+    hash_mb: float = 0
+    # PerftCache file used instead of a PerftTable, and its size
+    cache: Optional[str] = None
+    cache_mb: float = DEFAULT_CACHE_MB
+    # Generator to bisect a wrong count against, None to not bisect
+    reference: Optional[str] = DEFAULT_REFERENCE
+
+
+@dataclass
+class DepthResult:
+    depth: int
+    expected: int
+    nodes: int
+    seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return self.nodes == self.expected
+
+
+@dataclass
+class Divergence:
+    """Where the engine and the reference first disagree on the moves."""
+
+    # Moves from the suite position to the one that differs
+    path: List[str]
+    fen: str
+    # Plies still to go below that position
+    depth: int
+    # Moves only the reference generates there, and moves only the
+    # engine does
+    missing: List[str]
+    extra: List[str]
+
+
+@dataclass
+class CaseResult:
+    line: int
+    fen: str
+    status: str
+    depths: List[DepthResult] = field(default_factory=list)
+    divergence: Optional[Divergence] = None
+    note: str = ""
+
+    @property
+    def nodes(self) -> int:
+        return sum(d.nodes for d in self.depths)
+
+    @property
+    def seconds(self) -> float:
+        return sum(d.seconds for d in self.depths)
+
+
+def read_suite(lines: Iterable[str]) -> Iterator[SuiteCase]:
+    """The cases of an EPD suite, one per non-blank, non-"#" line."""
+    for number, text in enumerate(lines, 1):
+        text = text.strip()
+        if text and not text.startswith("#"):
+            yield SuiteCase(number, text)
+
+
+def parse_case(text: str) -> Tuple[str, Dict[int, int]]:
+    """(fen, {depth: expected count}) from an EPD line's Dn opcodes."""
+    fen, ops = read_epd(text)
+    expected: Dict[int, int] = {}
+    for name, value in ops.items():
+        match = _DEPTH_OP.match(name)
+        if match is None:
+            continue
+        try:
+            expected[int(match.group(1))] = int(value)
+        except ValueError:
+            raise ValueError(f"bad count for {name}: {value!r}") from None
+    if not expected:
+        raise ValueError("no Dn opcodes")
+    return fen, expected
+
+
+def _divide(
+    board: Board,
+    depth: int,
+    generator: str,
+    bulk: bool,
+) -> Dict[str, Tuple[int, int]]:
+    """{uci: (packed move, count)} below `board` with `generator`."""
+    divide = perft_divide(
+        board,
+        depth,
+        packed=True,
+        move_gen=LEGAL_MOVE_GENERATORS[generator],
+        bulk=bulk,
+        count_moves=_COUNTERS.get(generator) if bulk else None,
+    )
+    return {
+        move_to_uci(move): (move, count)  # type: ignore[misc]
+        for move, count in divide.items()
+    }
+
+
+def bisect_mismatch(
+    board: Board, depth: int, options: SuiteOptions
+) -> Tuple[Optional[Divergence], str]:
+    """
+    Follow the first root move whose engine and reference counts
+    differ down to where the two generate different moves. Returns
+    (divergence, note); without a divergence the note says why. The
+    board is left as it was.
+    """
+    assert options.reference is not None
+    path: List[str] = []
+    made = 0
+    try:
+        while depth > 0:
+            ours = _divide(board, depth, options.generator, options.bulk)
+            theirs = _divide(board, depth, options.reference, False)
+            if ours.keys() != theirs.keys():
+                return (
+                    Divergence(
+                        path,
+                        board.get_fen(),
+                        depth,
+                        missing=sorted(theirs.keys() - ours.keys()),
+                        extra=sorted(ours.keys() - theirs.keys()),
+                    ),
+                    "",
+                )
+            differing = [
+                uci
+                for uci in sorted(ours)
+                if ours[uci][1] != theirs[uci][1]
+            ]
+            if not differing:
+                total = sum(count for _, count in ours.values())
+                if not path:
+                    return None, (
+                        f"reference {options.reference} also counts"
+                        f" {total}: the expected count may be wrong"
+                    )
+                # Different counts above, equal ones here: the two
+                # walks are not deterministic, which is a bug in itself
+                return None, f"counts agree again after {' '.join(path)}"
+            uci = differing[0]
+            board.make_move_raw(ours[uci][0])
+            made += 1
+            path.append(uci)
+            depth -= 1
+        return None, "no differing move found"
+    finally:
+        for _ in range(made):
+            board.undo_move_raw()
+
+
+def _count(
+    board: Board,
+    depth: int,
+    options: SuiteOptions,
+    table: Optional[PerftTable],
+) -> int:
+    move_gen = LEGAL_MOVE_GENERATORS[options.generator]
+    count_moves = _COUNTERS.get(options.generator) if options.bulk else None
+    if table is not None:
+        return perft_hashed(
+            board,
+            depth,
+            table,
+            packed=True,
+            move_gen=move_gen,
+            bulk=options.bulk,
+            count_moves=count_moves,
+        )
+    return perft_count(
+        board,
+        depth,
+        packed=True,
+        move_gen=move_gen,
+        bulk=options.bulk,
+        count_moves=count_moves,
+    )
+
+
+def _table(options: SuiteOptions) -> Optional[PerftTable]:
+    """The table a position is counted with, if any."""
+    if options.cache is not None:
+        cache = _caches.get(options.cache)
+        if cache is None:
+            cache = PerftCache(options.cache, options.cache_mb)
+            _caches[options.cache] = cache
+        return cache
+    if options.hash_mb > 0:
+        return PerftTable(options.hash_mb)
+    return None
+
+
+def _close_caches() -> None:
+    for cache in _caches.values():
+        cache.close()
+    _caches.clear()
+
+
+def _raise_timeout(signum: int, frame: object) -> None:
+    raise PerftTimeout
+
+
+def _check_case(
+    board: Board,
+    expected: Dict[int, int],
+    options: SuiteOptions,
+    result: CaseResult,
+) -> None:
+    """Count every expected depth into `result`, then bisect a mismatch."""
+    table = _table(options)
+    for depth in sorted(expected):
+        if options.max_depth is not None and depth > options.max_depth:
+            break
+        t0 = time.perf_counter()
+        nodes = _count(board, depth, options, table)
+        row = DepthResult(
+            depth, expected[depth], nodes, time.perf_counter() - t0
+        )
+        result.depths.append(row)
+        if not row.ok:
+            result.status = MISMATCH
+            break
+    if result.status == MISMATCH and options.reference is not None:
+        result.divergence, result.note = bisect_mismatch(
+            board, result.depths[-1].depth, options
+        )
+
+
+def run_case(case: SuiteCase, options: SuiteOptions) -> CaseResult:
+    """
+    Check one suite line. The timeout needs SIGALRM, so it only holds
+    on the main thread of a process (a pool worker's is); elsewhere the
+    position runs to the end.
+    """
+    try:
+        fen, expected = parse_case(case.text)
+    except ValueError as exc:
+        return CaseResult(case.line, case.text, ERROR, note=str(exc))
+    board = Board()
+    board.set_fen(fen)
+    result = CaseResult(case.line, fen, OK)
+
+    timed = (
+        options.timeout is not None
+        and hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if timed:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, options.timeout)
+    try:
+        _check_case(board, expected, options, result)
+    except PerftTimeout:
+        if result.status == MISMATCH:
+            result.note = "timed out while bisecting"
+        else:
+            result.status = TIMEOUT
+            result.note = f"timed out after {options.timeout}s"
+    finally:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    return result
+
+
+def run_suite(
+    cases: Iterable[SuiteCase],
+    options: SuiteOptions,
+    workers: Optional[int] = None,
+) -> Iterator[CaseResult]:
+    """
+    Check `cases` on `workers` processes (all cores by default; 1 runs
+    them here) and yield the results in the order of the cases.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        try:
+            for case in cases:
+                yield run_case(case, options)
+        finally:
+            _close_caches()
+        return
+    pending: Deque[Future[CaseResult]] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for case in cases:
+            pending.append(pool.submit(run_case, case, options))
+            if len(pending) >= workers * QUEUE_PER_WORKER:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def summarize(results: List[CaseResult]) -> Dict[str, float]:
+    """Counts by status, plus total nodes, seconds and nodes/sec."""
+    summary: Dict[str, float] = {
+        "positions": len(results),
+        **{status: 0 for status in (OK, MISMATCH, TIMEOUT, ERROR)},
+    }
+    for result in results:
+        summary[result.status] += 1
+    nodes = sum(result.nodes for result in results)
+    seconds = sum(result.seconds for result in results)
+    summary["nodes"] = nodes
+    summary["seconds"] = seconds
+    summary["nps"] = nodes / seconds if seconds else 0.0
+    return summary
+
+
+def format_result(result: CaseResult) -> List[str]:
+    """A line for `result`, then one per detail of a failure."""
+    depths = f"D{result.depths[-1].depth}" if result.depths else "-"
+    lines = [
+        f"{result.line:>5} {result.status:<8} {depths:>3}"
+        f" {result.nodes:>12} {result.seconds:>8.2f}s  {result.fen}"
+    ]
+    for row in result.depths:
+        if not row.ok:
+            lines.append(
+                f"      D{row.depth}: expected {row.expected},"
+                f" got {row.nodes}"
+            )
+    div = result.divergence
+    if div is not None:
+        after = " ".join(div.path) if div.path else "(root)"
+        lines.append(f"      diverges after {after}: {div.fen}")
+        if div.missing:
+            lines.append(f"      missing: {' '.join(div.missing)}")
+        if div.extra:
+            lines.append(f"      extra: {' '.join(div.extra)}")
+    if result.note:
+        lines.append(f"      {result.note}")
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("epd", help="suite file, '-' for stdin")
+    ap.add_argument("--max-depth", type=int, help="skip deeper counts")
+    ap.add_argument(
+        "--timeout", type=float, help="seconds per position (no limit)"
+    )
+    ap.add_argument(
+        "--workers", type=int, help="processes (default: all cores)"
+    )
+    ap.add_argument(
+        "--generator",
+        choices=sorted(LEGAL_MOVE_GENERATORS),
+        default=DEFAULT_GENERATOR,
+    )
+    ap.add_argument(
+        "--no-bulk",
+        action="store_true",
+        help="make every leaf instead of counting at depth 1",
+    )
+    ap.add_argument(
+        "--hash", type=float, default=0, help="perft table MB per worker"
+    )
+    ap.add_argument("--cache", help="persistent perft cache file")
+    ap.add_argument(
+        "--cache-mb",
+        type=float,
+        default=DEFAULT_CACHE_MB,
+        help="size of a new --cache file",
+    )
+    ap.add_argument(
+        "--reference",
+        choices=sorted(LEGAL_MOVE_GENERATORS),
+        default=DEFAULT_REFERENCE,
+        help="generator to bisect wrong counts against",
+    )
+    ap.add_argument(
+        "--no-bisect", action="store_true", help="do not bisect mismatches"
+    )
+    ap.add_argument("--json", action="store_true", help="emit JSON")
+    args = ap.parse_args(argv)
+
+    options = SuiteOptions(
+        max_depth=args.max_depth,
+        timeout=args.timeout,
+        generator=args.generator,
+        bulk=not args.no_bulk,
+        hash_mb=args.hash,
+        cache=args.cache,
+        cache_mb=args.cache_mb,
+        reference=None if args.no_bisect else args.reference,
+    )
+    if args.cache:
+        # Check or create the file once, before the workers map it
+        with PerftCache(args.cache, args.cache_mb) as cache:
+            if cache.reset_reason is not None and not args.json:
+                print(f"new perft cache {args.cache}: {cache.reset_reason}")
+    f = sys.stdin if args.epd == "-" else open(args.epd)
+    results: List[CaseResult] = []
+    t0 = time.perf_counter()
+    try:
+        for result in run_suite(read_suite(f), options, args.workers):
+            results.append(result)
+            if not args.json:
+                print("\n".join(format_result(result)), flush=True)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    summary = summarize(results)
+    summary["wall_seconds"] = time.perf_counter() - t0
+    if args.json:
+        report = {
+            "summary": summary,
+            "positions": [asdict(result) for result in results],
+        }
+        print(json.dumps(report, indent=2))
+    else:
+        print(
+            f"{summary['positions']:.0f} positions: {summary[OK]:.0f} ok,"
+            f" {summary[MISMATCH]:.0f} mismatch,"
+            f" {summary[TIMEOUT]:.0f} timeout, {summary[ERROR]:.0f} error;"
+            f" {summary['nodes']:.0f} nodes in"
+            f" {summary['wall_seconds']:.1f}s"
+        )
+    return 1 if summary[MISMATCH] or summary[ERROR] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+# engine/bitboard/perft_table.py
+
+"""Fixed-size transposition table for hashed perft.
+
+The table is two preallocated u64 columns, so its memory use is decided
+once, up front, and never grows with the depth of the run:
+
+  * ``keys[i]``  - zobrist key XOR ``data[i]`` (verified on every probe)
+  * ``data[i]``  - ``count << 8 | depth`` (0 means the slot is empty)
+
+Slots are grouped in buckets of two. The first slot of a bucket is
+depth-preferred (a shallower result never evicts a deeper one) and the
+second is always-replace, so recent shallow subtrees still get cached.
+
+The columns are ``array('Q')`` by default. Any writable buffer can be
+passed instead, as for TranspositionTable: its first half holds the
+keys and its second half the data. A slot whose two words were not
+written together (by another process, or by one killed half-way
+through a store) does not XOR back to its key and reads as a miss.
+perft_cache.py keeps a table in a memory-mapped file that way.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Optional, Union
+
+# Bytes per slot: one u64 key plus one u64 packed depth/count
+ENTRY_BYTES = 16
+DEPTH_BITS = 8
+DEPTH_MASK = (1 << DEPTH_BITS) - 1
+
+
+class PerftTable:
+
+    keys: Union[array, memoryview]
+    data: Union[array, memoryview]
+    num_buckets: int
+    hits: int
+    misses: int
+    stores: int
+    overwrites: int
+    hits_by_depth: Dict[int, int]
+    lookups_by_depth: Dict[int, int]
+
+    def __init__(
+        self, size_mb: float = 16, buffer: Optional[object] = None
+    ) -> None:
+        """
+        Allocate `size_mb` megabytes, or use `buffer` (whose size then
+        decides the number of buckets) as the storage.
+        """
+        if buffer is not None:
+            words = memoryview(buffer).cast("B").cast("Q")
+            self.num_buckets = len(words) // 4
+            if self.num_buckets < 1:
+                raise ValueError("buffer too small for one bucket")
+            slots = 2 * self.num_buckets
+            self.keys = words[:slots]
+            self.data = words[slots : 2 * slots]
+            words.release()
+        else:
+            slots = max(2, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+            self.num_buckets = slots // 2
+            self.keys = array("Q", bytes(8 * self.num_buckets * 2))
+            self.data = array("Q", bytes(8 * self.num_buckets * 2))
+        self.reset_stats()
+
+    def __len__(self) -> int:
+        """Number of slots (filled or not)."""
+        return 2 * self.num_buckets
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.keys) * ENTRY_BYTES
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.overwrites = 0
+        self.hits_by_depth = {}
+        self.lookups_by_depth = {}
+
+    def clear(self) -> None:
+        """Empty every slot in place and reset the counters."""
+        zero = array("Q", bytes(8 * len(self)))
+        self.keys[:] = zero
+        self.data[:] = zero
+        self.reset_stats()
+
+    def probe(self, key: int, depth: int) -> Optional[int]:
+        """Return the stored leaf count for (key, depth), or None."""
+        lookups = self.lookups_by_depth
+        lookups[depth] = lookups.get(depth, 0) + 1
+        idx = (key % self.num_buckets) << 1
+        keys = self.keys
+        data = self.data
+        for slot in (idx, idx + 1):
+            entry = data[slot]
+            if (
+                entry
+                and keys[slot] ^ entry == key
+                and (entry & DEPTH_MASK) == depth
+            ):
+                self.hits += 1
+                hits = self.hits_by_depth
+                hits[depth] = hits.get(depth, 0) + 1
+                return entry >> DEPTH_BITS
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, count: int) -> None:
+        """Record `count` leaves for (key, depth)."""
+        idx = (key % self.num_buckets) << 1
+        data = self.data
+        # Depth-preferred slot: take it unless it holds a deeper result
+        old = data[idx]
+        if (old & DEPTH_MASK) <= depth:
+            slot = idx
+        else:
+            slot = idx + 1
+            old = data[slot]
+        if old and (
+            self.keys[slot] ^ old != key or (old & DEPTH_MASK) != depth
+        ):
+            self.overwrites += 1
+        entry = (count << DEPTH_BITS) | depth
+        self.keys[slot] = key ^ entry
+        data[slot] = entry
+        self.stores += 1
+
+    def filled(self) -> int:
+        """Number of occupied slots (a full scan; for reporting only)."""
+        return sum(1 for entry in self.data if entry)
@@ -0,0 +1,183 @@
+# engine/bitboard/profiler.py
+
+"""Per-depth counters and sampled timings for perft and search.
+
+A Profiler is handed to ``perft_count(..., profile=...)`` or to
+``search(..., profile=...)``; without one those run their usual code.
+For the length of the run ``attach`` sets the board's ``profiler``,
+which ``make_move_raw``, ``undo_move_raw`` and ``in_check`` report to
+when it is set (otherwise it costs them one attribute test each), so
+every call is counted, whoever makes it: the tree walk, the legal move
+filter or the search. A depth is a number of plies below the root.
+Makes count at the depth moved from, undos at the depth of the move
+taken back, and in_check calls at the depth of the position looked at
+(the legal move filter's at the child's depth).
+
+Timing is sampled rather than taken at every node, since two clock
+reads per node would cost more than some of what they time:
+
+  * at the first node of each depth and every ``sample_every``-th one
+    after, a perft times the move generation and also counts the
+    pseudo-legal moves there, which gives the legal ratio, and
+  * every ``sample_every`` nodes the timeline gets a (nodes, seconds)
+    point, from which a nodes/sec curve follows.
+
+``rows`` has one record per depth; ``to_json`` and ``to_csv`` export
+them (JSON with the timeline and totals) to a string or a file.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from engine.bitboard.board import Board  # noqa: TC001
+
+# Nodes between two timing samples
+DEFAULT_SAMPLE_EVERY = 1024
+# Depths tracked: deeper than any perft, and than MAX_PLY of the search
+MAX_PROFILE_DEPTH = 160
+
+# Per-depth counters, in export order
+COUNTERS = (
+    "nodes",
+    "moves",
+    "makes",
+    "undos",
+    "in_checks",
+    "samples",
+    "sampled_pseudo",
+    "sampled_legal",
+)
+
+
+class Profiler:
+
+    sample_every: int
+    # Board.ply at the root of the run, the board counts from there
+    root: int
+    nodes: List[int]
+    moves: List[int]
+    makes: List[int]
+    undos: List[int]
+    in_checks: List[int]
+    samples: List[int]
+    sampled_pseudo: List[int]
+    sampled_legal: List[int]
+    gen_seconds: List[float]
+    timeline: List[Tuple[int, float]]
+    seconds: float
+
+    def __init__(self, sample_every: int = DEFAULT_SAMPLE_EVERY) -> None:
+        if sample_every < 1:
+            raise ValueError(f"sample_every must be positive: {sample_every}")
+        self.sample_every = sample_every
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        for name in COUNTERS:
+            setattr(self, name, [0] * MAX_PROFILE_DEPTH)
+        self.gen_seconds = [0.0] * MAX_PROFILE_DEPTH
+        self.timeline = []
+        self.seconds = 0.0
+        self.root = 0
+        self._start = 0.0
+        self._ticks = 0
+
+    @contextmanager
+    def attach(self, board: Board) -> Iterator[None]:
+        """
+        Count `board`'s make/undo/in_check calls and run the clock
+        until the block ends, however it ends.
+        """
+        previous = board.profiler
+        self.root = board.ply
+        self._start = time.perf_counter()
+        board.profiler = self
+        try:
+            yield
+        finally:
+            board.profiler = previous
+            self.seconds += time.perf_counter() - self._start
+
+    def node(self, depth: int) -> bool:
+        """
+        Count a node at `depth`; True if it is one to take samples at:
+        the first node at its depth and every ``sample_every``-th after.
+        """
+        count = self.nodes[depth] + 1
+        self.nodes[depth] = count
+        self._ticks += 1
+        if not self._ticks % self.sample_every:
+            self.timeline.append(
+                (self._ticks, time.perf_counter() - self._start)
+            )
+        return not (count - 1) % self.sample_every
+
+    def num_depths(self) -> int:
+        """One more than the deepest depth with a node."""
+        return max((d + 1 for d, n in enumerate(self.nodes) if n), default=0)
+
+    def rows(self) -> List[Dict[str, float]]:
+        """
+        One record per depth: the counters, "legal_ratio" (legal over
+        pseudo-legal moves at the sampled nodes), "gen_seconds" (the
+        sampled generation time) and "gen_seconds_est" (scaled up to
+        every node at that depth).
+        """
+        rows = []
+        for d in range(self.num_depths()):
+            row: Dict[str, float] = {"depth": d}
+            for name in COUNTERS:
+                row[name] = getattr(self, name)[d]
+            pseudo = self.sampled_pseudo[d]
+            row["legal_ratio"] = (
+                self.sampled_legal[d] / pseudo if pseudo else 0.0
+            )
+            row["gen_seconds"] = self.gen_seconds[d]
+            samples = self.samples[d]
+            row["gen_seconds_est"] = (
+                self.gen_seconds[d] * self.nodes[d] / samples
+                if samples
+                else 0.0
+            )
+            rows.append(row)
+        return rows
+
+    def to_dict(self) -> Dict[str, object]:
+        nodes = sum(self.nodes)
+        return {
+            "sample_every": self.sample_every,
+            "nodes": nodes,
+            "seconds": self.seconds,
+            "nps": nodes / self.seconds if self.seconds else 0.0,
+            "depths": self.rows(),
+            "timeline": [list(point) for point in self.timeline],
+        }
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """The whole profile as JSON, also written to `path` if given."""
+        text = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    def to_csv(self, path: Optional[str] = None) -> str:
+        """The per-depth rows as CSV, also written to `path` if given."""
+        rows = self.rows()
+        out = io.StringIO()
+        fields = list(rows[0]) if rows else ["depth", *COUNTERS]
+        writer = csv.DictWriter(out, fieldnames=fields, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+        text = out.getvalue()
+        if path is not None:
+            with open(path, "w", newline="") as f:
+                f.write(text)
+        return text
@@ -0,0 +1,517 @@
+# engine/bitboard/search.py
+
+"""Negamax alpha-beta search with iterative deepening.
+
+Every iteration searches the full tree to a fixed depth and keeps a
+triangular principal variation: ``pv[ply]`` is the best line found from
+``ply`` onwards, rebuilt on the way back up whenever a move raises alpha.
+The next iteration tries that line first, which is what makes the
+shallower searches pay for themselves.
+
+Moves come from a staged MovePicker (movepick.py): the TT or PV move,
+then captures by MVV-LVA, then killers and history-ordered quiet moves,
+with captures that lose material by static exchange (see.py) last.
+They are pseudo-legal, so a move that leaves the king in check is
+undone and skipped. A quiet move that causes a beta cutoff becomes a
+killer for its ply and earns a ``depth * depth`` history bonus.
+
+At depth 0 a quiescence search takes over: the side to move may stand
+pat on the static evaluation or try captures and promotions (plus
+quiet checks on its first ply), so the horizon never falls in the
+middle of an exchange. Moves that lose material by static exchange are
+pruned there, as standing pat should do better. A side in check cannot
+stand pat and searches every evasion instead.
+
+Leaves are scored by evaluate.py, with pawn structure cached in a
+PawnTable that lives as long as the Searcher.
+
+Results are kept in a TranspositionTable keyed on ``Board.zobrist_key``:
+an entry searched at least as deep as needed cuts the node off if its
+bound allows, and otherwise its best move is tried first. Mate scores
+are stored relative to the node (see score_to_tt) so they stay correct
+when the position is reached at another ply.
+
+A search can be bounded by SearchLimits (timeman.py): a node budget and
+the hard deadline are checked every CHECK_NODES nodes, and crossing
+either abandons the running iteration, unwinds the board to the root
+and returns the last completed iteration's result. The soft deadline
+only stops the next iteration from starting. ``stop`` (safe to call
+from another thread) ends the search the same way at the next check,
+as does a ``should_stop`` callback returning True (how another process
+stops a Lazy SMP helper, see smp.py). The first iteration is given
+FIRST_ITERATION_NODES before ``stop`` and the clock are looked at
+(a node limit holds from the start), which is usually enough to finish
+it. A search stopped before any iteration finished still returns a
+move: the best root move searched so far, or else the first legal one.
+
+Moves are generated packed (see MOVE_* in constants.py), so the PV and
+best move are plain ints; ``move_to_uci`` turns them into UCI strings.
+"""
+
+from __future__ import annotations
+
+import time
+from functools import partial
+from typing import Callable, List, Optional, Tuple
+
+from engine.bitboard.board import Board  # noqa: TC002
+from engine.bitboard.config import PackedMove  # noqa: TC002
+from engine.bitboard.evaluate import evaluate
+from engine.bitboard.generator import (
+    generate_captures,
+    generate_legal_moves,
+    generate_moves,
+    generate_quiet_checks,
+)
+from engine.bitboard.movepick import (
+    KILLER_SLOTS,
+    MovePicker,
+    history_index,
+    is_tactical,
+    mvv_lva,
+)
+from engine.bitboard.pawns import PawnTable
+from engine.bitboard.profiler import Profiler  # noqa: TC001
+from engine.bitboard.see import is_losing
+from engine.bitboard.timeman import CHECK_NODES, SearchLimits, TimeManager
+from engine.bitboard.transposition import (
+    BOUND_EXACT,
+    BOUND_LOWER,
+    BOUND_UPPER,
+    TranspositionTable,
+)
+from engine.bitboard.utils import move_to_uci
+
+# Deepest line the PV table can hold
+MAX_PLY = 128
+INFINITY = 50000
+# Score of being mated at the root; mate in n plies scores MATE_SCORE - n
+MATE_SCORE = 49000
+# Scores beyond this are mates, not material
+MATE_BOUND = MATE_SCORE - MAX_PLY
+# Quiescence plies that also try quiet checking moves
+QS_CHECK_PLIES = 1
+# Nodes the first iteration searches before stop and the clock are
+# first checked, so that it usually finishes
+FIRST_ITERATION_NODES = 1024
+
+# Receives one UCI "info ..." line per completed iteration
+InfoCallback = Callable[[str], None]
+# Polled with the node limits; True stops the search
+StopCallback = Callable[[], bool]
+
+
+class _SearchAborted(Exception):
+    """Raised inside the tree when a node or time limit is reached."""
+
+
+def format_score(score: int) -> str:
+    """UCI score token: "cp 35", "mate 3" or "mate -2" (in moves)."""
+    if score >= MATE_BOUND:
+        return f"mate {(MATE_SCORE - score + 1) // 2}"
+    if score <= -MATE_BOUND:
+        return f"mate -{(MATE_SCORE + score) // 2}"
+    return f"cp {score}"
+
+
+def score_to_tt(score: int, ply: int) -> int:
+    """Mate scores as distance from this node rather than from the root."""
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_tt(score: int, ply: int) -> int:
+    """Inverse of score_to_tt for a node at `ply`."""
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class Searcher:
+
+    board: Board
+    evaluate: Callable[[Board], int]
+    on_info: Optional[InfoCallback]
+    should_stop: Optional[StopCallback]
+    tt: TranspositionTable
+    pawns: PawnTable
+    timer: Optional[TimeManager]
+    node_limit: Optional[int]
+    stopped: bool
+    depth: int
+    nodes: int
+    generated: int
+    pv: List[List[PackedMove]]
+    killers: List[List[PackedMove]]
+    history: List[int]
+
+    def __init__(
+        self,
+        board: Board,
+        *,
+        on_info: Optional[InfoCallback] = None,
+        tt: Optional[TranspositionTable] = None,
+        pawns: Optional[PawnTable] = None,
+        should_stop: Optional[StopCallback] = None,
+    ) -> None:
+        self.board = board
+        self.on_info = on_info
+        self.should_stop = should_stop
+        self.tt = tt if tt is not None else TranspositionTable()
+        self.pawns = pawns if pawns is not None else PawnTable()
+        self.evaluate = partial(evaluate, pawns=self.pawns)
+        self.nodes = 0
+        self.generated = 0
+        self.pv = [[] for _ in range(MAX_PLY + 1)]
+        self.killers = [[0] * KILLER_SLOTS for _ in range(MAX_PLY + 1)]
+        # Indexed by history_index(side, move)
+        self.history = [0] * (2 << 12)
+        self._prev_pv: List[PackedMove] = []
+        self._follow_pv = False
+        self.timer = None
+        self.node_limit = None
+        self.stopped = False
+        self.depth = 0
+        # Node count at which _check_limits next runs
+        self._next_check = 0
+        self._stop_requested = False
+
+    def search(
+        self,
+        max_depth: int = MAX_PLY,
+        limits: Optional[SearchLimits] = None,
+        *,
+        skip_size: int = 0,
+        skip_phase: int = 0,
+    ) -> Tuple[Optional[PackedMove], int]:
+        """
+        Iteratively deepen to `max_depth` plies, or less if `limits`
+        says so, and return (best move, score). The best move is None
+        if the side to move has no legal moves. The line behind it is
+        left in ``pv[0]`` and its depth in ``depth``; ``stopped`` tells
+        whether a limit or ``stop`` cut the search short.
+
+        A nonzero `skip_size` leaves out the depths for which
+        ``(depth + skip_phase) // skip_size`` is odd, as Lazy SMP
+        helpers do to spread over the depths rather than follow the
+        main search in step.
+        """
+        board = self.board
+        if limits is not None:
+            if limits.depth is not None:
+                max_depth = min(max_depth, limits.depth)
+            self.timer = TimeManager(limits, board.side_to_move)
+            self.node_limit = limits.nodes
+        else:
+            self.timer = None
+            self.node_limit = None
+        self.stopped = False
+        self.depth = 0
+        root_ply = board.ply
+        self.nodes = 0
+        self.generated = 0
+        self._prev_pv = []
+        self.tt.new_search()
+        self.pawns.reset_stats()
+        for killers in self.killers:
+            killers[:] = [0] * KILLER_SLOTS
+        # Keep what earlier searches learned, at half weight
+        self.history = [h >> 1 for h in self.history]
+        best_move: Optional[PackedMove] = None
+        score = 0
+        start = time.perf_counter()
+        for depth in range(1, max_depth + 1):
+            if skip_size and (depth + skip_phase) // skip_size % 2:
+                continue
+            if self.depth:
+                self._next_check = self.nodes
+            else:
+                self._next_check = FIRST_ITERATION_NODES
+                if self.node_limit is not None:
+                    self._next_check = min(self.node_limit, self._next_check)
+            self._follow_pv = True
+            try:
+                iteration_score = self._negamax(depth, -INFINITY, INFINITY, 0)
+            except _SearchAborted:
+                while board.ply > root_ply:
+                    board.undo_move_raw()
+                if not self.depth:
+                    best_move = self._fallback_move()
+                self.pv[0] = self._prev_pv[:]
+                break
+            score = iteration_score
+            self.depth = depth
+            line = self.pv[0]
+            if line:
+                best_move = line[0]
+            self._prev_pv = line[:]
+            if self.on_info is not None:
+                elapsed = time.perf_counter() - start
+                self.on_info(self._info_line(depth, score, elapsed))
+            if abs(score) >= MATE_BOUND or not line:
+                break
+            timer = self.timer
+            if timer is not None and depth < max_depth:
+                if timer.soft_expired():
+                    self.stopped = True
+                    break
+        # A stop that came in after the last check is spent
+        self._stop_requested = False
+        return best_move, score
+
+    def _fallback_move(self) -> Optional[PackedMove]:
+        """
+        The move to play when no iteration finished: the best root move
+        of the unfinished one, if it got that far, else the first legal
+        move. Either becomes the PV.
+        """
+        line = self.pv[0]
+        if not line:
+            moves = generate_legal_moves(self.board, True)
+            line = moves[:1]
+        self._prev_pv = line[:1]
+        return line[0] if line else None
+
+    def stop(self) -> None:
+        """Ask the running search to return as soon as it can."""
+        self._stop_requested = True
+
+    def ponderhit(self) -> None:
+        """The pondered move was played: start the search's clock."""
+        if self.timer is not None:
+            self.timer.ponderhit()
+
+    def _check_limits(self) -> None:
+        """
+        Stop the search if asked to, or if the node budget or the hard
+        deadline is hit.
+        """
+        nodes = self.nodes
+        limit = self.node_limit
+        timer = self.timer
+        if (
+            self._stop_requested
+            or (limit is not None and nodes >= limit)
+            or (timer is not None and timer.hard_expired())
+            or (self.should_stop is not None and self.should_stop())
+        ):
+            self.stopped = True
+            raise _SearchAborted
+        self._next_check = nodes + CHECK_NODES
+        if limit is not None and limit < self._next_check:
+            self._next_check = limit
+
+    def _info_line(self, depth: int, score: int, elapsed: float) -> str:
+        nps = int(self.nodes / elapsed) if elapsed > 0 else 0
+        pv = " ".join(move_to_uci(m) for m in self.pv[0])
+        return (
+            f"info depth {depth} score {format_score(score)}"
+            f" nodes {self.nodes} nps {nps} time {int(elapsed * 1000)}"
+            f" hashfull {self.tt.hashfull()} pv {pv}"
+        )
+
+    def _is_draw(self) -> bool:
+        """Fifty-move rule, or a repetition within the reversible plies."""
+        board = self.board
+        if board.halfmove_clock >= 100:
+            return True
+        history = board.zobrist_history
+        key = board.zobrist_key
+        last = len(history) - 1
+        first = max(last - board.halfmove_clock, 0)
+        # Only positions with the same side to move can repeat
+        for i in range(last - 2, first - 1, -2):
+            if history[i] == key:
+                return True
+        return False
+
+    def _record_cutoff(
+        self, move: PackedMove, depth: int, ply: int, side: int
+    ) -> None:
+        """Remember a quiet move that failed high at `ply`."""
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1:] = killers[:-1]
+            killers[0] = move
+        self.history[history_index(side, move)] += depth * depth
+
+    def _quiesce(self, alpha: int, beta: int, ply: int, qply: int) -> int:
+        board = self.board
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self._check_limits()
+        if ply >= MAX_PLY:
+            return self.evaluate(board)
+
+        us = board.side_to_move
+        in_check = board.in_check(us)
+        if in_check:
+            best = -INFINITY
+            moves = generate_moves(board, True)
+            self.generated += len(moves)
+        else:
+            # Stand pat: the side to move need not capture anything
+            best = self.evaluate(board)
+            if best >= beta:
+                return best
+            if best > alpha:
+                alpha = best
+            moves = generate_captures(board, True)
+            moves.sort(key=lambda m: mvv_lva(board, m), reverse=True)
+            if qply < QS_CHECK_PLIES:
+                moves += generate_quiet_checks(board, True)
+            self.generated += len(moves)
+            # Captures and checks that lose material by static exchange
+            # are not worth searching when standing pat is an option
+            moves = [m for m in moves if not is_losing(board, m)]
+
+        legal = 0
+        for move in moves:
+            board.make_move_raw(move)
+            if board.in_check(us):
+                board.undo_move_raw()
+                continue
+            legal += 1
+            score = -self._quiesce(-beta, -alpha, ply + 1, qply + 1)
+            board.undo_move_raw()
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if in_check and not legal:
+            return ply - MATE_SCORE
+        return best
+
+    def _negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        board = self.board
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self._check_limits()
+        self.pv[ply] = []
+
+        if ply and self._is_draw():
+            return 0
+        if depth == 0:
+            return self._quiesce(alpha, beta, ply, 0)
+        if ply >= MAX_PLY:
+            return self.evaluate(board)
+
+        key = board.zobrist_key
+        tt_move = 0
+        entry = self.tt.probe(key)
+        if entry is not None:
+            tt_move, tt_score, tt_depth, tt_bound = entry
+            # Never cut at the root: it has to produce a move and a PV
+            if ply and tt_depth >= depth:
+                tt_score = score_from_tt(tt_score, ply)
+                if (
+                    tt_bound == BOUND_EXACT
+                    or (tt_bound == BOUND_LOWER and tt_score >= beta)
+                    or (tt_bound == BOUND_UPPER and tt_score <= alpha)
+                ):
+                    return tt_score
+
+        # While still on the previous iteration's PV, its move goes first
+        if self._follow_pv:
+            if ply < len(self._prev_pv):
+                tt_move = self._prev_pv[ply]
+            else:
+                self._follow_pv = False
+
+        us = board.side_to_move
+        picker = MovePicker(board, tt_move, self.killers[ply], self.history)
+        alpha_orig = alpha
+        best = -INFINITY
+        best_move = 0
+        legal = 0
+        for move in picker:
+            board.make_move_raw(move)
+            if board.in_check(us):
+                board.undo_move_raw()
+                continue
+            legal += 1
+            score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            board.undo_move_raw()
+            # Siblings of the first move are off the previous PV
+            self._follow_pv = False
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    best_move = move
+                    self.pv[ply] = [move] + self.pv[ply + 1]
+                    if alpha >= beta:
+                        if not is_tactical(move):
+                            self._record_cutoff(move, depth, ply, us)
+                        break
+        self.generated += picker.generated
+
+        if not legal:
+            if board.in_check(us):
+                return ply - MATE_SCORE
+            return 0
+
+        if best >= beta:
+            bound = BOUND_LOWER
+        elif best > alpha_orig:
+            bound = BOUND_EXACT
+        else:
+            bound = BOUND_UPPER
+        self.tt.store(key, depth, bound, score_to_tt(best, ply), best_move)
+        return best
+
+
+class ProfiledSearcher(Searcher):
+    """
+    A Searcher that reports every node, at its ply, to a Profiler (see
+    profiler.py); Searcher itself stays free of the bookkeeping.
+    """
+
+    profile: Profiler
+
+    def __init__(self, board: Board, profile: Profiler, **kwargs) -> None:
+        super().__init__(board, **kwargs)
+        self.profile = profile
+
+    def search(self, *args, **kwargs) -> Tuple[Optional[PackedMove], int]:
+        with self.profile.attach(self.board):
+            return super().search(*args, **kwargs)
+
+    def _quiesce(self, alpha: int, beta: int, ply: int, qply: int) -> int:
+        self.profile.node(ply)
+        return super()._quiesce(alpha, beta, ply, qply)
+
+    def _negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.profile.node(ply)
+        return super()._negamax(depth, alpha, beta, ply)
+
+
+def search(
+    board: Board,
+    depth: int = MAX_PLY,
+    *,
+    limits: Optional[SearchLimits] = None,
+    on_info: Optional[InfoCallback] = None,
+    tt: Optional[TranspositionTable] = None,
+    pawns: Optional[PawnTable] = None,
+    profile: Optional[Profiler] = None,
+) -> Tuple[Optional[PackedMove], int]:
+    """
+    Search `board` to `depth` plies within `limits`; see Searcher. With
+    a `profile`, a ProfiledSearcher does the search.
+    """
+    if profile is not None:
+        searcher: Searcher = ProfiledSearcher(
+            board, profile, on_info=on_info, tt=tt, pawns=pawns
+        )
+    else:
+        searcher = Searcher(board, on_info=on_info, tt=tt, pawns=pawns)
+    return searcher.search(depth, limits)
@@ -0,0 +1,158 @@
+# engine/bitboard/see.py
+
+"""Static exchange evaluation.
+
+``see(board, move)`` plays out the capture sequence on the destination
+square of `move` -- each side recapturing with its least valuable
+attacker and free to stop when recapturing would lose -- and returns
+the material balance for the side to move, in centipawns. The board is
+only read: the exchange runs on an occupancy bitboard, and sliders
+uncovered behind a capturing piece (x-rays) are picked up by recomputing
+the rook and bishop attacks on the shrinking occupancy.
+
+Promotions count for the move itself but not for recaptures further
+down the sequence.
+"""
+
+from __future__ import annotations
+
+from engine.bitboard.attack_utils import PAWN_ATTACKS
+from engine.bitboard.board import Board  # noqa: TC002
+from engine.bitboard.config import PackedMove  # noqa: TC002
+from engine.bitboard.constants import (
+    BLACK,
+    BLACK_BISHOP,
+    BLACK_KING,
+    BLACK_KNIGHT,
+    BLACK_PAWN,
+    BLACK_QUEEN,
+    BLACK_ROOK,
+    MOVE_DST_SHIFT,
+    MOVE_FLAG_CAPTURE,
+    MOVE_FLAG_EN_PASSANT,
+    MOVE_PROMO_MASK,
+    MOVE_PROMO_SHIFT,
+    MOVE_SQ_MASK,
+    WHITE,
+    WHITE_BISHOP,
+    WHITE_KING,
+    WHITE_KNIGHT,
+    WHITE_PAWN,
+    WHITE_QUEEN,
+    WHITE_ROOK,
+)
+from engine.bitboard.evaluate import PIECE_VALUES
+from engine.bitboard.moves.bishop import bishop_attacks
+from engine.bitboard.moves.king import KING_ATTACKS
+from engine.bitboard.moves.knight import KNIGHT_ATTACKS
+from engine.bitboard.moves.rook import rook_attacks
+
+# Exchange value per piece type; the king outweighs any material so
+# that capturing it always ends the exchange
+SEE_VALUES = PIECE_VALUES[:WHITE_KING] + (20000,)
+
+
+def _sliders(board: Board) -> tuple[int, int]:
+    """Diagonal (bishops, queens) and straight (rooks, queens) sliders."""
+    bbs = board.bitboards
+    queens = bbs[WHITE_QUEEN] | bbs[BLACK_QUEEN]
+    return (
+        bbs[WHITE_BISHOP] | bbs[BLACK_BISHOP] | queens,
+        bbs[WHITE_ROOK] | bbs[BLACK_ROOK] | queens,
+    )
+
+
+def attackers_to(board: Board, sq: int, occ: int) -> int:
+    """
+    Pieces of either colour attacking `sq` given occupancy `occ`. Pieces
+    not in `occ` are left out, and sliders only see through squares that
+    are empty in `occ`.
+    """
+    bbs = board.bitboards
+    diagonal, straight = _sliders(board)
+    return (
+        (PAWN_ATTACKS[BLACK][sq] & bbs[WHITE_PAWN])
+        | (PAWN_ATTACKS[WHITE][sq] & bbs[BLACK_PAWN])
+        | (KNIGHT_ATTACKS[sq] & (bbs[WHITE_KNIGHT] | bbs[BLACK_KNIGHT]))
+        | (KING_ATTACKS[sq] & (bbs[WHITE_KING] | bbs[BLACK_KING]))
+        | (bishop_attacks(sq, occ) & diagonal)
+        | (rook_attacks(sq, occ) & straight)
+    ) & occ
+
+
+def see(board: Board, move: PackedMove) -> int:
+    """
+    Material won (positive) or lost (negative) by the side to move when
+    `move` starts an exchange on its destination square. Quiet moves
+    start at zero, so a negative result means the moved piece hangs.
+    """
+    src = move & MOVE_SQ_MASK
+    dst = (move >> MOVE_DST_SHIFT) & MOVE_SQ_MASK
+    bbs = board.bitboards
+    pieces = board.square_to_piece
+    occ = board.all_occ ^ (1 << src)
+
+    if move & MOVE_FLAG_EN_PASSANT:
+        gain = SEE_VALUES[WHITE_PAWN]
+        # The captured pawn sits beside the destination, not on it
+        occ ^= 1 << (dst - 8 if board.side_to_move == WHITE else dst + 8)
+    elif move & MOVE_FLAG_CAPTURE:
+        gain = SEE_VALUES[pieces[dst] % 6]
+    else:
+        gain = 0
+    # Value of the piece now standing on dst, next in line to be taken
+    at_risk = SEE_VALUES[pieces[src] % 6]
+    promo = (move >> MOVE_PROMO_SHIFT) & MOVE_PROMO_MASK
+    if promo:
+        gain += SEE_VALUES[promo] - SEE_VALUES[WHITE_PAWN]
+        at_risk = SEE_VALUES[promo]
+
+    diagonal, straight = _sliders(board)
+    attackers = attackers_to(board, dst, occ)
+    side = board.side_to_move ^ 1
+    gains = [gain]
+    while True:
+        if side == BLACK:
+            off, own = 6, attackers & board.black_occ
+        else:
+            off, own = 0, attackers & board.white_occ
+        if not own:
+            break
+        # Least valuable attacker of `side`
+        for kind in range(6):
+            bb = own & bbs[kind + off]
+            if bb:
+                break
+        if kind == WHITE_KING and attackers & ~own:
+            # The king may not recapture into a defended square
+            break
+        gains.append(at_risk - gains[-1])
+        occ ^= bb & -bb
+        if kind in (WHITE_PAWN, WHITE_BISHOP, WHITE_QUEEN):
+            attackers |= bishop_attacks(dst, occ) & diagonal
+        if kind in (WHITE_ROOK, WHITE_QUEEN):
+            attackers |= rook_attacks(dst, occ) & straight
+        attackers &= occ
+        at_risk = SEE_VALUES[kind]
+        side ^= 1
+
+    # Each side chooses between its capture and standing pat
+    for i in range(len(gains) - 1, 0, -1):
+        gains[i - 1] = -max(-gains[i - 1], gains[i])
+    return gains[0]
+
+
+def is_losing(board: Board, move: PackedMove) -> bool:
+    """
+    ``see(board, move) < 0``, without running the exchange when the
+    move takes a piece worth at least the one moving: it cannot lose.
+    """
+    pieces = board.square_to_piece
+    mover = SEE_VALUES[pieces[move & MOVE_SQ_MASK] % 6]
+    if move & MOVE_FLAG_EN_PASSANT:
+        return False
+    if move & MOVE_FLAG_CAPTURE:
+        victim = pieces[(move >> MOVE_DST_SHIFT) & MOVE_SQ_MASK] % 6
+        if SEE_VALUES[victim] >= mover:
+            return False
+    return see(board, move) < 0
@@ -0,0 +1,257 @@
+# engine/bitboard/smp.py
+
+"""Lazy SMP: helper processes searching next to the main search.
+
+The interpreter lock keeps a Python search on one core, so the helpers
+are processes. A HelperPool starts them once (with "spawn", which is
+safe next to the UCI reader thread) and keeps them waiting for jobs.
+All of them, and the main search, use one TranspositionTable laid over
+a ``multiprocessing.shared_memory`` block. The table has no locks:
+each slot keeps its key XOR its data (see transposition.py), so a slot
+torn by two writers reads as a miss.
+
+For each ``go`` the main search calls ``start`` before it begins and
+``stop`` once it is done. A helper searches the same position with no
+limit but the depth, and differs from the main search and from the
+other helpers in the depths it leaves out (HELPER_SKIPS). Each one's
+results reach the others through the table, which is where the speedup
+comes from. Every job carries a search id, and a shared value holds
+the id of the search under way: ``start`` sets it to the new id and
+``stop`` to 0. A helper polls it along with its node limits and gives
+up as soon as it stops matching its own job's id, so one that missed a
+``stop`` cannot carry on into the next search and fill the table with
+entries for the old position. ``stop`` then collects one HelperResult
+per helper, so the caller can play the move of the deepest completed
+iteration (deeper_result).
+"""
+
+from __future__ import annotations
+
+import ctypes
+import multiprocessing
+import queue
+from dataclasses import dataclass
+from multiprocessing.connection import Connection  # noqa: TC003
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Tuple
+
+from engine.bitboard.board import Board  # noqa: TC002
+from engine.bitboard.config import PackedMove  # noqa: TC002
+from engine.bitboard.pawns import PawnTable
+from engine.bitboard.search import Searcher
+from engine.bitboard.timeman import SearchLimits
+from engine.bitboard.transposition import (
+    AGE_MASK,
+    BUCKET_SLOTS,
+    DEFAULT_HASH_MB,
+    ENTRY_BYTES,
+    TranspositionTable,
+)
+
+# (skip_size, skip_phase) for helper i % len(HELPER_SKIPS), see
+# Searcher.search: helpers spread over the depths in different patterns
+HELPER_SKIPS: Tuple[Tuple[int, int], ...] = tuple(
+    (size, phase)
+    for size, phases in ((1, 2), (2, 4), (3, 6), (4, 8))
+    for phase in range(phases)
+)
+# Seconds to wait for a stopped helper's result before giving up on it
+RESULT_TIMEOUT = 5.0
+# Seconds to wait for a helper to exit before killing it
+JOIN_TIMEOUT = 5.0
+
+
+@dataclass
+class HelperResult:
+    """What one helper's search came to."""
+
+    helper: int
+    depth: int
+    score: int
+    move: Optional[PackedMove]
+    nodes: int
+
+
+def _table_bytes(size_mb: float) -> int:
+    """Buffer size of a TranspositionTable of `size_mb` megabytes."""
+    slots = int(size_mb * 1024 * 1024) // ENTRY_BYTES
+    buckets = max(1, slots // BUCKET_SLOTS)
+    return buckets * BUCKET_SLOTS * ENTRY_BYTES
+
+
+def _helper_main(
+    index: int,
+    shm_name: str,
+    size: int,
+    jobs: Connection,
+    results: multiprocessing.Queue,
+    current: ctypes.c_longlong,
+) -> None:
+    """Helper process: search each job until told to stop or quit."""
+    shm = SharedMemory(name=shm_name)
+    tt = TranspositionTable(buffer=shm.buf[:size])
+    pawns = PawnTable()
+    skip_size, skip_phase = HELPER_SKIPS[index % len(HELPER_SKIPS)]
+    try:
+        while True:
+            job = jobs.recv()
+            if job is None:
+                break
+            search_id, fen, history, depth, generation = job
+            board = Board()
+            board.set_fen(fen)
+            # Earlier positions, for repetition detection
+            board.zobrist_history = history
+            # search() moves on to the main search's generation
+            tt.generation = (generation - 1) & AGE_MASK
+            searcher = Searcher(
+                board,
+                tt=tt,
+                pawns=pawns,
+                # Stopped, or already replaced by the next search
+                should_stop=lambda: current.value != search_id,
+            )
+            move, score = searcher.search(
+                limits=SearchLimits(depth=depth),
+                skip_size=skip_size,
+                skip_phase=skip_phase,
+            )
+            result = HelperResult(
+                index, searcher.depth, score, move, searcher.nodes
+            )
+            results.put((search_id, result))
+    finally:
+        tt.entries.release()
+        shm.close()
+
+
+class HelperPool:
+    """
+    `helpers` search processes sharing ``tt``, a `size_mb` megabyte
+    table in shared memory that the main search should use too.
+    """
+
+    helpers: int
+    tt: TranspositionTable
+    _shm: SharedMemory
+    _current: ctypes.c_longlong
+    _results: multiprocessing.Queue
+    _jobs: List[Connection]
+    _procs: List[multiprocessing.process.BaseProcess]
+    _running: bool
+    _search_id: int
+
+    def __init__(
+        self, helpers: int, size_mb: float = DEFAULT_HASH_MB
+    ) -> None:
+        if helpers < 1:
+            raise ValueError(f"helpers must be at least 1: {helpers}")
+        ctx = multiprocessing.get_context("spawn")
+        size = _table_bytes(size_mb)
+        self.helpers = helpers
+        self._shm = SharedMemory(create=True, size=size)
+        self.tt = TranspositionTable(buffer=self._shm.buf[:size])
+        # Search id of the job under way, 0 when there is none
+        self._current = ctx.RawValue(ctypes.c_longlong, 0)
+        self._results = ctx.Queue()
+        self._jobs = []
+        self._procs = []
+        self._running = False
+        self._search_id = 0
+        for index in range(helpers):
+            ours, theirs = ctx.Pipe()
+            proc = ctx.Process(
+                target=_helper_main,
+                args=(
+                    index,
+                    self._shm.name,
+                    size,
+                    theirs,
+                    self._results,
+                    self._current,
+                ),
+                daemon=True,
+            )
+            proc.start()
+            theirs.close()
+            self._jobs.append(ours)
+            self._procs.append(proc)
+
+    def start(self, board: Board, limits: SearchLimits) -> None:
+        """Set every helper searching `board`, which is not changed."""
+        self._search_id += 1
+        # Any helper still on an earlier job gives up on it
+        self._current.value = self._search_id
+        # Only the reversible plies can repeat
+        history = board.zobrist_history[-(board.halfmove_clock + 1) :]
+        job = (
+            self._search_id,
+            board.get_fen(),
+            history,
+            limits.depth,
+            (self.tt.generation + 1) & AGE_MASK,
+        )
+        for jobs in self._jobs:
+            jobs.send(job)
+        self._running = True
+
+    def stop(self) -> List[HelperResult]:
+        """Stop the helpers' searches and return their results."""
+        if not self._running:
+            return []
+        self._running = False
+        self._current.value = 0
+        results: List[HelperResult] = []
+        while len(results) < self.helpers:
+            try:
+                search_id, result = self._results.get(timeout=RESULT_TIMEOUT)
+            except queue.Empty:
+                break
+            # A helper that missed an earlier stop reports late
+            if search_id == self._search_id:
+                results.append(result)
+        return results
+
+    def close(self) -> None:
+        """Stop the helpers and free the shared table."""
+        self.stop()
+        for jobs in self._jobs:
+            try:
+                jobs.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            jobs.close()
+        for proc in self._procs:
+            proc.join(JOIN_TIMEOUT)
+            if proc.is_alive():
+                proc.kill()
+                proc.join()
+        self._jobs = []
+        self._procs = []
+        self._results.close()
+        self._results.join_thread()
+        # The table is unusable from here on
+        self.tt.entries.release()
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> HelperPool:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def deeper_result(
+    depth: int, results: List[HelperResult]
+) -> Optional[HelperResult]:
+    """
+    The helper result with a move from the deepest iteration, if that
+    went deeper than the main search's `depth`.
+    """
+    best = None
+    for result in results:
+        if result.move is not None and result.depth > depth:
+            if best is None or result.depth > best.depth:
+                best = result
+    return best
@@ -0,0 +1,113 @@
+# engine/bitboard/timeman.py
+
+"""Search limits and time management.
+
+SearchLimits holds what a UCI ``go`` command asked for. TimeManager
+turns it into two deadlines for the side to move:
+
+  soft - checked between iterations: past it, no new iteration starts,
+         since it would most likely not finish anyway
+  hard - checked every CHECK_NODES nodes inside the search: past it,
+         the running iteration is abandoned
+
+With ``movetime`` both deadlines are that time. With a clock, the soft
+deadline is an even share of the remaining time over ``movestogo``
+(DEFAULT_MOVES_TO_GO when not given) plus most of the increment, and
+the hard deadline a few soft deadlines further, never more than a
+fraction of the clock. MOVE_OVERHEAD_MS is held back for the GUI and
+the pipe. Depth, node and ``infinite`` searches have no deadlines.
+
+A ``ponder`` search thinks on the opponent's time: its deadlines are
+suspended until ``ponderhit`` says the expected move was played, and
+then count from that moment.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from engine.bitboard.constants import WHITE
+
+# Nodes searched between two looks at the clock and the node limit
+CHECK_NODES = 256
+# Milliseconds kept in hand for communication lag
+MOVE_OVERHEAD_MS = 30
+# Moves assumed left until the next time control when the GUI does not
+# say (sudden death)
+DEFAULT_MOVES_TO_GO = 30
+# The hard deadline: this many soft deadlines, at most this share of
+# the clock
+HARD_SOFT_RATIO = 4
+HARD_CLOCK_SHARE = 0.5
+
+
+@dataclass
+class SearchLimits:
+    """The limits of a UCI ``go`` command, times in milliseconds."""
+
+    depth: Optional[int] = None
+    nodes: Optional[int] = None
+    movetime: Optional[int] = None
+    wtime: Optional[int] = None
+    btime: Optional[int] = None
+    winc: int = 0
+    binc: int = 0
+    movestogo: Optional[int] = None
+    infinite: bool = False
+    ponder: bool = False
+
+
+class TimeManager:
+
+    soft_ms: Optional[float]
+    hard_ms: Optional[float]
+    start: float
+    pondering: bool
+
+    def __init__(self, limits: SearchLimits, side: int) -> None:
+        self.soft_ms, self.hard_ms = allocate(limits, side)
+        self.start = time.perf_counter()
+        self.pondering = limits.ponder
+
+    def ponderhit(self) -> None:
+        """Start the clock of a ponder search."""
+        self.start = time.perf_counter()
+        self.pondering = False
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def soft_expired(self) -> bool:
+        """True once a new iteration should not be started."""
+        if self.soft_ms is None or self.pondering:
+            return False
+        return self.elapsed_ms() >= self.soft_ms
+
+    def hard_expired(self) -> bool:
+        """True once the search must stop, mid-iteration or not."""
+        if self.hard_ms is None or self.pondering:
+            return False
+        return self.elapsed_ms() >= self.hard_ms
+
+
+def allocate(
+    limits: SearchLimits, side: int
+) -> tuple[Optional[float], Optional[float]]:
+    """(soft, hard) thinking time in milliseconds, None if unlimited."""
+    if limits.infinite:
+        return None, None
+    if limits.movetime is not None:
+        budget = float(max(limits.movetime - MOVE_OVERHEAD_MS, 1))
+        return budget, budget
+    clock = limits.wtime if side == WHITE else limits.btime
+    if clock is None:
+        return None, None
+    inc = limits.winc if side == WHITE else limits.binc
+    left = max(clock - MOVE_OVERHEAD_MS, 1)
+    moves_to_go = limits.movestogo or DEFAULT_MOVES_TO_GO
+    hard = left * HARD_CLOCK_SHARE
+    soft = min(left / moves_to_go + inc * 3 / 4, hard)
+    hard = min(soft * HARD_SOFT_RATIO, hard)
+    return soft, hard
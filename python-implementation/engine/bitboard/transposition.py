@@ -0,0 +1,195 @@
+# engine/bitboard/transposition.py
+
+"""Fixed-size transposition table for search.
+
+All entries live in one preallocated buffer of u64 words, two words per
+slot, so memory use is decided once from the UCI ``Hash`` option:
+
+  * ``entries[2 * i]``     - zobrist key XOR the data word
+  * ``entries[2 * i + 1]`` - packed data, 0 while the slot is empty:
+
+      bits  0-17  best move, packed (see MOVE_* in constants.py), 0 = none
+      bits 18-37  score + SCORE_OFFSET
+      bits 38-45  remaining depth the score was searched to
+      bits 46-47  bound: BOUND_LOWER, BOUND_UPPER or BOUND_EXACT (never 0)
+      bits 48-55  generation (search number) that wrote the entry
+
+Slots are grouped in buckets of four (64 bytes). A store reuses the slot
+already holding its key, else an empty one, else evicts the slot with
+the lowest ``depth - AGE_WEIGHT * age``: deep results survive, but
+entries left over from earlier searches go first.
+
+The buffer is an ``array('Q')`` by default; any writable buffer (e.g.
+shared memory) can be passed instead and is used through a ``Q``
+memoryview. Lazy SMP helpers (smp.py) share one table that way, without
+locks: a probe takes a slot only if its two words XOR back to the key,
+so a slot half-written by another process reads as a miss instead of
+handing out one position's data under another's key.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Optional, Tuple, Union
+
+from engine.bitboard.config import PackedMove  # noqa: TC002
+
+# Default table size in megabytes (the UCI "Hash" option)
+DEFAULT_HASH_MB = 16
+# Bytes per slot: one u64 key plus one u64 of packed data
+ENTRY_BYTES = 16
+BUCKET_SLOTS = 4
+BUCKET_WORDS = 2 * BUCKET_SLOTS
+
+BOUND_LOWER = 1  # score >= stored score (fail high)
+BOUND_UPPER = 2  # score <= stored score (fail low)
+BOUND_EXACT = 3
+
+MOVE_MASK = (1 << 18) - 1
+SCORE_SHIFT = 18
+SCORE_MASK = (1 << 20) - 1
+SCORE_OFFSET = 1 << 19
+DEPTH_SHIFT = 38
+DEPTH_MASK = 0xFF
+BOUND_SHIFT = 46
+AGE_SHIFT = 48
+AGE_MASK = 0xFF
+# Depth an entry is worth less per search it has survived
+AGE_WEIGHT = 8
+# Slots sampled by hashfull(), as UCI expects a per-mille figure
+HASHFULL_SAMPLE = 1000
+
+# (move, score, depth, bound)
+TTEntry = Tuple[PackedMove, int, int, int]
+
+
+class TranspositionTable:
+
+    entries: Union[array, memoryview]
+    num_buckets: int
+    generation: int
+    probes: int
+    hits: int
+    stores: int
+
+    def __init__(
+        self, size_mb: float = DEFAULT_HASH_MB, buffer: Optional[object] = None
+    ) -> None:
+        """
+        Allocate `size_mb` megabytes, or use `buffer` (whose size then
+        decides the number of buckets) as the entry storage.
+        """
+        if buffer is not None:
+            self.entries = memoryview(buffer).cast("B").cast("Q")
+            self.num_buckets = len(self.entries) // BUCKET_WORDS
+        else:
+            slots = int(size_mb * 1024 * 1024) // ENTRY_BYTES
+            self.num_buckets = max(1, slots // BUCKET_SLOTS)
+            self.entries = array(
+                "Q", bytes(8 * BUCKET_WORDS * self.num_buckets)
+            )
+        if self.num_buckets < 1:
+            raise ValueError("buffer too small for one bucket")
+        self.generation = 0
+        self.reset_stats()
+
+    def __len__(self) -> int:
+        """Number of slots (filled or not)."""
+        return self.num_buckets * BUCKET_SLOTS
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self) * ENTRY_BYTES
+
+    def reset_stats(self) -> None:
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def clear(self) -> None:
+        """Empty every slot in place and reset the counters."""
+        words = self.num_buckets * BUCKET_WORDS
+        self.entries[:words] = array("Q", bytes(8 * words))
+        self.generation = 0
+        self.reset_stats()
+
+    def new_search(self) -> None:
+        """Start a new generation; older entries become cheaper to evict."""
+        self.generation = (self.generation + 1) & AGE_MASK
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        """Return (move, score, depth, bound) stored for `key`, or None."""
+        self.probes += 1
+        entries = self.entries
+        base = (key % self.num_buckets) * BUCKET_WORDS
+        for i in range(base, base + BUCKET_WORDS, 2):
+            data = entries[i + 1]
+            if not data:
+                return None
+            if entries[i] ^ data == key:
+                self.hits += 1
+                return (
+                    data & MOVE_MASK,
+                    ((data >> SCORE_SHIFT) & SCORE_MASK) - SCORE_OFFSET,
+                    (data >> DEPTH_SHIFT) & DEPTH_MASK,
+                    (data >> BOUND_SHIFT) & 3,
+                )
+        return None
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        bound: int,
+        score: int,
+        move: PackedMove = 0,
+    ) -> None:
+        """
+        Record a search result for `key`. A move of 0 keeps the best
+        move already stored for the same key.
+        """
+        entries = self.entries
+        generation = self.generation
+        base = (key % self.num_buckets) * BUCKET_WORDS
+        slot = base
+        worst = None
+        for i in range(base, base + BUCKET_WORDS, 2):
+            data = entries[i + 1]
+            # Slots fill front to back, so an empty one ends the bucket
+            if not data:
+                slot = i
+                break
+            if entries[i] ^ data == key:
+                slot = i
+                if not move:
+                    move = data & MOVE_MASK
+                break
+            age = (generation - (data >> AGE_SHIFT)) & AGE_MASK
+            value = ((data >> DEPTH_SHIFT) & DEPTH_MASK) - AGE_WEIGHT * age
+            if worst is None or value < worst:
+                worst = value
+                slot = i
+        data = (
+            move
+            | (score + SCORE_OFFSET) << SCORE_SHIFT
+            | depth << DEPTH_SHIFT
+            | bound << BOUND_SHIFT
+            | generation << AGE_SHIFT
+        )
+        entries[slot] = key ^ data
+        entries[slot + 1] = data
+        self.stores += 1
+
+    def hashfull(self) -> int:
+        """
+        Per-mille of sampled slots written by the current search, as
+        reported by UCI ``info hashfull``.
+        """
+        entries = self.entries
+        sample = min(HASHFULL_SAMPLE, len(self))
+        used = 0
+        for i in range(1, 2 * sample, 2):
+            data = entries[i]
+            if data and (data >> AGE_SHIFT) & AGE_MASK == self.generation:
+                used += 1
+        return used * 1000 // sample
@@ -1,18 +1,290 @@
 # engine/uci.py
 
-"""Minimal UCI interface backed by the bitboard engine."""
+"""Minimal UCI interface backed by the bitboard engine.
+
+Searches run on a SearchThread so the command loop keeps reading stdin:
+``isready`` is answered at once, ``stop`` makes the search return
+within one node check, and ``ponderhit`` starts the clock of a
+``go ponder`` search. ``setoption``, ``ucinewgame`` and ``go perft``
+stop a running search the way ``stop`` does instead of waiting for it.
+Every line goes out through ``_emit``, which serialises the two
+threads' output.
+
+GUIs resend the whole game with every ``position`` command. A
+GamePosition keeps the board of the previous one and, when the new
+command only extends it (or takes a few moves back), undoes and makes
+just the moves that differ instead of replaying the game from the
+start, so a command costs the same on move 80 as on move 1.
+
+With the ``Threads`` option above 1, a HelperPool (smp.py) runs that
+many minus one helper processes next to every search, all sharing the
+transposition table; the move played is that of the deepest iteration
+any of them completed.
+"""
 
 from __future__ import annotations
 
 import sys
-from typing import Optional
+import threading
+from typing import List, Optional, Tuple
 
 from engine.bitboard.board import Board
+from engine.bitboard.pawns import PawnTable
 from engine.bitboard.perft import perft_count
+from engine.bitboard.search import Searcher, format_score
+from engine.bitboard.smp import HelperPool, deeper_result
+from engine.bitboard.timeman import SearchLimits
+from engine.bitboard.transposition import DEFAULT_HASH_MB, TranspositionTable
+from engine.bitboard.utils import move_to_uci, uci_to_move
+
+# Depth searched by a bare "go"
+DEFAULT_DEPTH = 4
+# "go" arguments that take an integer value
+GO_INT_ARGS = frozenset(
+    (
+        "depth",
+        "nodes",
+        "movetime",
+        "wtime",
+        "btime",
+        "winc",
+        "binc",
+        "movestogo",
+    )
+)
+# Bounds of the "Hash" option, in megabytes
+MIN_HASH_MB = 1
+MAX_HASH_MB = 1024
+# Bounds of the "Threads" option: the main search plus helper processes
+MIN_THREADS = 1
+MAX_THREADS = 64
+
+
+_output_lock = threading.Lock()
+
+
+def _emit(line: str) -> None:
+    with _output_lock:
+        print(line, flush=True)
+
+
+def _parse_setoption(parts: List[str]) -> Tuple[str, str]:
+    """(name, value) from "setoption name <name> [value <value>]"."""
+    words = parts[1:]
+    if "value" in words:
+        split = words.index("value")
+        name, value = words[1:split], words[split + 1 :]
+    else:
+        name, value = words[1:], []
+    return " ".join(name), " ".join(value)
+
+
+def _parse_position(parts: List[str]) -> Tuple[str, List[str]]:
+    """
+    (base, moves) from "position startpos|fen <fen> [moves <m1> ...]",
+    where base is "startpos" or the FEN. Raises ValueError otherwise.
+    """
+    words = parts[1:]
+    if "moves" in words:
+        split = words.index("moves")
+        words, moves = words[:split], words[split + 1 :]
+    else:
+        moves = []
+    if words == ["startpos"]:
+        return "startpos", moves
+    if len(words) >= 2 and words[0] == "fen":
+        return " ".join(words[1:]), moves
+    raise ValueError(f"Invalid position command: {' '.join(parts)}")
+
+
+def _parse_go(parts: List[str]) -> SearchLimits:
+    """
+    SearchLimits from "go [depth N] [nodes N] [movetime MS] [wtime MS]
+    [btime MS] [winc MS] [binc MS] [movestogo N] [infinite]". Unknown
+    words are skipped; a "go" without any limit searches DEFAULT_DEPTH.
+    """
+    limits = SearchLimits()
+    words = iter(parts[1:])
+    for word in words:
+        if word in GO_INT_ARGS:
+            value = next(words, "")
+            if value.lstrip("-").isdigit():
+                setattr(limits, word, int(value))
+        elif word == "infinite":
+            limits.infinite = True
+        elif word == "ponder":
+            limits.ponder = True
+    if not limits.infinite and all(
+        getattr(limits, name) is None
+        for name in ("depth", "nodes", "movetime", "wtime", "btime")
+    ):
+        limits.depth = DEFAULT_DEPTH
+    return limits
+
+
+class GamePosition:
+    """
+    The board of the last ``position`` command, with the base and UCI
+    moves that produced it. The board's own zobrist_history carries the
+    whole game, so the search still sees repetitions of earlier moves.
+    """
+
+    base: Optional[str]
+    moves: List[str]
+    board: Board
+
+    def __init__(self) -> None:
+        self.base = "startpos"
+        self.moves = []
+        self.board = Board()
+
+    def set(self, base: str, moves: List[str]) -> Board:
+        """
+        Bring the board to `base` followed by `moves`, reusing the moves
+        already made when `base` is unchanged. A move that is malformed
+        or illegal raises ValueError; the board then stands after the
+        moves before it.
+        """
+        old = self.moves
+        if base != self.base:
+            keep = 0
+        elif moves[: len(old)] == old:
+            # The usual case: the game went on
+            keep = len(old)
+        else:
+            keep = 0
+            for prev, move in zip(old, moves):
+                if prev != move:
+                    break
+                keep += 1
+        if keep == 0 and (base != self.base or old):
+            self._reset(base)
+        else:
+            for _ in range(len(old) - keep):
+                self.board.undo_move_raw()
+            del old[keep:]
+        board = self.board
+        for move in moves[keep:]:
+            board.make_move_raw(uci_to_move(board, move))
+            self.moves.append(move)
+        return board
+
+    def _reset(self, base: str) -> None:
+        board = Board()
+        # Forget the base first: if the FEN is bad, nothing is reused
+        self.base = None
+        self.moves = []
+        if base != "startpos":
+            board.set_fen(base)
+        self.board = board
+        self.base = base
+
+
+class SearchThread:
+    """
+    Runs one search at a time on a daemon thread and prints its
+    ``bestmove``. Infinite and ponder searches hold their ``bestmove``
+    back until ``stop`` (or, pondering, ``ponderhit``), as UCI requires.
+    Given a HelperPool, the search runs with its helpers alongside.
+    """
+
+    _thread: Optional[threading.Thread]
+    _searcher: Optional[Searcher]
+    _release: threading.Event
+
+    def __init__(self) -> None:
+        self._thread = None
+        self._searcher = None
+        self._release = threading.Event()
+
+    def start(
+        self,
+        board: Board,
+        limits: SearchLimits,
+        tt: TranspositionTable,
+        pawns: PawnTable,
+        helpers: Optional[HelperPool] = None,
+    ) -> None:
+        """Search a copy of `board`, so the caller may change it."""
+        self.wait()
+        searcher = Searcher(board.copy(), on_info=_emit, tt=tt, pawns=pawns)
+        self._searcher = searcher
+        self._release = threading.Event()
+        if not (limits.infinite or limits.ponder):
+            self._release.set()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(searcher, limits, self._release, helpers),
+            daemon=True,
+        )
+        self._thread.start()
+
+    @staticmethod
+    def _run(
+        searcher: Searcher,
+        limits: SearchLimits,
+        release: threading.Event,
+        helpers: Optional[HelperPool],
+    ) -> None:
+        if helpers is None:
+            best, _ = searcher.search(limits=limits)
+        else:
+            helpers.start(searcher.board, limits)
+            best, _ = searcher.search(limits=limits)
+            results = helpers.stop()
+            deeper = deeper_result(searcher.depth, results)
+            if deeper is not None:
+                best = deeper.move
+                _emit(
+                    f"info depth {deeper.depth}"
+                    f" score {format_score(deeper.score)}"
+                    f" pv {move_to_uci(best)}"
+                )
+            nodes = searcher.nodes + sum(r.nodes for r in results)
+            _emit(f"info nodes {nodes}")
+        release.wait()
+        _emit(f"bestmove {move_to_uci(best) if best else '0000'}")
+
+    def stop(self) -> None:
+        """End the running search, if any, once it has sent bestmove."""
+        if self._thread is None:
+            return
+        assert self._searcher is not None
+        self._searcher.stop()
+        self._release.set()
+        self._thread.join()
+        self._thread = None
+        self._searcher = None
+
+    def wait(self) -> None:
+        """
+        Let a running search finish on its own; one holding its
+        bestmove for a stop that never comes is stopped instead.
+        """
+        if self._thread is None:
+            return
+        if not self._release.is_set():
+            self.stop()
+            return
+        self._thread.join()
+        self._thread = None
+        self._searcher = None
+
+    def ponderhit(self) -> None:
+        """Turn the running ponder search into a normal timed one."""
+        if self._searcher is not None:
+            self._searcher.ponderhit()
+            self._release.set()
 
 
 def main() -> None:
-    board: Optional[Board] = Board()
+    position = GamePosition()
+    hash_mb = DEFAULT_HASH_MB
+    threads = MIN_THREADS
+    tt = TranspositionTable(hash_mb)
+    helpers: Optional[HelperPool] = None
+    pawns = PawnTable()
+    worker = SearchThread()
     for raw in sys.stdin:
         cmd = raw.strip()
         if not cmd:
@@ -21,27 +293,70 @@ def main() -> None:
         token = parts[0]
 
         if token == "uci":
-            print("id name chess-bots")
-            print("id author Vaishak Menon")
-            print("uciok")
+            _emit("id name chess-bots")
+            _emit("id author Vaishak Menon")
+            _emit(
+                f"option name Hash type spin default {DEFAULT_HASH_MB}"
+                f" min {MIN_HASH_MB} max {MAX_HASH_MB}"
+            )
+            _emit(
+                f"option name Threads type spin default {MIN_THREADS}"
+                f" min {MIN_THREADS} max {MAX_THREADS}"
+            )
+            _emit("option name Ponder type check default false")
+            _emit("uciok")
         elif token == "isready":
-            print("readyok")
+            _emit("readyok")
+        elif token == "stop":
+            worker.stop()
+        elif token == "ponderhit":
+            worker.ponderhit()
+        elif token == "setoption":
+            name, value = _parse_setoption(parts)
+            if name.lower() in ("hash", "threads") and value.isdigit():
+                # Never sent mid-search; if it is, stop rather than block
+                worker.stop()
+                if name.lower() == "hash":
+                    hash_mb = min(max(int(value), MIN_HASH_MB), MAX_HASH_MB)
+                else:
+                    threads = min(max(int(value), MIN_THREADS), MAX_THREADS)
+                if helpers is not None:
+                    helpers.close()
+                    helpers = None
+                if threads > 1:
+                    helpers = HelperPool(threads - 1, hash_mb)
+                    tt = helpers.tt
+                else:
+                    tt = TranspositionTable(hash_mb)
+        elif token == "ucinewgame":
+            worker.stop()
+            tt.clear()
+            pawns.clear()
         elif token == "position":
-            if len(parts) >= 2 and parts[1] == "startpos":
-                board = Board()
-            elif len(parts) >= 8 and parts[1] == "fen":
-                fen = " ".join(parts[2:8])
-                board = Board()
-                board.set_fen(fen)
-        elif token == "go" and len(parts) == 3 and parts[1] == "depth":
-            if board is not None:
-                depth = int(parts[2])
-                nodes = perft_count(board, depth)
-                print(f"info nodes {nodes}")
-                print("bestmove 0000")
-        elif token in {"quit", "stop"}:
+            # A running search has its own copy of the board
+            try:
+                position.set(*_parse_position(parts))
+            except ValueError as exc:
+                _emit(f"info string {exc}")
+        elif token == "go" and len(parts) > 1 and parts[1] == "perft":
+            worker.stop()
+            # A negative depth never bottoms out
+            if len(parts) != 3 or not parts[2].isdigit():
+                _emit(f"info string Invalid perft command: {cmd}")
+                continue
+            nodes = perft_count(position.board, int(parts[2]))
+            _emit(f"info nodes {nodes}")
+        elif token == "go":
+            limits = _parse_go(parts)
+            worker.start(position.board, limits, tt, pawns, helpers)
+        elif token == "quit":
+            worker.stop()
             break
-        sys.stdout.flush()
+    else:
+        # End of input: let the last search report before exiting
+        worker.wait()
+    if helpers is not None:
+        helpers.close()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, Sequence, TYPE_CHECKING, overload
+
+from engine.bitboard.config import RawHistoryEntry  # noqa: TC001
 
 if TYPE_CHECKING:  # pragma: no cover - type hints only
+    from engine.bitboard.board import Board
     from engine.bitboard.move import Move
 
 
@@ -22,3 +25,41 @@ class Undo:
         self.cap_sq: Optional[int] = cap_sq
         self.prev_side: int = prev_side
         self.old_castling_rights: int = old_castling_rights
+
+
+class RawHistoryView(Sequence[RawHistoryEntry]):
+    """
+    List-like view of the live part of a board's undo stack
+    (``undo_stack[:ply]``), oldest move first. ``clear()`` empties
+    the stack itself.
+    """
+
+    def __init__(self, board: Board) -> None:
+        self._board = board
+
+    def _entries(self) -> List[RawHistoryEntry]:
+        board = self._board
+        return board.undo_stack[: board.ply]  # type: ignore[return-value]
+
+    def __len__(self) -> int:
+        return self._board.ply
+
+    @overload
+    def __getitem__(self, index: int) -> RawHistoryEntry: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[RawHistoryEntry]: ...
+
+    def __getitem__(self, index):
+        return self._entries()[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence):
+            return self._entries() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self._entries())
+
+    def clear(self) -> None:
+        self._board.ply = 0
@@ -1,12 +1,31 @@
 from __future__ import annotations
 from typing import List, Optional, TYPE_CHECKING
 from engine.bitboard.move import Move
+from engine.bitboard.constants import (
+    MOVE_SQ_MASK,
+    MOVE_DST_SHIFT,
+    MOVE_FLAG_CAPTURE,
+    MOVE_FLAG_EN_PASSANT,
+    MOVE_FLAG_CASTLING,
+    MOVE_PROMO_SHIFT,
+    MOVE_PROMO_MASK,
+    PROMO_PIECES,
+    PROMO_CODES,
+)
 
 if TYPE_CHECKING:
-    from engine.bitboard.config import RawMove
+    from engine.bitboard.board import Board
+    from engine.bitboard.config import AnyMove, PackedMove, RawMove
 
 # from engine.bitboard.config import RawMove
 
+# The bits of a packed move that its UCI string spells out
+_UCI_BITS = (
+    MOVE_SQ_MASK
+    | MOVE_SQ_MASK << MOVE_DST_SHIFT
+    | MOVE_PROMO_MASK << MOVE_PROMO_SHIFT
+)
+
 
 def algebraic_to_index(coord: str) -> int:
     """
@@ -56,6 +75,80 @@ def move_to_tuple(move: Move) -> RawMove:
     )
 
 
+def pack_move(raw: RawMove) -> PackedMove:
+    """
+    Encode a RawMove tuple as a single int (see MOVE_* in constants.py).
+    """
+    src, dst, capture, promotion, en_passant, castling = raw
+    packed = src | (dst << MOVE_DST_SHIFT)
+    if capture:
+        packed |= MOVE_FLAG_CAPTURE
+    if en_passant:
+        packed |= MOVE_FLAG_EN_PASSANT
+    if castling:
+        packed |= MOVE_FLAG_CASTLING
+    if promotion:
+        packed |= PROMO_CODES[promotion] << MOVE_PROMO_SHIFT
+    return packed
+
+
+def unpack_move(packed: PackedMove) -> RawMove:
+    """
+    Decode a packed int move back into its RawMove tuple.
+    """
+    return (
+        packed & MOVE_SQ_MASK,
+        (packed >> MOVE_DST_SHIFT) & MOVE_SQ_MASK,
+        bool(packed & MOVE_FLAG_CAPTURE),
+        PROMO_PIECES[(packed >> MOVE_PROMO_SHIFT) & MOVE_PROMO_MASK],
+        bool(packed & MOVE_FLAG_EN_PASSANT),
+        bool(packed & MOVE_FLAG_CASTLING),
+    )
+
+
+def to_raw_move(move: AnyMove) -> RawMove:
+    """
+    Return `move` as a RawMove tuple, decoding it first if it is packed.
+    """
+    if type(move) is int:
+        return unpack_move(move)
+    return move  # type: ignore[return-value]
+
+
+def move_to_uci(move: AnyMove) -> str:
+    """
+    Long-algebraic UCI string for `move`, e.g. "e2e4", "e7e8q".
+    """
+    src, dst, _, promotion, _, _ = to_raw_move(move)
+    promo = promotion.lower() if promotion else ""
+    return index_to_algebraic(src) + index_to_algebraic(dst) + promo
+
+
+def uci_to_move(board: Board, uci: str) -> RawMove:
+    """
+    Parse a UCI move string such as "e2e4" or "a7a8q" into the RawMove
+    it stands for on `board`. The move is looked up among the legal
+    moves, which also supply its capture, en-passant and castling
+    flags. Raises ValueError for malformed strings and for moves that
+    are not legal on `board`.
+    """
+    # Imported here: the generators import the board, which imports us
+    from engine.bitboard.generator import generate_legal_moves
+
+    if len(uci) not in (4, 5):
+        raise ValueError(f"Invalid UCI move: {uci}")
+    src = algebraic_to_index(uci[0:2])
+    dst = algebraic_to_index(uci[2:4])
+    promotion = uci[4].upper() if len(uci) == 5 else None
+    if promotion is not None and promotion not in PROMO_CODES:
+        raise ValueError(f"Invalid UCI promotion: {uci}")
+    wanted = pack_move((src, dst, False, promotion, False, False))
+    for move in generate_legal_moves(board, True):
+        if move & _UCI_BITS == wanted:
+            return unpack_move(move)
+    raise ValueError(f"Illegal move: {uci}")
+
+
 def expand_occupancy(subset_index: int, relevant_mask: int) -> int:
     """
     Given a relevant_mask (bitboard) of N squares,
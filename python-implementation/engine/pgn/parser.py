@@ -3,24 +3,28 @@ from typing import List, Dict
 from collections import Counter
 from engine.pgn.game import PGNGame  # noqa: TC002
 from engine.bitboard.board import Board  # noqa: TC002
-from engine.bitboard.config import RawMove  # noqa: TC002
+from engine.bitboard.config import AnyMove, RawMove  # noqa: TC002
 from engine.bitboard.status import is_checkmate
 from engine.bitboard.generator import generate_legal_moves
 from engine.pgn.tokenizer import tokenize_movetext, TokenType
 from engine.pgn.headers import parse_pgn_headers, find_pgn_header_end
-from engine.bitboard.utils import algebraic_to_index, index_to_algebraic
+from engine.bitboard.utils import (
+    algebraic_to_index,
+    index_to_algebraic,
+    to_raw_move,
+)
 
 
 class SanParsingError(Exception):
     pass
 
 
-def find_ambiguities(board: Board, move: RawMove) -> List[int]:
+def find_ambiguities(board: Board, move: AnyMove) -> List[int]:
     """
     Return a list of src-indices for every legal move of the same piece type
     that lands on move.dst (including move.src itself).
     """
-    src, dst, _, _, _, _ = move
+    src, dst, _, _, _, _ = to_raw_move(move)
     piece_char = board.get_piece_char(src)
     piece_letter = piece_char.upper() if piece_char else ""
     ambiguous_srcs: List[int] = []
@@ -63,14 +67,15 @@ def choose_disambiguator(all_srcs: List[int], src: int) -> str:
     return index_to_algebraic(src)
 
 
-def rawmove_to_san(board: Board, move: RawMove, *, check: bool = True) -> str:
+def rawmove_to_san(board: Board, move: AnyMove, *, check: bool = True) -> str:
     """
-    Given a Board in its current position and a RawMove tuple,
-    return the Standard Algebraic Notation string for that move.
+    Given a Board in its current position and a RawMove tuple
+    (or packed int move), return the Standard Algebraic Notation
+    string for that move.
 
     If `check=True`, append '+' or '#' when the move gives check or mate.
     """
-    src, dst, is_capture, promotion, _, is_castle = move
+    src, dst, is_capture, promotion, _, is_castle = to_raw_move(move)
 
     # Handle castling immediately
     if is_castle:
@@ -0,0 +1,65 @@
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.constants import WHITE, BLACK
+from engine.bitboard.generator import generate_legal_moves
+from tests.utils import board_from
+
+FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+]
+
+
+def square_by_square(b: Board, side: int) -> int:
+    return sum(
+        1 << sq for sq in range(64) if b.is_square_attacked(sq, side)
+    )
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_attack_map_matches_square_tests(fen):
+    b = board_from(fen)
+    for move in generate_legal_moves(b):
+        b.make_move_raw(move)
+        for side in (WHITE, BLACK):
+            assert b.attacks_by(side) == square_by_square(b, side)
+        b.undo_move_raw()
+
+
+def test_attack_map_is_cached_and_invalidated():
+    b = Board()
+    assert b.attack_maps == [None, None]
+    first = b.attacks_by(WHITE)
+    assert b.attack_maps[WHITE] == first
+    assert b.attack_maps[BLACK] is None
+
+    b.make_move_raw((12, 28, False, None, False, False))  # e2e4
+    assert b.attack_maps == [None, None]
+    assert b.attacks_by(WHITE) != first
+
+    b.undo_move_raw()
+    assert b.attack_maps == [None, None]
+    assert b.attacks_by(WHITE) == first
+
+    b.set_fen(FENS[1])
+    assert b.attack_maps == [None, None]
+
+
+@pytest.mark.parametrize(
+    "fen,side,expected",
+    [
+        ("4k3/8/8/8/8/8/8/r3K3 w - - 0 1", WHITE, True),
+        ("4k3/8/8/8/8/8/8/1r2K3 w - - 0 1", WHITE, True),
+        ("4k3/8/8/8/8/8/3P4/2b1K3 w - - 0 1", WHITE, False),
+        ("4k3/5N2/8/8/8/8/8/4K3 b - - 0 1", BLACK, False),
+        ("4k3/8/5N2/8/8/8/8/4K3 b - - 0 1", BLACK, True),
+    ],
+)
+def test_in_check_with_and_without_cached_map(fen, side, expected):
+    b = board_from(fen)
+    assert b.in_check(side) is expected
+    b.attacks_by(1 - side)
+    assert b.in_check(side) is expected
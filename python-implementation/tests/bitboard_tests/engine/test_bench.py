@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+from engine.bitboard.bench import (
+    BENCH_POSITIONS,
+    BENCH_VERSION,
+    QUICK_POSITIONS as QUICK,
+    bench,
+    main,
+    run_generators,
+    run_perft,
+    run_search_stats,
+)
+from engine.bitboard.board import Board
+from engine.bitboard.constants import BLACK_KING, WHITE_KING
+from engine.bitboard.generator import (
+    LEGAL_MOVE_GENERATORS,
+    generate_legal_moves,
+)
+
+# A few positions of each kind keep the runs short
+SAMPLE = BENCH_POSITIONS[::8]
+
+
+@pytest.mark.parametrize("category,fen", BENCH_POSITIONS)
+def test_bench_positions_are_playable(category, fen):
+    board = Board()
+    board.set_fen(fen)
+    assert board.bitboards[WHITE_KING].bit_count() == 1
+    assert board.bitboards[BLACK_KING].bit_count() == 1
+    assert not board.in_check(board.side_to_move ^ 1)
+    assert generate_legal_moves(board)
+
+
+def test_bench_positions_cover_every_category():
+    assert len(BENCH_POSITIONS) == 40
+    assert len({fen for _, fen in BENCH_POSITIONS}) == 40
+    assert {category for category, _ in BENCH_POSITIONS} == {
+        "middlegame",
+        "endgame",
+        "promotion",
+        "castling",
+    }
+
+
+def test_run_perft_counts():
+    positions = [
+        ("castling", BENCH_POSITIONS[35][1]),
+        ("middlegame", BENCH_POSITIONS[0][1]),
+    ]
+    assert [row.nodes for row in run_perft(2, positions)] == [400, 2039]
+
+
+def test_bench_signature_is_deterministic():
+    first = bench(2, 2, positions=SAMPLE)
+    second = bench(2, 2, positions=SAMPLE)
+    assert first["signature"] == second["signature"]
+    perft = first["perft"]["summary"]["total"]["nodes"]
+    search = first["search"]["summary"]["total"]["nodes"]
+    assert first["signature"] == perft + search
+    assert first["version"] == BENCH_VERSION
+    assert len(first["search"]["positions"]) == len(SAMPLE)
+    json.dumps(first)
+
+
+def test_bench_parts_can_be_skipped_and_capped():
+    full = bench(0, 3, positions=SAMPLE)
+    capped = bench(0, 3, search_nodes=300, positions=SAMPLE)
+    assert "perft" not in capped
+    # A capped search still finds a move
+    pairs = zip(full["search"]["positions"], capped["search"]["positions"])
+    for uncapped, row in pairs:
+        assert row["nodes"] <= uncapped["nodes"]
+        assert row["best"] != "0000"
+    assert capped["signature"] < full["signature"]
+
+
+def test_main_writes_json(tmp_path, capsys):
+    out = tmp_path / "bench.json"
+    main(
+        [
+            "--perft-depth",
+            "1",
+            "--search-depth",
+            "1",
+            "--json",
+            "--output",
+            str(out),
+        ]
+    )
+    printed = json.loads(capsys.readouterr().out)
+    assert json.loads(out.read_text()) == printed
+    assert printed["positions"] == 40
+
+
+def test_generators_mode_agrees_on_nodes():
+    results = run_generators(2, 1, copy_make=True, positions=QUICK[:2])
+    assert set(results) == {
+        name + suffix
+        for name in LEGAL_MOVE_GENERATORS
+        for suffix in ("", "/copy")
+    }
+    assert {row["nodes"] for row in results.values()} == {400 + 2039}
+
+
+def test_search_mode_reports_a_total():
+    results = run_search_stats(2, 1, positions=QUICK[:2])
+    assert list(results) == ["start", "kiwipete", "total"]
+    total = results["total"]
+    assert total["nodes"] == sum(
+        results[name]["nodes"] for name in ("start", "kiwipete")
+    )
+    assert 0 <= total["pawn_hit_rate"] <= 1
+
+
+@pytest.mark.parametrize(
+    "mode,args",
+    [("generators", ["--depth", "1"]), ("smp", ["--threads", "1"])],
+)
+def test_main_modes(mode, args, capsys):
+    main(["--mode", mode, "--repeat", "1", "--json", *args])
+    printed = json.loads(capsys.readouterr().out)
+    assert all(row["nodes"] > 0 for row in printed.values())
@@ -0,0 +1,99 @@
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.generator import generate_legal_moves
+from engine.bitboard.perft import perft_copy_make, perft_count
+from tests.utils import board_from
+
+KIWIPETE = (
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+)
+
+
+def state(b: Board):
+    return (
+        list(b.bitboards),
+        b.white_occ,
+        b.black_occ,
+        b.all_occ,
+        b.ep_square,
+        b.side_to_move,
+        b.castling_rights,
+        b.halfmove_clock,
+        b.fullmove_number,
+        b.zobrist_key,
+        list(b.zobrist_history),
+        list(b.square_to_piece),
+    )
+
+
+def test_board_has_slots():
+    b = Board()
+    assert not hasattr(b, "__dict__")
+    with pytest.raises(AttributeError):
+        b.not_a_field = 1
+
+
+def test_copy_is_independent():
+    b = board_from(KIWIPETE)
+    b.make_move_raw(generate_legal_moves(b)[0])
+    c = b.copy()
+    assert state(c) == state(b)
+    assert c.raw_history == b.raw_history
+
+    for _ in range(5):
+        c.make_move_raw(generate_legal_moves(c)[0])
+    assert state(c) != state(b)
+
+    # The copy can undo back past the point it was taken
+    for _ in range(6):
+        c.undo_move_raw()
+    b.undo_move_raw()
+    assert state(c) == state(b)
+
+
+
+@pytest.mark.parametrize("plies", [0, 1, 3])
+def test_copy_takes_only_the_moves_made(plies):
+    b = board_from(KIWIPETE)
+    for _ in range(plies):
+        b.make_move_raw(generate_legal_moves(b)[0])
+    c = b.copy()
+    assert len(c.undo_stack) == plies
+    # The stack regrows as the copy goes on
+    for _ in range(4):
+        c.make_move_raw(generate_legal_moves(c)[0])
+    for _ in range(4 + plies):
+        c.undo_move_raw()
+    assert c.get_fen() == KIWIPETE
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        KIWIPETE,
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        "rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3",
+    ],
+)
+def test_make_move_copy_matches_make_move_raw(fen):
+    parent = board_from(fen)
+    before = state(parent)
+    for move in generate_legal_moves(parent):
+        child = parent.make_move_copy(move)
+        assert state(parent) == before
+
+        parent.make_move_raw(move)
+        assert state(child) == state(parent)
+        parent.undo_move_raw()
+
+        # The child can undo its one move
+        child.undo_move_raw()
+        assert state(child) == before
+
+
+@pytest.mark.parametrize("depth,expected", [(1, 48), (2, 2039), (3, 97862)])
+def test_perft_copy_make(depth, expected):
+    b = board_from(KIWIPETE)
+    before = state(b)
+    assert perft_copy_make(b, depth) == expected == perft_count(b, depth)
+    assert state(b) == before
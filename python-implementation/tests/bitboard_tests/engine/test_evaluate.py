@@ -0,0 +1,100 @@
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.evaluate import (
+    evaluate,
+    evaluate_from_scratch,
+    tapered,
+)
+from engine.bitboard.generator import generate_legal_moves
+from engine.bitboard.psqt import PHASE_MAX, psq_from_scratch
+from tests.utils import board_from
+
+FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3",
+    "4k3/1P6/8/8/8/8/6p1/4K2R b K - 0 1",
+]
+
+
+def mirror_fen(fen: str) -> str:
+    """Swap colours: flip the ranks, swap case and the side to move."""
+    placement, side, castle, ep, half, full = fen.split()
+    placement = "/".join(reversed(placement.split("/"))).swapcase()
+    side = "b" if side == "w" else "w"
+    castle = "".join(sorted(castle.swapcase())) if castle != "-" else "-"
+    if ep != "-":
+        ep = ep[0] + ("6" if ep[1] == "3" else "3")
+    return " ".join((placement, side, castle, ep, half, full))
+
+
+def state(board: Board):
+    return board.psq_mg, board.psq_eg, board.phase
+
+
+def test_start_position_is_balanced_midgame():
+    board = Board()
+    assert board.psq_mg == board.psq_eg == 0
+    assert board.phase == PHASE_MAX
+    assert evaluate(board) == 0
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_incremental_matches_full_recompute(fen):
+    board = board_from(fen)
+
+    def walk(depth):
+        assert state(board) == psq_from_scratch(board.bitboards)
+        assert evaluate(board) == evaluate_from_scratch(board)
+        if depth == 0:
+            return
+        for move in generate_legal_moves(board, True):
+            before = state(board)
+            board.make_move_raw(move)
+            walk(depth - 1)
+            board.undo_move_raw()
+            assert state(board) == before
+
+    walk(2)
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_colour_mirror_negates_score(fen):
+    board = board_from(fen)
+    mirrored = board_from(mirror_fen(fen))
+    assert mirrored.psq_mg == -board.psq_mg
+    assert mirrored.psq_eg == -board.psq_eg
+    assert mirrored.phase == board.phase
+    # Both sides to move see the same score in their own colours
+    assert evaluate(mirrored) == evaluate(board)
+
+
+def test_copies_carry_the_evaluation():
+    board = board_from(FENS[1])
+    move = generate_legal_moves(board, True)[0]
+    child = board.make_move_copy(move)
+    board.make_move_raw(move)
+    assert state(child) == state(board)
+    snapshot = board.copy()
+    board.undo_move_raw()
+    snapshot.undo_move_raw()
+    assert state(snapshot) == state(board)
+
+
+def test_tapered_blends_by_phase():
+    assert tapered(100, -50, PHASE_MAX) == 100
+    assert tapered(100, -50, 0) == -50
+    assert tapered(100, -50, PHASE_MAX // 2) == 25
+    # A phase beyond the start (early promotions) counts as midgame
+    assert tapered(100, -50, PHASE_MAX + 4) == 100
+
+
+def test_endgame_tables_drive_the_king_forward():
+    # Pawns and kings only: a centralised king beats a cornered one
+    board = board_from("8/8/8/3K4/8/8/8/k7 w - - 0 1")
+    assert board.phase == 0
+    assert evaluate(board) > 0
@@ -0,0 +1,122 @@
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.generator import (
+    count_legal_moves,
+    generate_legal_moves,
+    generate_legal_moves_direct,
+)
+from engine.bitboard.utils import pack_move
+from tests.utils import board_from
+
+FENS = [
+    # start position
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    # Kiwipete: pins, castling, promotions
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    # rank pins and en-passant discovered checks
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    # promotions with captures, black castling only
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+]
+
+
+def assert_same_moves(b: Board, depth: int) -> None:
+    expected = generate_legal_moves(b)
+    direct = generate_legal_moves_direct(b)
+    assert len(direct) == len(set(direct)), b.get_fen()
+    assert set(direct) == set(expected), b.get_fen()
+    if depth == 0:
+        return
+    for move in expected:
+        b.make_move_raw(move)
+        assert_same_moves(b, depth - 1)
+        b.undo_move_raw()
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_direct_generator_matches_filter(fen):
+    assert_same_moves(board_from(fen), 2)
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_direct_generator_packed(fen):
+    b = board_from(fen)
+    packed = generate_legal_moves_direct(b, packed=True)
+    assert set(packed) == {pack_move(m) for m in generate_legal_moves(b)}
+
+
+def test_en_passant_rank_pin_is_illegal():
+    # Capturing e.p. would remove both pawns from the king's rank
+    b = board_from("8/8/8/KPp4r/8/8/8/4k3 w - c6 0 1")
+    moves = generate_legal_moves_direct(b)
+    assert not any(m[4] for m in moves)
+    assert set(moves) == set(generate_legal_moves(b))
+
+
+def test_en_passant_captures_checking_pawn():
+    # The double-pushed pawn gives check; taking it e.p. is legal
+    b = board_from("8/8/8/2k5/3Pp3/8/8/4K3 b - d3 0 1")
+    moves = generate_legal_moves_direct(b)
+    assert (28, 19, True, None, True, False) in moves
+    assert set(moves) == set(generate_legal_moves(b))
+
+
+def test_both_pawns_can_capture_en_passant():
+    b = board_from("4k3/8/8/3PpP2/8/8/8/4K3 w - e6 0 1")
+    ep_moves = {m for m in generate_legal_moves_direct(b) if m[4]}
+    assert ep_moves == {
+        (35, 44, True, None, True, False),
+        (37, 44, True, None, True, False),
+    }
+    assert {m for m in generate_legal_moves(b) if m[4]} == ep_moves
+
+
+def test_double_check_allows_only_king_moves():
+    # Rook a1 and bishop b4 both check; the knight cannot help
+    b = board_from("4k3/8/8/8/1b6/8/8/r3K2N w - - 0 1")
+    moves = generate_legal_moves_direct(b)
+    assert moves
+    assert all(m[0] == 4 for m in moves)
+    assert set(moves) == set(generate_legal_moves(b))
+
+
+def test_no_castling_through_attacked_square():
+    b = board_from("4kr2/8/8/8/8/8/8/R3K2R w KQ - 0 1")
+    moves = generate_legal_moves_direct(b)
+    castles = {m[1] for m in moves if m[5]}
+    assert castles == {2}
+    assert set(moves) == set(generate_legal_moves(b))
+
+
+def assert_counts_match(b: Board, depth: int) -> None:
+    moves = generate_legal_moves_direct(b)
+    assert count_legal_moves(b) == len(moves), b.get_fen()
+    if depth == 0:
+        return
+    for move in moves:
+        b.make_move_raw(move)
+        assert_counts_match(b, depth - 1)
+        b.undo_move_raw()
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_count_legal_moves_matches_generator(fen):
+    assert_counts_match(board_from(fen), 2)
+
+
+@pytest.mark.parametrize(
+    "fen,expected",
+    [
+        # double check: king moves only
+        ("4k3/8/8/8/8/5n2/8/r3K3 w - - 0 1", 2),
+        # checkmate
+        ("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3", 0),
+        # black promotions, with captures
+        ("4k3/8/8/8/8/8/1p6/R3K3 b - - 0 1", 13),
+    ],
+)
+def test_count_legal_moves_special_cases(fen, expected):
+    b = board_from(fen)
+    assert count_legal_moves(b) == expected
+    assert len(generate_legal_moves(b)) == expected
@@ -18,6 +18,17 @@ from engine.bitboard.build_magics import (
     compute_rook_attacks_with_blockers,
     compute_bishop_attacks_with_blockers,
 )
+from engine.bitboard.magic_blob import (
+    BLOB_PATH,
+    flatten_tables,
+    layout_from_modules,
+    load_blob,
+    load_magic_tables,
+    write_blob,
+)
+from engine.bitboard.moves.rook import rook_attacks
+from engine.bitboard.moves.bishop import bishop_attacks
+from engine.bitboard.moves.queen import queen_attacks
 
 MASK64 = 0xFFFF_FFFF_FFFF_FFFF
 
@@ -95,6 +106,85 @@ def test_bishop_magic_subset(sq):
         assert table[idx] == ref
 
 
+def test_binary_blob_matches_python_tables():
+    blob = load_blob(BLOB_PATH)
+    assert blob is not None, "run build_magics.py --binary"
+    rook, bishop, attacks = layout_from_modules()
+    assert blob[0] == rook
+    assert blob[1] == bishop
+    assert list(blob[2]) == attacks
+    assert load_magic_tables()[3] == "binary"
+
+
+@pytest.mark.parametrize("sq", [0, 7, 27, 36, 56, 63])
+def test_flat_layout_matches_per_square_tables(sq):
+    rook, bishop, attacks = layout_from_modules()
+    for entries, tables in (
+        (rook, ROOK_ATTACK_TABLE),
+        (bishop, BISHOP_ATTACK_TABLE),
+    ):
+        offset = entries[sq][3]
+        table = tables[sq]
+        assert list(attacks[offset : offset + len(table)]) == table
+
+
+@pytest.mark.parametrize("sq", [0, 9, 27, 45, 63])
+def test_slider_attacks_use_flat_layout(sq):
+    for subset in range(0, 1 << bit_count(RELEVANT_ROOK_MASKS[sq]), 97):
+        occ = expand_occupancy(subset, RELEVANT_ROOK_MASKS[sq])
+        assert rook_attacks(sq, occ) == compute_rook_attacks_with_blockers(
+            sq, occ
+        )
+    for subset in range(1 << bit_count(RELEVANT_BISHOP_MASKS[sq])):
+        occ = expand_occupancy(subset, RELEVANT_BISHOP_MASKS[sq])
+        assert bishop_attacks(
+            sq, occ
+        ) == compute_bishop_attacks_with_blockers(sq, occ)
+        assert queen_attacks(sq, occ) == rook_attacks(
+            sq, occ
+        ) | bishop_attacks(sq, occ)
+
+
+def test_blob_round_trip(tmp_path):
+    rook_tables = [[sq, sq + 1] for sq in range(64)]
+    bishop_tables = [[sq] * (sq % 3 + 1) for sq in range(64)]
+    layout = flatten_tables(
+        RELEVANT_ROOK_MASKS,
+        ROOK_MAGICS,
+        ROOK_SHIFTS,
+        rook_tables,
+        RELEVANT_BISHOP_MASKS,
+        BISHOP_MAGICS,
+        BISHOP_SHIFTS,
+        bishop_tables,
+    )
+    path = tmp_path / "magic.bin"
+    write_blob(path, layout)
+
+    rook, bishop, attacks = load_blob(path)
+    assert rook == layout[0]
+    assert bishop == layout[1]
+    assert list(attacks) == layout[2]
+    assert rook[1][3] == 2
+    assert bishop[0][3] == 128
+
+    path.write_bytes(b"not a magic blob")
+    assert load_blob(path) is None
+    assert load_blob(tmp_path / "missing.bin") is None
+
+
+def test_rewriting_a_blob_leaves_live_mappings_intact(tmp_path):
+    rook, bishop, attacks = layout_from_modules()
+    path = tmp_path / "magic.bin"
+    write_blob(path, (rook, bishop, attacks))
+    live = load_blob(path)
+    write_blob(path, (rook, bishop, [0] * len(attacks)))
+    # The old mapping still reads the old tables, the file the new ones
+    assert list(live[2]) == attacks
+    assert not any(load_blob(path)[2])
+    assert [p.name for p in tmp_path.iterdir()] == ["magic.bin"]
+
+
 def main():
     verify("rook")
     verify("bishop")
@@ -0,0 +1,133 @@
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.generator import generate_moves
+from engine.bitboard.movepick import (
+    STAGE_BAD_CAPTURE,
+    STAGE_CAPTURE,
+    STAGE_DONE,
+    STAGE_TT,
+    MovePicker,
+    history_index,
+    is_pseudo_legal,
+    is_tactical,
+    mvv_lva,
+)
+from engine.bitboard.see import is_losing
+from engine.bitboard.utils import move_to_uci
+from tests.utils import board_from
+
+FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3",
+]
+
+KIWIPETE = FENS[1]
+
+
+def find(board: Board, uci: str) -> int:
+    return next(
+        m for m in generate_moves(board, True) if move_to_uci(m) == uci
+    )
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_picker_yields_every_pseudo_legal_move_once(fen):
+    board = board_from(fen)
+    expected = sorted(generate_moves(board, True))
+    assert sorted(MovePicker(board, 0, [0, 0], [0] * 8192)) == expected
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_stage_order(fen):
+    board = board_from(fen)
+    moves = generate_moves(board, True)
+    quiets = [m for m in moves if not is_tactical(m)]
+    tt_move = quiets[-1]
+    killer = quiets[0]
+    history = [0] * 8192
+    # A history bonus pulls a quiet move ahead of the other quiets
+    favourite = quiets[len(quiets) // 2]
+    history[history_index(board.side_to_move, favourite)] = 100
+
+    order = list(MovePicker(board, tt_move, [killer, 0], history))
+    captures = [m for m in order if is_tactical(m)]
+    good = [m for m in captures if not is_losing(board, m)]
+    bad = [m for m in captures if is_losing(board, m)]
+    assert order[0] == tt_move
+    assert order[1 : 1 + len(good)] == good
+    for group in (good, bad):
+        scores = [mvv_lva(board, m) for m in group]
+        assert scores == sorted(scores, reverse=True)
+    if killer != tt_move:
+        assert order[1 + len(good)] == killer
+    rest = order[2 + len(good) : len(order) - len(bad)]
+    if favourite not in (tt_move, killer):
+        assert rest[0] == favourite
+    # Captures that lose material come after every quiet move
+    assert order[len(order) - len(bad) :] == bad
+
+
+def test_mvv_lva_prefers_big_victim_small_attacker():
+    board = board_from(KIWIPETE)
+    pxp = find(board, "g2h3")
+    nxp = find(board, "e5f7")
+    bxb = find(board, "e2a6")
+    qxn = find(board, "f3f6")
+    assert mvv_lva(board, bxb) > mvv_lva(board, qxn)
+    assert mvv_lva(board, pxp) > mvv_lva(board, nxp)
+
+
+def test_tt_move_is_yielded_before_any_generation():
+    board = board_from(KIWIPETE)
+    tt_move = find(board, "e2a6")
+    picker = MovePicker(board, tt_move, [0, 0], [0] * 8192)
+    it = iter(picker)
+    assert next(it) == tt_move
+    assert picker.stage == STAGE_TT
+    assert picker.generated == 0
+    next(it)
+    assert picker.stage == STAGE_CAPTURE
+    assert picker.generated > 0
+    list(it)
+    assert picker.stage == STAGE_DONE
+
+
+def test_losing_captures_are_deferred():
+    # Qxd5 loses the queen to the e6 pawn; the quiet moves go first
+    board = board_from("4k3/8/4p3/3p4/8/8/8/3QK3 w - - 0 1")
+    qxd5 = find(board, "d1d5")
+    picker = MovePicker(board, 0, [0, 0], [0] * 8192)
+    order = []
+    for move in picker:
+        order.append(move)
+        if move == qxd5:
+            assert picker.stage == STAGE_BAD_CAPTURE
+    assert order[-1] == qxd5
+    assert sorted(order) == sorted(generate_moves(board, True))
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_is_pseudo_legal(fen):
+    board = board_from(fen)
+    moves = set(generate_moves(board, True))
+    for move in moves:
+        assert is_pseudo_legal(board, move)
+    # Moves of every other test position that are not moves here
+    for other in FENS:
+        for move in generate_moves(board_from(other), True):
+            if move not in moves:
+                assert not is_pseudo_legal(board, move)
+
+
+def test_invalid_tt_move_and_killers_are_skipped():
+    board = board_from(KIWIPETE)
+    # e2e4 is a start-position move; e2 holds a bishop here
+    bogus = find(board_from(FENS[0]), "e2e4")
+    order = list(MovePicker(board, bogus, [bogus, 0], [0] * 8192))
+    assert bogus not in order
+    assert sorted(order) == sorted(generate_moves(board, True))
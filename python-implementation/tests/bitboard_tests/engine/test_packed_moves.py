@@ -0,0 +1,99 @@
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.generator import generate_moves, generate_legal_moves
+from engine.bitboard.perft import perft_count, perft_divide
+from engine.bitboard.utils import pack_move, unpack_move, to_raw_move
+from engine.pgn.parser import rawmove_to_san
+from tests.utils import board_from
+
+FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1",
+    "rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3",
+    "1r5k/P7/8/8/8/8/6p1/K6R b - - 0 1",
+]
+
+
+def state(b: Board):
+    return (
+        list(b.bitboards),
+        b.white_occ,
+        b.black_occ,
+        b.all_occ,
+        b.ep_square,
+        b.side_to_move,
+        b.castling_rights,
+        b.halfmove_clock,
+        b.fullmove_number,
+        b.zobrist_key,
+        list(b.square_to_piece),
+    )
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        (12, 28, False, None, False, False),
+        (54, 63, True, "Q", False, False),
+        (48, 56, False, "N", False, False),
+        (35, 44, True, None, True, False),
+        (4, 6, False, None, False, True),
+        (60, 58, False, None, False, True),
+    ],
+)
+def test_pack_unpack_round_trip(raw):
+    packed = pack_move(raw)
+    assert isinstance(packed, int)
+    assert packed < (1 << 18)
+    assert unpack_move(packed) == raw
+
+
+def test_to_raw_move_accepts_both_forms():
+    raw = (6, 21, False, None, False, False)
+    assert to_raw_move(raw) is raw
+    assert to_raw_move(pack_move(raw)) == raw
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_packed_generation_matches_tuples(fen):
+    b = board_from(fen)
+    tuples = generate_moves(b)
+    packed = generate_moves(b, packed=True)
+    assert packed == [pack_move(m) for m in tuples]
+
+    legal = generate_legal_moves(b)
+    legal_packed = generate_legal_moves(b, packed=True)
+    assert legal_packed == [pack_move(m) for m in legal]
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_make_undo_packed_matches_tuple(fen):
+    b1 = board_from(fen)
+    b2 = board_from(fen)
+    before = state(b1)
+    for move in generate_legal_moves(b1):
+        b1.make_move_raw(move)
+        b2.make_move_raw(pack_move(move))
+        assert state(b1) == state(b2)
+        assert b1.raw_history[-1] == b2.raw_history[-1]
+        b1.undo_move_raw()
+        b2.undo_move_raw()
+        assert state(b2) == before
+
+
+@pytest.mark.parametrize("depth,expected", [(1, 20), (2, 400), (3, 8902)])
+def test_packed_perft_start_position(depth, expected):
+    assert perft_count(Board(), depth, packed=True) == expected
+
+
+def test_packed_perft_divide_keys_are_ints():
+    divide = perft_divide(Board(), 2, packed=True)
+    assert all(isinstance(m, int) for m in divide)
+    assert sum(divide.values()) == 400
+
+
+def test_san_accepts_packed_moves():
+    b = Board()
+    for move in generate_legal_moves(b):
+        assert rawmove_to_san(b, pack_move(move)) == rawmove_to_san(b, move)
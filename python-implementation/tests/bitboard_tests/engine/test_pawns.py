@@ -0,0 +1,144 @@
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.constants import (
+    BLACK_KING,
+    BLACK_PAWN,
+    WHITE_KING,
+    WHITE_PAWN,
+    ZOBRIST_PIECE_KEYS,
+)
+from engine.bitboard.evaluate import evaluate
+from engine.bitboard.generator import generate_legal_moves
+from engine.bitboard.pawns import (
+    DOUBLED_PENALTY,
+    ISOLATED_PENALTY,
+    PASSED_BONUS_EG,
+    PASSED_BONUS_MG,
+    PawnTable,
+    pawn_structure,
+)
+from engine.bitboard.search import Searcher
+from engine.bitboard.utils import move_to_uci
+from tests.utils import board_from
+
+FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3",
+    "4k3/1P6/8/8/8/8/6p1/4K2R b K - 0 1",
+]
+
+
+def expected_pawn_key(board: Board) -> int:
+    key = 0
+    for piece in (WHITE_PAWN, WHITE_KING, BLACK_PAWN, BLACK_KING):
+        for sq in range(64):
+            if board.bitboards[piece] >> sq & 1:
+                key ^= ZOBRIST_PIECE_KEYS[piece][sq]
+    return key
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_pawn_key_is_maintained_by_make_and_undo(fen):
+    board = board_from(fen)
+
+    def walk(depth):
+        assert board.pawn_key == expected_pawn_key(board)
+        if depth == 0:
+            return
+        for move in generate_legal_moves(board, True):
+            before = board.pawn_key
+            board.make_move_raw(move)
+            walk(depth - 1)
+            board.undo_move_raw()
+            assert board.pawn_key == before
+
+    walk(2)
+
+
+def test_pawn_key_ignores_other_pieces():
+    board = Board()
+    start = board.pawn_key
+    for uci in ("g1f3", "b8c6"):
+        move = next(
+            m
+            for m in generate_legal_moves(board, True)
+            if move_to_uci(m) == uci
+        )
+        board.make_move_raw(move)
+    assert board.pawn_key == start
+    assert board.zobrist_key != board.zobrist_history[0]
+
+
+@pytest.mark.parametrize(
+    "fen,mg,eg",
+    [
+        # Symmetric structures cancel out
+        ("4k3/pppppppp/8/8/8/8/PPPPPPPP/4K3 w - - 0 1", 0, 0),
+        # Doubled, isolated, passed a-pawns
+        (
+            "4k3/8/8/8/8/P7/P7/4K3 w - - 0 1",
+            DOUBLED_PENALTY[0]
+            + 2 * ISOLATED_PENALTY[0]
+            + PASSED_BONUS_MG[1]
+            + PASSED_BONUS_MG[2],
+            DOUBLED_PENALTY[1]
+            + 2 * ISOLATED_PENALTY[1]
+            + PASSED_BONUS_EG[1]
+            + PASSED_BONUS_EG[2],
+        ),
+        # A black passer, isolated, six ranks up from its own side
+        (
+            "4k3/8/8/8/8/7p/8/4K3 w - - 0 1",
+            -PASSED_BONUS_MG[5] - ISOLATED_PENALTY[0],
+            -PASSED_BONUS_EG[5] - ISOLATED_PENALTY[1],
+        ),
+        # A pawn on a neighbouring file ahead stops both passing
+        ("4k3/8/8/8/8/7p/6P1/4K3 w - - 0 1", 0, 0),
+    ],
+)
+def test_pawn_structure_terms(fen, mg, eg):
+    assert pawn_structure(board_from(fen)) == (mg, eg)
+
+
+def test_table_counts_hits_and_matches_direct_evaluation():
+    table = PawnTable(entries=64)
+    board = board_from(FENS[1])
+    assert table.probe(board) == pawn_structure(board)
+    assert (table.probes, table.hits) == (1, 0)
+    assert table.probe(board) == pawn_structure(board)
+    assert (table.probes, table.hits) == (2, 1)
+    assert table.hit_rate() == 0.5
+    assert evaluate(board, table) == evaluate(board)
+    table.clear()
+    assert (table.probes, table.hits, len(table)) == (0, 0, 64)
+    table.probe(board)
+    assert table.hits == 0
+
+
+def test_table_replaces_on_collision():
+    table = PawnTable(entries=1)
+    a = board_from(FENS[0])
+    b = board_from(FENS[2])
+    table.probe(a)
+    table.probe(b)
+    # Only one slot: b evicted a
+    assert table.probe(a) == pawn_structure(a)
+    assert table.hits == 0
+
+
+@pytest.mark.parametrize("entries", [0, 3, 100])
+def test_table_size_must_be_a_power_of_two(entries):
+    with pytest.raises(ValueError):
+        PawnTable(entries=entries)
+
+
+def test_search_probes_the_table():
+    searcher = Searcher(board_from(FENS[1]), pawns=PawnTable())
+    searcher.search(3)
+    assert searcher.pawns.probes > 0
+    # Far fewer pawn skeletons than evaluated positions
+    assert searcher.pawns.hit_rate() > 0.5
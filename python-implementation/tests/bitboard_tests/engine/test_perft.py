@@ -1,9 +1,36 @@
 import pytest
 
 from engine.bitboard.board import Board
-from engine.bitboard.generator import generate_legal_moves
+from engine.bitboard.generator import (
+    LEGAL_MOVE_GENERATORS,
+    count_legal_moves,
+    generate_legal_moves,
+)
 from engine.bitboard.constants import WHITE, WHITE_KING, BLACK_KING
-from engine.bitboard.perft import perft_count, perft_divide, perft_hashed_root
+from engine.bitboard.perft import (
+    perft_count,
+    perft_divide,
+    perft_hashed,
+    perft_hashed_root,
+    perft_parallel,
+)
+from engine.bitboard.perft_table import PerftTable
+
+
+KIWIPETE = (
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+)
+POSITION_3 = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+POSITION_4 = (
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+)
+POSITION_5 = "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"
+POSITION_6 = (
+    "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"
+)
+
+FOOLS_MATE = "rnbqkbnr/pppp1ppp/8/4p3/6P1/5P2/PPPPP2P/RNBQKBNR b KQkq g3 0 2"
+BARE_KINGS_AFTER_KXD2 = "k7/8/8/8/8/8/3q4/3K4 w - - 0 1"
 
 
 def make_kings_only_board() -> Board:
@@ -51,6 +78,65 @@ def test_perft_start_position(depth, expected):
     assert perft_count(b, depth) == expected
 
 
+@pytest.mark.parametrize("gen_name", sorted(LEGAL_MOVE_GENERATORS))
+@pytest.mark.parametrize(
+    "fen,depth,expected",
+    [
+        (KIWIPETE, 1, 48),
+        (KIWIPETE, 2, 2039),
+        (POSITION_3, 1, 14),
+        (POSITION_3, 2, 191),
+        (POSITION_3, 3, 2812),
+        (POSITION_4, 1, 6),
+        (POSITION_4, 2, 264),
+        (POSITION_5, 1, 44),
+        (POSITION_5, 2, 1486),
+        (POSITION_6, 1, 46),
+        (POSITION_6, 2, 2079),
+    ],
+)
+def test_perft_reference_positions(gen_name, fen, depth, expected):
+    b = Board()
+    b.set_fen(fen)
+    move_gen = LEGAL_MOVE_GENERATORS[gen_name]
+    assert perft_count(b, depth, move_gen=move_gen) == expected
+
+
+@pytest.mark.parametrize("depth,expected", [(1, 20), (2, 400), (3, 8902)])
+def test_perft_start_position_direct_generator(depth, expected):
+    b = Board()
+    move_gen = LEGAL_MOVE_GENERATORS["direct"]
+    assert perft_count(b, depth, move_gen=move_gen) == expected
+
+
+@pytest.mark.parametrize("count_moves", [None, count_legal_moves])
+@pytest.mark.parametrize(
+    "fen,depth,expected",
+    [
+        (KIWIPETE, 1, 48),
+        (KIWIPETE, 3, 97862),
+        (POSITION_3, 4, 43238),
+        (POSITION_4, 3, 9467),
+        (POSITION_5, 3, 62379),
+    ],
+)
+def test_perft_bulk_counting(fen, depth, expected, count_moves):
+    b = Board()
+    b.set_fen(fen)
+    move_gen = LEGAL_MOVE_GENERATORS["direct"]
+    kwargs = dict(move_gen=move_gen, bulk=True, count_moves=count_moves)
+    assert perft_count(b, depth, **kwargs) == expected
+    assert sum(perft_divide(b, depth, **kwargs).values()) == expected
+    table = PerftTable(size_mb=1)
+    assert perft_hashed(b, depth, table, **kwargs) == expected
+
+
+def test_perft_bulk_respects_draws():
+    b = Board()
+    b.halfmove_clock = 100
+    assert perft_count(b, 1, respect_draws=True, bulk=True) == 1
+
+
 def test_perft_divide_depth_one_sums_to_perft():
     b = Board()
     total = perft_count(b, 1)
@@ -69,6 +155,48 @@ def test_perft_divide_consistency_with_depth_two():
     assert any(cnt > 1 for cnt in divide2.values())
 
 
+@pytest.mark.parametrize("split_depth", [1, 2])
+def test_perft_parallel_matches_divide(split_depth):
+    b = Board()
+    b.set_fen(KIWIPETE)
+    total, divide = perft_parallel(b, 2, workers=2, split_depth=split_depth)
+    assert total == 2039
+    assert divide == perft_divide(b, 2)
+
+
+@pytest.mark.parametrize("split_depth", [1, 2])
+def test_perft_parallel_keeps_mating_root_moves(split_depth):
+    # Black mates with Qh4#, which has no replies below it
+    b = Board()
+    b.set_fen(FOOLS_MATE)
+    total, divide = perft_parallel(b, 2, workers=2, split_depth=split_depth)
+    expected = perft_divide(b, 2)
+    assert divide == expected
+    assert total == sum(expected.values())
+    assert 0 in divide.values()
+
+
+@pytest.mark.parametrize("split_depth", [1, 2])
+def test_perft_parallel_stops_at_drawn_root_moves(split_depth):
+    # Kxd2 leaves bare kings, a draw worth one leaf however deep
+    b = Board()
+    b.set_fen(BARE_KINGS_AFTER_KXD2)
+    total, divide = perft_parallel(
+        b, 3, workers=2, split_depth=split_depth, respect_draws=True
+    )
+    assert divide == perft_divide(b, 3, respect_draws=True)
+    assert total == perft_count(b, 3, respect_draws=True) == 1
+
+
+def test_perft_parallel_leaves_board_untouched():
+    b = Board()
+    fen = b.get_fen()
+    total, _ = perft_parallel(b, 3, workers=2)
+    assert total == 8902
+    assert b.get_fen() == fen
+    assert b.raw_history == []
+
+
 def test_perft_hashed_vs_perft_count():
     b = Board()
     assert perft_count(b, 3) == perft_hashed_root(b, 3)
@@ -0,0 +1,161 @@
+import os
+
+import pytest
+
+from engine.bitboard import perft_cache
+from engine.bitboard.generator import (
+    count_legal_moves,
+    generate_legal_moves_direct,
+)
+from engine.bitboard.perft import perft_count, perft_hashed, perft_hashed_root
+from engine.bitboard.perft_cache import (
+    HEADER_BYTES,
+    PerftCache,
+    zobrist_fingerprint,
+)
+from engine.bitboard.perft_table import ENTRY_BYTES
+from tests.utils import board_from
+
+KIWIPETE = (
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+)
+FAST = dict(
+    packed=True,
+    move_gen=generate_legal_moves_direct,
+    bulk=True,
+    count_moves=count_legal_moves,
+)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "perft.cache")
+
+
+def test_new_file_has_the_requested_size(path):
+    with PerftCache(path, 0.05) as cache:
+        assert cache.reset_reason == "new file"
+        assert cache.probe(0x1234, 3) is None
+    assert os.path.getsize(path) == HEADER_BYTES + len(cache) * ENTRY_BYTES
+
+
+def test_counts_survive_reopening(path):
+    with PerftCache(path, 0.05) as cache:
+        cache.store(0x1234, 3, 97862)
+    with PerftCache(path, 0.05) as cache:
+        assert cache.reset_reason is None
+        assert cache.probe(0x1234, 3) == 97862
+    # Without a size the file is used as it is
+    with PerftCache(path) as cache:
+        assert cache.reset_reason is None
+        assert cache.probe(0x1234, 3) == 97862
+
+
+def test_second_run_is_all_lookups(path):
+    board = board_from(KIWIPETE)
+    expected = perft_count(board, 3)
+    with PerftCache(path, 1) as cache:
+        assert perft_hashed(board, 3, cache, **FAST) == expected
+        assert cache.stores > 0
+    with PerftCache(path, 1) as cache:
+        assert perft_hashed(board, 3, cache, **FAST) == expected
+        assert cache.stores == 0
+        assert cache.hits == 1
+
+
+def test_perft_hashed_root_with_cache(path):
+    board = board_from(KIWIPETE)
+    assert perft_hashed_root(board, 3, size_mb=1, cache=path) == 97862
+    with PerftCache(path, 1) as cache:
+        assert cache.probe(board.zobrist_key, 3) == 97862
+
+
+def test_size_stays_fixed(path):
+    with PerftCache(path, 0.01) as cache:
+        slots = len(cache)
+        for key in range(10 * slots):
+            cache.store(key * 0x9E3779B97F4A7C15 & (2**64 - 1), 2, key)
+        assert cache.filled() <= slots
+        assert cache.overwrites > 0
+    assert os.path.getsize(path) == HEADER_BYTES + slots * ENTRY_BYTES
+
+
+def test_clear_empties_the_file(path):
+    with PerftCache(path, 0.05) as cache:
+        cache.store(42, 2, 99)
+        cache.clear()
+    with PerftCache(path, 0.05) as cache:
+        assert cache.probe(42, 2) is None
+
+
+def test_fingerprint_covers_every_zobrist_key(monkeypatch):
+    base = zobrist_fingerprint()
+    assert zobrist_fingerprint() == base
+    ep_keys = list(perft_cache.ZOBRIST_EP_KEYS)
+    ep_keys[3] ^= 1
+    monkeypatch.setattr(perft_cache, "ZOBRIST_EP_KEYS", ep_keys)
+    assert zobrist_fingerprint() != base
+    monkeypatch.undo()
+    monkeypatch.setattr(
+        perft_cache, "ZOBRIST_SIDE_KEY", perft_cache.ZOBRIST_SIDE_KEY ^ 1
+    )
+    assert zobrist_fingerprint() != base
+
+
+def test_changed_zobrist_keys_invalidate_the_file(path, monkeypatch):
+    with PerftCache(path, 0.05) as cache:
+        cache.store(0x1234, 3, 97862)
+    monkeypatch.setattr(
+        perft_cache, "ZOBRIST_SIDE_KEY", perft_cache.ZOBRIST_SIDE_KEY ^ 1
+    )
+    with PerftCache(path, 0.05) as cache:
+        assert cache.reset_reason == "zobrist keys changed"
+        assert cache.probe(0x1234, 3) is None
+
+
+def test_changed_format_invalidates_the_file(path, monkeypatch):
+    with PerftCache(path, 0.05) as cache:
+        cache.store(0x1234, 3, 97862)
+    monkeypatch.setattr(perft_cache, "CACHE_FORMAT", 2)
+    with PerftCache(path, 0.05) as cache:
+        assert cache.reset_reason == "cache format 1, expected 2"
+        assert cache.probe(0x1234, 3) is None
+
+
+def test_changed_size_invalidates_the_file(path):
+    with PerftCache(path, 0.05) as cache:
+        cache.store(0x1234, 3, 97862)
+    with PerftCache(path, 0.1) as cache:
+        assert cache.reset_reason == "size changed"
+        assert cache.probe(0x1234, 3) is None
+
+
+@pytest.mark.parametrize(
+    "content,reason",
+    [
+        (b"", "not a perft cache"),
+        (b"x" * 4096, "not a perft cache"),
+    ],
+)
+def test_foreign_file_is_replaced(path, content, reason):
+    with open(path, "wb") as f:
+        f.write(content)
+    with PerftCache(path, 0.05) as cache:
+        assert cache.reset_reason == reason
+        assert cache.filled() == 0
+
+
+def test_truncated_file_is_replaced(path):
+    with PerftCache(path, 0.05):
+        pass
+    with open(path, "r+b") as f:
+        f.truncate(HEADER_BYTES + 100)
+    with PerftCache(path) as cache:
+        assert cache.reset_reason == "truncated"
+        assert os.path.getsize(path) > HEADER_BYTES + 100
+
+
+def test_two_maps_of_one_file_share_counts(path):
+    with PerftCache(path, 0.05) as writer, PerftCache(path, 0.05) as reader:
+        writer.store(0x1234, 3, 97862)
+        assert reader.probe(0x1234, 3) == 97862
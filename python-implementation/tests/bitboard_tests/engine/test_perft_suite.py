@@ -0,0 +1,176 @@
+import json
+
+import pytest
+
+from engine.bitboard.constants import BLACK
+from engine.bitboard.generator import (
+    LEGAL_MOVE_GENERATORS,
+    generate_legal_moves_direct,
+)
+from engine.bitboard.perft_cache import PerftCache
+from engine.bitboard.perft_suite import (
+    ERROR,
+    MISMATCH,
+    OK,
+    TIMEOUT,
+    SuiteCase,
+    SuiteOptions,
+    main,
+    parse_case,
+    read_suite,
+    run_case,
+    run_suite,
+)
+
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq -"
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq -"
+POSITION_3 = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - -"
+
+SUITE = f"""\
+# a comment, then a blank line
+
+{START} ;D1 20 ;D2 400 ;D3 8902
+{KIWIPETE} ;D1 48 ;D2 2039
+{POSITION_3} ;D1 14 ;D2 191 ;D3 2812 ;D4 43238
+"""
+
+CASTLING = 1 << 14
+
+
+def _no_black_castling(board, packed=False):
+    """The direct generator, minus black's castling moves."""
+    moves = generate_legal_moves_direct(board, packed)
+    if board.side_to_move != BLACK:
+        return moves
+    return [m for m in moves if not m & CASTLING]
+
+
+def test_read_suite_skips_blank_and_comment_lines():
+    cases = list(read_suite(SUITE.splitlines()))
+    assert [case.line for case in cases] == [3, 4, 5]
+    assert cases[0].text.startswith(START)
+
+
+def test_parse_case_reads_depth_opcodes():
+    fen, expected = parse_case(f"{START} ;D1 20 ;D2 400 ;id start")
+    assert fen == f"{START} 0 1"
+    assert expected == {1: 20, 2: 400}
+
+
+@pytest.mark.parametrize(
+    "text", [f"{START} ;id start", f"{START} ;D1 twenty", "not a fen ;D1 3"]
+)
+def test_parse_case_rejects_bad_lines(text):
+    with pytest.raises(ValueError):
+        parse_case(text)
+
+
+@pytest.mark.parametrize("generator", sorted(LEGAL_MOVE_GENERATORS))
+@pytest.mark.parametrize("bulk", [True, False])
+def test_run_case_ok(generator, bulk):
+    case = SuiteCase(1, f"{KIWIPETE} ;D1 48 ;D2 2039")
+    result = run_case(case, SuiteOptions(generator=generator, bulk=bulk))
+    assert result.status == OK
+    assert [(d.depth, d.nodes) for d in result.depths] == [(1, 48), (2, 2039)]
+
+
+def test_run_case_with_hash():
+    case = SuiteCase(1, f"{POSITION_3} ;D1 14 ;D2 191 ;D3 2812 ;D4 43238")
+    result = run_case(case, SuiteOptions(hash_mb=1))
+    assert result.status == OK
+    assert result.nodes == 14 + 191 + 2812 + 43238
+
+
+def test_run_case_max_depth():
+    case = SuiteCase(1, f"{START} ;D3 8902 ;D1 20 ;D2 400")
+    result = run_case(case, SuiteOptions(max_depth=2))
+    assert result.status == OK
+    assert [d.depth for d in result.depths] == [1, 2]
+
+
+def test_run_case_error_is_a_result():
+    result = run_case(SuiteCase(7, "not a fen ;D1 3"), SuiteOptions())
+    assert result.status == ERROR
+    assert result.line == 7
+    assert result.note
+
+
+def test_run_case_timeout():
+    case = SuiteCase(1, f"{START} ;D1 20 ;D6 119060324")
+    result = run_case(case, SuiteOptions(timeout=0.2))
+    assert result.status == TIMEOUT
+    # The depths done before the timeout are kept
+    assert [d.depth for d in result.depths] == [1]
+
+
+def test_wrong_expected_count_blames_the_suite():
+    case = SuiteCase(1, f"{START} ;D1 20 ;D2 401 ;D3 8902")
+    result = run_case(case, SuiteOptions())
+    assert result.status == MISMATCH
+    # Counting stops at the first wrong depth
+    assert [(d.depth, d.ok) for d in result.depths] == [(1, True), (2, False)]
+    assert result.divergence is None
+    assert "expected count may be wrong" in result.note
+
+
+def test_bisection_finds_the_missing_moves(monkeypatch):
+    monkeypatch.setitem(LEGAL_MOVE_GENERATORS, "broken", _no_black_castling)
+    case = SuiteCase(1, f"{KIWIPETE} ;D1 48 ;D2 2039 ;D3 97862")
+    options = SuiteOptions(generator="broken", bulk=False)
+    result = run_case(case, options)
+    assert result.status == MISMATCH
+    assert result.depths[-1].depth == 2
+    div = result.divergence
+    assert div is not None
+    # One white move, then black to move without castling
+    assert len(div.path) == 1
+    assert div.depth == 1
+    assert div.missing == ["e8c8", "e8g8"]
+    assert div.extra == []
+    assert div.fen.split()[1] == "b"
+
+
+def test_no_bisect(monkeypatch):
+    monkeypatch.setitem(LEGAL_MOVE_GENERATORS, "broken", _no_black_castling)
+    case = SuiteCase(1, f"{KIWIPETE} ;D2 2039")
+    result = run_case(case, SuiteOptions(generator="broken", reference=None))
+    assert result.status == MISMATCH
+    assert result.divergence is None
+    assert result.note == ""
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_suite_keeps_file_order(workers):
+    text = SUITE + f"{START} ;D1 21\n" + "bad ;D1 1\n"
+    cases = read_suite(text.splitlines())
+    results = list(run_suite(cases, SuiteOptions(), workers))
+    assert [r.line for r in results] == [3, 4, 5, 6, 7]
+    assert [r.status for r in results] == [OK, OK, OK, MISMATCH, ERROR]
+
+
+def test_main_exit_status_and_json(tmp_path, capsys):
+    path = tmp_path / "suite.epd"
+    path.write_text(SUITE)
+    assert main([str(path), "--workers", "1", "--max-depth", "2"]) == 0
+    out = capsys.readouterr().out
+    assert "3 positions: 3 ok" in out
+
+    path.write_text(SUITE + f"{START} ;D1 21\n")
+    assert main([str(path), "--workers", "1", "--json"]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["summary"]["positions"] == 4
+    assert report["summary"][MISMATCH] == 1
+    assert report["positions"][-1]["depths"][0]["nodes"] == 20
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_suite_with_cache(tmp_path, workers):
+    cache = str(tmp_path / "perft.cache")
+    options = SuiteOptions(cache=cache, cache_mb=1)
+    for _ in range(2):
+        cases = read_suite(SUITE.splitlines())
+        results = list(run_suite(cases, options, workers))
+        assert [r.status for r in results] == [OK, OK, OK]
+    with PerftCache(cache, 1) as table:
+        assert table.reset_reason is None
+        assert table.filled() > 0
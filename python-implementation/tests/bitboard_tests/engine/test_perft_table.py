@@ -0,0 +1,107 @@
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.legal import generate_legal_moves_direct
+from engine.bitboard.perft import perft_count, perft_hashed
+from engine.bitboard.perft_table import PerftTable
+
+KIWIPETE = (
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+)
+
+
+def test_store_then_probe():
+    table = PerftTable(size_mb=0.01)
+    assert table.probe(0x1234, 3) is None
+    table.store(0x1234, 3, 97862)
+    assert table.probe(0x1234, 3) == 97862
+    assert table.hits == 1
+    assert table.misses == 1
+    assert table.stores == 1
+
+
+def test_probe_verifies_full_key_and_depth():
+    table = PerftTable(size_mb=0.01)
+    key = 0xDEADBEEF
+    # Same bucket, different key
+    alias = key + table.num_buckets
+    table.store(key, 2, 400)
+    assert table.probe(alias, 2) is None
+    assert table.probe(key, 3) is None
+    assert table.probe(key, 2) == 400
+
+
+def test_depth_preferred_slot_keeps_deeper_entry():
+    table = PerftTable(size_mb=0.01)
+    n = table.num_buckets
+    table.store(5, 4, 1000)
+    # Shallower entry in the same bucket goes to the always-replace slot
+    table.store(5 + n, 1, 10)
+    table.store(5 + 2 * n, 1, 20)
+    assert table.probe(5, 4) == 1000
+    assert table.probe(5 + n, 1) is None
+    assert table.probe(5 + 2 * n, 1) == 20
+    assert table.overwrites == 1
+
+    # A deeper entry takes over the depth-preferred slot
+    table.store(5 + 3 * n, 5, 7)
+    assert table.probe(5 + 3 * n, 5) == 7
+    assert table.overwrites == 2
+
+
+def test_memory_is_fixed():
+    table = PerftTable(size_mb=0.01)
+    slots = len(table)
+    size = table.size_bytes
+    for key in range(10 * slots):
+        table.store(key * 0x9E3779B97F4A7C15 & (2**64 - 1), 1 + key % 5, key)
+    assert len(table) == slots
+    assert table.size_bytes == size
+    assert table.filled() <= slots
+
+
+def test_clear_empties_table():
+    table = PerftTable(size_mb=0.01)
+    table.store(42, 2, 99)
+    table.clear()
+    assert table.probe(42, 2) is None
+    assert table.filled() == 0
+    assert table.stores == 0
+
+
+@pytest.mark.parametrize("size_mb", [0.001, 0.05, 4])
+def test_perft_hashed_with_small_table(size_mb):
+    b = Board()
+    b.set_fen(KIWIPETE)
+    table = PerftTable(size_mb)
+    expected = perft_count(b, 3, move_gen=generate_legal_moves_direct)
+    got = perft_hashed(b, 3, table, move_gen=generate_legal_moves_direct)
+    assert got == expected == 97862
+    assert table.stores > 0
+
+
+def test_table_over_a_buffer():
+    buffer = bytearray(4 * 8 * 16)
+    table = PerftTable(buffer=buffer)
+    assert table.num_buckets == 16
+    assert len(table) == 32
+    table.store(0x1234, 3, 97862)
+    assert table.probe(0x1234, 3) == 97862
+    assert any(buffer)
+    table.clear()
+    assert not any(buffer)
+
+
+def test_buffer_too_small():
+    with pytest.raises(ValueError):
+        PerftTable(buffer=bytearray(16))
+
+
+def test_torn_slot_reads_as_a_miss():
+    table = PerftTable(size_mb=0.01)
+    key = 0x1234
+    table.store(key, 3, 97862)
+    slot = (key % table.num_buckets) << 1
+    # Another store's data word landed without its key word
+    table.data[slot] = (8902 << 8) | 3
+    assert table.probe(key, 3) is None
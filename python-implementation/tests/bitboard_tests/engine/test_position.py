@@ -0,0 +1,180 @@
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.generator import generate_legal_moves
+from engine.bitboard.uci import GamePosition, _parse_position
+from engine.bitboard.utils import move_to_uci, to_raw_move, uci_to_move
+from tests.utils import board_from
+
+STARTPOS = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+FENS = [
+    STARTPOS,
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R b KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1",
+]
+# Knights out and back twice: the start position three times
+SHUFFLE = "g1f3 g8f6 f3g1 f6g8 g1f3 g8f6 f3g1 f6g8".split()
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_uci_to_move_matches_generated_moves(fen):
+    board = board_from(fen)
+    for move in generate_legal_moves(board, True):
+        assert uci_to_move(board, move_to_uci(move)) == to_raw_move(move)
+
+
+@pytest.mark.parametrize("uci", ["e2", "e2e4q5", "e2e9", "e2e4k", "e4e5"])
+def test_uci_to_move_rejects_bad_moves(uci):
+    with pytest.raises(ValueError):
+        uci_to_move(Board(), uci)
+
+
+@pytest.mark.parametrize(
+    "fen,uci",
+    [
+        # Onto the mover's own piece
+        (STARTPOS, "d1d2"),
+        (STARTPOS, "a1a2"),
+        # From an empty square, and with the opponent's piece
+        (STARTPOS, "e4e5"),
+        (STARTPOS, "e7e5"),
+        # Castling through an attacked square, and without the right
+        ("r3k2r/8/8/8/8/8/5r2/R3K2R w KQkq - 0 1", "e1g1"),
+        ("r3k2r/8/8/8/8/8/8/R3K2R w Qkq - 0 1", "e1g1"),
+        # Leaving the king in check, and a pinned piece moving off line
+        ("4k3/8/8/8/8/8/4r3/R3K3 w - - 0 1", "a1a2"),
+        ("4k3/4r3/8/8/8/8/4N3/4K3 w - - 0 1", "e2c3"),
+        # A pawn promoting without a piece, or off the last rank
+        ("4k3/P7/8/8/8/8/8/4K3 w - - 0 1", "a7a8"),
+        (STARTPOS, "e2e4q"),
+        # Not a move of that piece at all
+        (STARTPOS, "g1g3"),
+    ],
+)
+def test_uci_to_move_rejects_illegal_moves(fen, uci):
+    board = board_from(fen)
+    with pytest.raises(ValueError):
+        uci_to_move(board, uci)
+    assert board.get_fen() == fen
+
+
+@pytest.mark.parametrize(
+    "cmd,expected",
+    [
+        ("position startpos", ("startpos", [])),
+        ("position startpos moves e2e4 e7e5", ("startpos", ["e2e4", "e7e5"])),
+        (f"position fen {STARTPOS}", (STARTPOS, [])),
+        (f"position fen {STARTPOS} moves d2d4", (STARTPOS, ["d2d4"])),
+    ],
+)
+def test_parse_position(cmd, expected):
+    assert _parse_position(cmd.split()) == expected
+
+
+@pytest.mark.parametrize("cmd", ["position", "position fen", "position x"])
+def test_parse_position_rejects_bad_commands(cmd):
+    with pytest.raises(ValueError):
+        _parse_position(cmd.split())
+
+
+def replayed(base: str, moves) -> Board:
+    board = Board() if base == "startpos" else board_from(base)
+    for move in moves:
+        board.make_move_raw(uci_to_move(board, move))
+    return board
+
+
+def same_position(a: Board, b: Board) -> bool:
+    return (
+        a.get_fen() == b.get_fen()
+        and a.zobrist_history == b.zobrist_history
+        and (a.psq_mg, a.psq_eg, a.phase, a.pawn_key)
+        == (b.psq_mg, b.psq_eg, b.phase, b.pawn_key)
+    )
+
+
+def test_game_position_extends_without_replaying(monkeypatch):
+    game = "e2e4 e7e5 g1f3 b8c6 f1b5 a7a6 b5a4 g8f6 e1g1".split()
+    position = GamePosition()
+    # Moves made and not taken back; the legal move lookup makes and
+    # undoes its own
+    made = [0]
+    make = Board.make_move_raw
+    undo = Board.undo_move_raw
+
+    def counting_make(self, move):
+        made[0] += 1
+        make(self, move)
+
+    def counting_undo(self):
+        made[0] -= 1
+        undo(self)
+
+    monkeypatch.setattr(Board, "make_move_raw", counting_make)
+    monkeypatch.setattr(Board, "undo_move_raw", counting_undo)
+    for ply in range(len(game) + 1):
+        made[0] = 0
+        board = position.set("startpos", game[:ply])
+        assert made[0] == (1 if ply else 0)
+        assert same_position(board, replayed("startpos", game[:ply]))
+
+
+@pytest.mark.parametrize(
+    "first,second",
+    [
+        # Take back two moves
+        ("e2e4 e7e5 g1f3 b8c6", "e2e4 e7e5"),
+        # Take back one and play another
+        ("e2e4 e7e5 g1f3", "e2e4 e7e5 f1c4"),
+        # A different game altogether
+        ("e2e4 e7e5", "d2d4 d7d5"),
+        # Back to the start
+        ("e2e4 e7e5", ""),
+    ],
+)
+def test_game_position_takes_moves_back(first, second):
+    position = GamePosition()
+    position.set("startpos", first.split())
+    board = position.set("startpos", second.split())
+    assert same_position(board, replayed("startpos", second.split()))
+    assert position.moves == second.split()
+
+
+def test_game_position_new_base_rebuilds():
+    fen = FENS[1]
+    position = GamePosition()
+    position.set("startpos", ["e2e4"])
+    board = position.set(fen, ["e1g1"])
+    assert same_position(board, replayed(fen, ["e1g1"]))
+    board = position.set("startpos", ["e2e4"])
+    assert same_position(board, replayed("startpos", ["e2e4"]))
+
+
+def test_game_position_keeps_history_for_repetitions():
+    position = GamePosition()
+    for ply in range(len(SHUFFLE) + 1):
+        board = position.set("startpos", SHUFFLE[:ply])
+    assert board.zobrist_history.count(board.zobrist_key) == 3
+    assert len(board.zobrist_history) == len(SHUFFLE) + 1
+
+
+def test_game_position_bad_move_stops_before_it():
+    position = GamePosition()
+    with pytest.raises(ValueError):
+        position.set("startpos", ["e2e4", "e4e5", "e7e5"])
+    assert position.moves == ["e2e4"]
+    board = position.set("startpos", ["e2e4", "e7e5"])
+    assert same_position(board, replayed("startpos", ["e2e4", "e7e5"]))
+
+
+@pytest.mark.parametrize("bad", ["e8e7", "e1e2", "d4d5", "e8g8", "d8h4"])
+def test_game_position_rejects_illegal_moves(bad):
+    position = GamePosition()
+    with pytest.raises(ValueError):
+        position.set("startpos", ["e2e4", bad, "g1f3"])
+    assert position.moves == ["e2e4"]
+    assert same_position(position.board, replayed("startpos", ["e2e4"]))
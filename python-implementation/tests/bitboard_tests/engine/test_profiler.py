@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.perft import perft_count
+from engine.bitboard.profiler import Profiler
+from engine.bitboard.search import Searcher, search
+from tests.utils import board_from
+
+KIWIPETE = (
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+)
+
+
+def test_perft_profile_counts_per_depth():
+    board = Board()
+    profile = Profiler()
+    assert perft_count(board, 3, profile=profile) == 8902
+    assert type(board) is Board
+    assert profile.num_depths() == 4
+    assert profile.nodes[:4] == [1, 20, 400, 8902]
+    # Every node's moves are the next depth's nodes
+    assert profile.moves[:3] == profile.nodes[1:4]
+    assert profile.makes == profile.undos
+    assert profile.seconds > 0
+    assert board.profiler is None
+
+
+def test_attach_detaches_when_the_block_raises():
+    board = Board()
+    profile = Profiler()
+    with pytest.raises(RuntimeError):
+        with profile.attach(board):
+            board.make_move_raw((12, 28, False, None, False, False))
+            raise RuntimeError("stop")
+    assert board.profiler is None
+    assert profile.makes[0] == 1
+    board.undo_move_raw()
+    assert profile.undos[0] == 0
+    # A copy never reports to the profile
+    with profile.attach(board):
+        assert board.copy().profiler is None
+
+
+@pytest.mark.parametrize("sample_every", [1, 7, 100])
+def test_perft_profile_samples(sample_every):
+    board = board_from(KIWIPETE)
+    profile = Profiler(sample_every)
+    assert perft_count(board, 3, profile=profile) == 97862
+    for d in range(3):
+        nodes = profile.nodes[d]
+        assert profile.samples[d] == (nodes + sample_every - 1) // sample_every
+        assert profile.gen_seconds[d] > 0
+    assert len(profile.timeline) == sum(profile.nodes) // sample_every
+    if sample_every == 1:
+        # Every node sampled: the legal moves are exactly the moves
+        assert profile.sampled_legal[:3] == profile.moves[:3]
+        ratio = profile.rows()[2]["legal_ratio"]
+        assert 0.99 < ratio < 1
+
+
+def test_search_profile_matches_plain_search():
+    plain = Searcher(board_from(KIWIPETE))
+    expected = plain.search(3)
+    profile = Profiler()
+    board = board_from(KIWIPETE)
+    assert search(board, 3, profile=profile) == expected
+    assert type(board) is Board
+    assert sum(profile.nodes) == plain.nodes
+    assert profile.nodes[0] == 3
+    assert profile.makes[:10] == profile.undos[:10]
+
+
+def test_exports(tmp_path):
+    profile = Profiler(16)
+    perft_count(Board(), 3, profile=profile)
+    data = json.loads(profile.to_json(str(tmp_path / "p.json")))
+    assert data == json.loads((tmp_path / "p.json").read_text())
+    assert data["nodes"] == 1 + 20 + 400 + 8902
+    assert [row["nodes"] for row in data["depths"]] == [1, 20, 400, 8902]
+
+    text = profile.to_csv(str(tmp_path / "p.csv"))
+    assert text == (tmp_path / "p.csv").read_text()
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert [int(row["nodes"]) for row in rows] == [1, 20, 400, 8902]
+    assert Profiler().to_csv().startswith("depth,nodes,")
+
+
+def test_reset_and_bad_interval():
+    profile = Profiler()
+    perft_count(Board(), 2, profile=profile)
+    profile.reset()
+    assert profile.num_depths() == 0
+    assert profile.rows() == []
+    with pytest.raises(ValueError):
+        Profiler(0)
@@ -0,0 +1,145 @@
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.evaluate import evaluate
+from engine.bitboard.generator import generate_legal_moves
+from engine.bitboard.search import (
+    INFINITY,
+    MATE_SCORE,
+    QS_CHECK_PLIES,
+    Searcher,
+    format_score,
+    search,
+)
+from engine.bitboard.transposition import TranspositionTable
+from engine.bitboard.utils import move_to_uci
+from tests.utils import board_from
+
+KIWIPETE = (
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+)
+
+
+def minimax(
+    board: Board, depth: int, leaf: Searcher, ply: int = 0
+) -> int:
+    """
+    Plain negamax without pruning, the reference for alpha-beta. Leaves
+    get the same full-window quiescence search as the real search.
+    """
+    if depth == 0:
+        return leaf._quiesce(-INFINITY, INFINITY, ply, 0)
+    moves = generate_legal_moves(board, True)
+    if not moves:
+        if board.in_check(board.side_to_move):
+            return ply - MATE_SCORE
+        return 0
+    best = -INFINITY
+    for move in moves:
+        board.make_move_raw(move)
+        best = max(best, -minimax(board, depth - 1, leaf, ply + 1))
+        board.undo_move_raw()
+    return best
+
+
+@pytest.mark.parametrize(
+    "fen,depth",
+    [
+        ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", 2),
+        ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", 3),
+        ("4k3/8/8/3q4/8/2N5/8/3RK3 w - - 0 1", 2),
+        ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 2),
+        ("8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", 3),
+    ],
+)
+def test_alpha_beta_matches_minimax(fen, depth):
+    board = board_from(fen)
+    before = board.get_fen()
+    _, score = search(board, depth)
+    assert board.get_fen() == before
+    leaf = Searcher(board, tt=TranspositionTable(size_mb=0.01))
+    assert score == minimax(board, depth, leaf)
+
+
+def test_search_finds_mate_in_one():
+    board = board_from("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+    move, score = search(board, 3)
+    assert move_to_uci(move) == "a1a8"
+    assert score == MATE_SCORE - 1
+    assert format_score(score) == "mate 1"
+
+
+def test_search_sees_being_mated():
+    # Black's only move is Kb8, then Rh8#
+    board = board_from("k7/8/1K6/8/8/8/8/7R b - - 0 1")
+    _, score = search(board, 3)
+    assert score == -(MATE_SCORE - 2)
+    assert format_score(score) == "mate -1"
+
+
+def test_search_wins_hanging_queen():
+    board = board_from("4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1")
+    move, score = search(board, 2)
+    assert move_to_uci(move) == "d1d5"
+    assert score > 0
+
+
+def test_no_legal_moves_returns_none():
+    # Stalemate: black king on a8, white queen on b6
+    board = board_from("k7/8/1Q6/8/8/8/8/4K3 b - - 0 1")
+    move, score = search(board, 3)
+    assert move is None
+    assert score == 0
+
+
+def test_pv_is_legal_line_and_info_lines():
+    board = board_from(KIWIPETE)
+    lines = []
+    searcher = Searcher(board, on_info=lines.append)
+    best, _ = searcher.search(3)
+    assert [line.split()[2] for line in lines] == ["1", "2", "3"]
+    assert all(" nodes " in line and " pv " in line for line in lines)
+
+    pv = searcher.pv[0]
+    assert pv[0] == best
+    for move in pv:
+        assert move in generate_legal_moves(board, True)
+        board.make_move_raw(move)
+    for _ in pv:
+        board.undo_move_raw()
+    assert board.get_fen() == KIWIPETE
+
+
+def test_repetition_scores_as_draw():
+    board = board_from("4k3/8/8/8/8/8/8/R3K3 w - - 0 1")
+    for uci in ("e1d1", "e8d8", "d1e1", "d8e8"):
+        move = next(
+            m
+            for m in generate_legal_moves(board, True)
+            if move_to_uci(m) == uci
+        )
+        board.make_move_raw(move)
+    searcher = Searcher(board)
+    assert searcher._is_draw()
+
+
+def test_quiescence_sees_recapture():
+    # Qxd5 wins a pawn at depth 1 but loses the queen to cxd5
+    board = board_from("4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1")
+    move, score = search(board, 1)
+    assert move_to_uci(move) != "d1d5"
+    # Still a queen against two pawns: nothing won or lost
+    assert score > 500
+
+
+def test_quiescence_stand_pat_and_mate():
+    board = board_from("4k3/8/8/8/8/8/8/3QK3 w - - 0 1")
+    searcher = Searcher(board, tt=TranspositionTable(size_mb=0.01))
+    # Nothing to capture and past the checking plies: the static
+    # evaluation stands
+    score = searcher._quiesce(-INFINITY, INFINITY, 0, QS_CHECK_PLIES)
+    assert score == evaluate(board)
+    # Black to move, mated: no stand pat in check
+    mated = board_from("k6R/8/1K6/8/8/8/8/8 b - - 0 1")
+    searcher = Searcher(mated, tt=TranspositionTable(size_mb=0.01))
+    assert searcher._quiesce(-INFINITY, INFINITY, 3, 0) == 3 - MATE_SCORE
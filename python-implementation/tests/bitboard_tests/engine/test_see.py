@@ -0,0 +1,90 @@
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.generator import generate_moves
+from engine.bitboard.see import attackers_to, is_losing, see
+from engine.bitboard.utils import algebraic_to_index, move_to_uci
+from tests.utils import board_from
+
+FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R b KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+]
+
+
+def find(board: Board, uci: str) -> int:
+    return next(
+        m for m in generate_moves(board, True) if move_to_uci(m) == uci
+    )
+
+
+@pytest.mark.parametrize(
+    "fen,uci,expected",
+    [
+        # Undefended pawn
+        ("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1", "e1e5", 100),
+        # NxP, NxN, RxN, BxR, QxB, QxQ: the knight is lost for a pawn
+        (
+            "1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1",
+            "d3e5",
+            -220,
+        ),
+        # The second rook only joins in through the first one (x-ray)
+        ("3rk3/8/8/3p4/8/8/3R4/3RK3 w - - 0 1", "d2d5", 100),
+        ("3rk3/3r4/8/3p4/8/8/3R4/3RK3 w - - 0 1", "d2d5", -400),
+        # En passant: the victim is not on the destination square
+        ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", "e5d6", 100),
+        # Promotions, defended or not
+        ("r3k3/1P6/8/8/8/8/8/4K3 w - - 0 1", "b7a8q", 1300),
+        ("r3k3/1P6/8/8/8/8/8/4K3 w - - 0 1", "b7b8q", -100),
+        ("r3k3/1P6/8/8/8/8/8/4K3 w - - 0 1", "b7b8n", -100),
+        # The king cannot take back a queen the rook behind it defends
+        ("3rk3/8/8/8/8/8/3q4/3RK3 b - - 0 1", "d2d1", 500),
+        ("4k3/8/8/8/8/8/3q4/3RK3 b - - 0 1", "d2d1", 500 - 900),
+        # Quiet moves: zero when safe, the piece when it hangs
+        ("4k3/8/8/3p4/8/8/8/3QK3 w - - 0 1", "d1d4", 0),
+        ("4k3/8/8/3p4/8/8/8/3QK3 w - - 0 1", "d1g4", 0),
+        ("4k3/8/8/3p4/8/8/4Q3/4K3 w - - 0 1", "e2e4", -900),
+    ],
+)
+def test_see_values(fen, uci, expected):
+    board = board_from(fen)
+    assert see(board, find(board, uci)) == expected
+
+
+def test_attackers_to_sees_through_removed_pieces():
+    board = board_from("3rk3/8/8/3p4/8/8/3R4/3RK3 w - - 0 1")
+    d5 = algebraic_to_index("d5")
+    d2 = algebraic_to_index("d2")
+    d1 = algebraic_to_index("d1")
+    d8 = algebraic_to_index("d8")
+    assert attackers_to(board, d5, board.all_occ) == (1 << d2) | (1 << d8)
+    occ = board.all_occ ^ (1 << d2)
+    assert attackers_to(board, d5, occ) == (1 << d1) | (1 << d8)
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_is_losing_matches_see(fen):
+    board = board_from(fen)
+    for move in generate_moves(board, True):
+        assert is_losing(board, move) == (see(board, move) < 0)
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_see_leaves_the_board_alone(fen, monkeypatch):
+    board = board_from(fen)
+    before = (board.zobrist_key, list(board.bitboards), board.all_occ)
+
+    def forbidden(*args):
+        raise AssertionError("see must not make moves")
+
+    monkeypatch.setattr(Board, "make_move_raw", forbidden)
+    for move in generate_moves(board, True):
+        see(board, move)
+    assert (board.zobrist_key, list(board.bitboards), board.all_occ) == (
+        before
+    )
@@ -0,0 +1,95 @@
+import time
+
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.search import Searcher
+from engine.bitboard.smp import (
+    HELPER_SKIPS,
+    HelperPool,
+    HelperResult,
+    deeper_result,
+)
+from engine.bitboard.timeman import SearchLimits
+from tests.utils import board_from
+
+KIWIPETE = (
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+)
+
+
+@pytest.mark.parametrize("skip_size,skip_phase", HELPER_SKIPS[:4])
+def test_skipped_depths_are_not_searched(skip_size, skip_phase):
+    lines = []
+    searcher = Searcher(Board(), on_info=lines.append)
+    searcher.search(4, skip_size=skip_size, skip_phase=skip_phase)
+    searched = [int(line.split()[2]) for line in lines]
+    assert searched == [
+        d for d in range(1, 5) if not (d + skip_phase) // skip_size % 2
+    ]
+    assert searcher.depth == searched[-1]
+
+
+def test_should_stop_ends_the_search():
+    calls = []
+
+    def should_stop():
+        calls.append(1)
+        return len(calls) > 3
+
+    searcher = Searcher(board_from(KIWIPETE), should_stop=should_stop)
+    move, _ = searcher.search(20)
+    assert searcher.stopped
+    assert move is not None
+    assert 1 <= searcher.depth < 20
+
+
+def test_deeper_result():
+    results = [
+        HelperResult(0, 5, 10, 100, 1000),
+        HelperResult(1, 7, 20, None, 1000),
+        HelperResult(2, 6, 30, 300, 1000),
+    ]
+    assert deeper_result(6, results) is None
+    assert deeper_result(5, results) is results[2]
+    assert deeper_result(4, []) is None
+
+
+def test_helpers_share_the_table():
+    board = board_from(KIWIPETE)
+    with HelperPool(2, size_mb=1) as pool:
+        # Only the helpers search: their entries show up in our table
+        pool.start(board, SearchLimits(depth=2))
+        deadline = time.perf_counter() + 60
+        while pool.tt.probe(board.zobrist_key) is None:
+            assert time.perf_counter() < deadline
+            time.sleep(0.05)
+        results = pool.stop()
+        assert sorted(r.helper for r in results) == [0, 1]
+
+        # And the main search finds theirs
+        searcher = Searcher(board, tt=pool.tt)
+        limits = SearchLimits(depth=3)
+        pool.start(board, limits)
+        move, _ = searcher.search(limits=limits)
+        results = pool.stop()
+        assert move is not None
+        assert len(results) == 2
+        assert searcher.tt.hits > 0
+    assert pool.stop() == []
+
+
+def test_start_takes_helpers_off_an_unfinished_search():
+    board = board_from(KIWIPETE)
+    with HelperPool(2, size_mb=1) as pool:
+        # Never stopped, as if the helpers missed the stop
+        pool.start(board, SearchLimits(depth=30))
+        start = Board()
+        pool.start(start, SearchLimits(depth=1))
+        deadline = time.perf_counter() + 30
+        while pool.tt.probe(start.zobrist_key) is None:
+            assert time.perf_counter() < deadline
+            time.sleep(0.05)
+        results = pool.stop()
+        assert len(results) == 2
+        assert max(r.depth for r in results) == 1
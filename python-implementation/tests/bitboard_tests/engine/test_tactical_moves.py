@@ -0,0 +1,195 @@
+import pytest
+
+from engine.bitboard.attack_utils import PAWN_ATTACKS
+from engine.bitboard.board import Board
+from engine.bitboard.constants import (
+    BLACK_KING,
+    MOVE_DST_SHIFT,
+    MOVE_FLAG_CAPTURE,
+    MOVE_PROMO_MASK,
+    MOVE_PROMO_SHIFT,
+    MOVE_SQ_MASK,
+    WHITE,
+    WHITE_BISHOP,
+    WHITE_KING,
+    WHITE_KNIGHT,
+    WHITE_PAWN,
+    WHITE_QUEEN,
+    WHITE_ROOK,
+)
+from engine.bitboard.generator import (
+    generate_bishop_captures,
+    generate_bishop_moves,
+    generate_captures,
+    generate_king_captures,
+    generate_king_moves,
+    generate_knight_captures,
+    generate_knight_moves,
+    generate_legal_moves,
+    generate_moves,
+    generate_pawn_captures,
+    generate_pawn_moves,
+    generate_pawn_quiets,
+    generate_queen_captures,
+    generate_queen_moves,
+    generate_quiet_checks,
+    generate_quiets,
+    generate_rook_captures,
+    generate_rook_moves,
+)
+from engine.bitboard.moves.bishop import bishop_attacks
+from engine.bitboard.moves.knight import KNIGHT_ATTACKS
+from engine.bitboard.moves.queen import queen_attacks
+from engine.bitboard.moves.rook import rook_attacks
+from tests.utils import board_from
+
+FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R b KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 b kq - 0 1",
+    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+    "rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3",
+    "4k3/1P6/8/8/8/8/6p1/4K2R b K - 0 1",
+]
+
+
+def is_tactical(move: int) -> bool:
+    promo = (move >> MOVE_PROMO_SHIFT) & MOVE_PROMO_MASK
+    return bool(move & MOVE_FLAG_CAPTURE or promo)
+
+
+def legal_only(board: Board, moves):
+    """Filter pseudo-legal moves the way generate_legal_moves does."""
+    side = board.side_to_move
+    legal = []
+    for move in moves:
+        board.make_move_raw(move)
+        if not board.in_check(side):
+            legal.append(move)
+        board.undo_move_raw()
+    return legal
+
+
+def side_args(board: Board):
+    white = board.side_to_move == WHITE
+    my_occ = board.white_occ if white else board.black_occ
+    their_occ = board.black_occ if white else board.white_occ
+    return white, 0 if white else 6, my_occ, their_occ
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_captures_are_the_tactical_subset_of_legal_moves(fen):
+    board = board_from(fen)
+    legal = generate_legal_moves(board, True)
+    expected = sorted(m for m in legal if is_tactical(m))
+    assert sorted(legal_only(board, generate_captures(board, True))) == (
+        expected
+    )
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_captures_and_quiets_partition_generate_moves(fen):
+    board = board_from(fen)
+    captures = generate_captures(board, True)
+    quiets = generate_quiets(board, True)
+    assert all(is_tactical(m) for m in captures)
+    assert not any(is_tactical(m) for m in quiets)
+    assert sorted(captures + quiets) == sorted(generate_moves(board, True))
+
+
+@pytest.mark.parametrize("fen", FENS)
+@pytest.mark.parametrize(
+    "piece,gen,captures",
+    [
+        (WHITE_KNIGHT, generate_knight_moves, generate_knight_captures),
+        (WHITE_BISHOP, generate_bishop_moves, generate_bishop_captures),
+        (WHITE_ROOK, generate_rook_moves, generate_rook_captures),
+        (WHITE_QUEEN, generate_queen_moves, generate_queen_captures),
+    ],
+)
+def test_piece_captures(fen, piece, gen, captures):
+    board = board_from(fen)
+    _, off, my_occ, their_occ = side_args(board)
+    bb = board.bitboards[piece + off]
+    full = gen(bb, my_occ, their_occ, True)
+    assert captures(bb, my_occ, their_occ, True) == [
+        m for m in full if m & MOVE_FLAG_CAPTURE
+    ]
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_king_captures(fen):
+    board = board_from(fen)
+    _, off, my_occ, their_occ = side_args(board)
+    king = board.bitboards[WHITE_KING + off]
+    full = generate_king_moves(board, king, my_occ, their_occ, True)
+    assert generate_king_captures(board, king, my_occ, their_occ, True) == [
+        m for m in full if m & MOVE_FLAG_CAPTURE
+    ]
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_pawn_captures_and_quiets(fen):
+    board = board_from(fen)
+    white, off, _, their_occ = side_args(board)
+    pawns = board.bitboards[WHITE_PAWN + off]
+    ep = board.ep_square
+    ep_mask = (1 << ep) if ep else 0
+    full = generate_pawn_moves(
+        pawns, their_occ, board.all_occ, white, ep_mask, True
+    )
+    tactical = generate_pawn_captures(
+        pawns, their_occ, board.all_occ, white, ep_mask, True
+    )
+    quiets = generate_pawn_quiets(pawns, board.all_occ, white, True)
+    assert sorted(tactical) == sorted(m for m in full if is_tactical(m))
+    assert sorted(quiets) == sorted(m for m in full if not is_tactical(m))
+
+
+def gives_direct_check(board: Board, move: int) -> bool:
+    """Does the moved piece itself attack the enemy king afterwards?"""
+    white = board.side_to_move == WHITE
+    src = move & MOVE_SQ_MASK
+    dst = (move >> MOVE_DST_SHIFT) & MOVE_SQ_MASK
+    kind = board.square_to_piece[src] % 6
+    king = board.bitboards[BLACK_KING if white else WHITE_KING]
+    occ = (board.all_occ & ~(1 << src)) | (1 << dst)
+    if kind == WHITE_PAWN:
+        attacks = PAWN_ATTACKS[0 if white else 1][dst]
+    elif kind == WHITE_KNIGHT:
+        attacks = KNIGHT_ATTACKS[dst]
+    elif kind == WHITE_BISHOP:
+        attacks = bishop_attacks(dst, occ)
+    elif kind == WHITE_ROOK:
+        attacks = rook_attacks(dst, occ)
+    elif kind == WHITE_QUEEN:
+        attacks = queen_attacks(dst, occ)
+    else:
+        return False
+    return bool(attacks & king)
+
+
+@pytest.mark.parametrize(
+    "fen",
+    FENS
+    + [
+        "4k3/8/8/8/8/8/3P4/R3KQ2 w - - 0 1",
+        "4k3/8/2N5/8/1B6/8/3P4/4K3 w - - 0 1",
+    ],
+)
+def test_quiet_checks_are_the_direct_checking_quiets(fen):
+    board = board_from(fen)
+    expected = sorted(
+        m for m in generate_quiets(board, True) if gives_direct_check(board, m)
+    )
+    checks = generate_quiet_checks(board, True)
+    assert sorted(checks) == expected
+    # ...and each of them really puts the enemy king in check
+    them = 1 - board.side_to_move
+    for move in checks:
+        board.make_move_raw(move)
+        assert board.in_check(them)
+        board.undo_move_raw()
@@ -0,0 +1,148 @@
+import time
+
+import pytest
+
+from engine.bitboard.constants import BLACK, WHITE
+from engine.bitboard.generator import generate_legal_moves
+from engine.bitboard.search import FIRST_ITERATION_NODES, Searcher
+from engine.bitboard.timeman import (
+    DEFAULT_MOVES_TO_GO,
+    HARD_CLOCK_SHARE,
+    HARD_SOFT_RATIO,
+    MOVE_OVERHEAD_MS,
+    SearchLimits,
+    TimeManager,
+    allocate,
+)
+from engine.bitboard.transposition import TranspositionTable
+from engine.bitboard.uci import DEFAULT_DEPTH, _parse_go
+from tests.utils import board_from
+
+KIWIPETE = (
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+)
+
+
+def test_parse_go():
+    limits = _parse_go(
+        "go wtime 60000 btime 50000 winc 1000 binc 500 movestogo 20".split()
+    )
+    assert limits == SearchLimits(
+        wtime=60000, btime=50000, winc=1000, binc=500, movestogo=20
+    )
+    assert _parse_go("go movetime 250".split()).movetime == 250
+    assert _parse_go("go nodes 5000".split()).nodes == 5000
+    assert _parse_go("go infinite".split()).infinite
+    assert _parse_go("go depth 7".split()).depth == 7
+    # Nothing to go by: the default depth
+    assert _parse_go(["go"]).depth == DEFAULT_DEPTH
+    assert _parse_go("go ponder".split()).depth == DEFAULT_DEPTH
+
+
+def test_unlimited_searches_have_no_deadlines():
+    for limits in (
+        SearchLimits(infinite=True, wtime=1000, btime=1000),
+        SearchLimits(depth=5),
+        SearchLimits(nodes=1000),
+        # Only the opponent's clock is known
+        SearchLimits(btime=1000),
+    ):
+        assert allocate(limits, WHITE) == (None, None)
+
+
+def test_movetime_is_both_deadlines():
+    soft, hard = allocate(SearchLimits(movetime=500), BLACK)
+    assert soft == hard == 500 - MOVE_OVERHEAD_MS
+
+
+@pytest.mark.parametrize("side", [WHITE, BLACK])
+def test_clock_allocation_uses_own_clock(side):
+    limits = SearchLimits(wtime=60000, btime=30000, winc=1000, binc=0)
+    soft, hard = allocate(limits, side)
+    clock, inc = (60000, 1000) if side == WHITE else (30000, 0)
+    left = clock - MOVE_OVERHEAD_MS
+    assert soft == left / DEFAULT_MOVES_TO_GO + inc * 3 / 4
+    assert hard == soft * HARD_SOFT_RATIO
+    assert soft < hard <= left * HARD_CLOCK_SHARE
+
+
+def test_clock_allocation_respects_movestogo_and_low_clock():
+    soft, hard = allocate(SearchLimits(wtime=10000, movestogo=2), WHITE)
+    left = 10000 - MOVE_OVERHEAD_MS
+    # Half the clock for the next of two moves would be too much
+    assert soft == hard == left * HARD_CLOCK_SHARE
+    # Even an empty clock leaves a positive budget
+    soft, hard = allocate(SearchLimits(btime=0), BLACK)
+    assert 0 < soft <= hard
+
+
+def test_timer_expiry():
+    timer = TimeManager(SearchLimits(movetime=MOVE_OVERHEAD_MS + 20), WHITE)
+    assert not timer.hard_expired()
+    time.sleep(0.05)
+    assert timer.soft_expired() and timer.hard_expired()
+    assert not TimeManager(SearchLimits(), WHITE).hard_expired()
+
+
+def test_node_limit_is_exact_and_reproducible():
+    results = []
+    for _ in range(2):
+        board = board_from(KIWIPETE)
+        searcher = Searcher(board, tt=TranspositionTable(size_mb=1))
+        move, score = searcher.search(limits=SearchLimits(nodes=3000))
+        assert searcher.stopped
+        assert searcher.nodes == 3000
+        # Unwound to the root
+        assert board.get_fen() == KIWIPETE
+        assert board.ply == 0 and len(board.zobrist_history) == 1
+        results.append((move, score, searcher.pv[0]))
+    assert results[0] == results[1]
+    assert results[0][0] is not None
+    assert results[0][2][0] == results[0][0]
+
+
+def test_movetime_stops_the_search():
+    board = board_from(KIWIPETE)
+    searcher = Searcher(board, tt=TranspositionTable(size_mb=1))
+    start = time.perf_counter()
+    move, _ = searcher.search(limits=SearchLimits(movetime=200))
+    elapsed = time.perf_counter() - start
+    assert move is not None
+    assert searcher.stopped
+    assert elapsed < 1.0
+    assert board.get_fen() == KIWIPETE
+
+
+@pytest.mark.parametrize("nodes", [1, 10, 200])
+def test_tiny_node_limit_still_returns_a_legal_move(nodes):
+    board = board_from(KIWIPETE)
+    searcher = Searcher(board, tt=TranspositionTable(size_mb=1))
+    move, _ = searcher.search(limits=SearchLimits(nodes=nodes))
+    assert searcher.stopped
+    assert searcher.nodes == nodes
+    assert searcher.depth == 0
+    assert move in generate_legal_moves(board, True)
+    assert searcher.pv[0] == [move]
+
+
+def test_stop_before_the_search_starts_returns_a_legal_move():
+    board = board_from(KIWIPETE)
+    searcher = Searcher(board, tt=TranspositionTable(size_mb=1))
+    searcher.stop()
+    move, _ = searcher.search(limits=SearchLimits(depth=20))
+    assert searcher.stopped
+    # Stop waits for the first iteration's grace period, no longer
+    assert searcher.nodes <= FIRST_ITERATION_NODES
+    assert move in generate_legal_moves(board, True)
+    assert board.get_fen() == KIWIPETE
+
+
+def test_unreached_limits_do_not_stop():
+    searcher = Searcher(board_from(KIWIPETE), tt=TranspositionTable(1))
+    expected = searcher.search(2)
+    nodes = searcher.nodes
+    searcher = Searcher(board_from(KIWIPETE), tt=TranspositionTable(1))
+    limits = SearchLimits(depth=2, nodes=10**9, wtime=10**8, btime=10**8)
+    assert searcher.search(limits=limits) == expected
+    assert searcher.nodes == nodes
+    assert not searcher.stopped
@@ -0,0 +1,142 @@
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.search import (
+    MATE_SCORE,
+    Searcher,
+    score_from_tt,
+    score_to_tt,
+)
+from engine.bitboard.transposition import (
+    BOUND_EXACT,
+    BOUND_LOWER,
+    BOUND_UPPER,
+    BUCKET_SLOTS,
+    BUCKET_WORDS,
+    TranspositionTable,
+)
+
+KIWIPETE = (
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+)
+
+
+def test_store_then_probe_roundtrip():
+    tt = TranspositionTable(size_mb=0.01)
+    assert tt.probe(0x1234) is None
+    move = 12 | (28 << 6) | (1 << 12) | (4 << 15)
+    tt.store(0x1234, 7, BOUND_EXACT, -321, move)
+    assert tt.probe(0x1234) == (move, -321, 7, BOUND_EXACT)
+    assert (tt.probes, tt.hits, tt.stores) == (2, 1, 1)
+
+
+@pytest.mark.parametrize("score", [-MATE_SCORE, -1, 0, 1, MATE_SCORE])
+@pytest.mark.parametrize("bound", [BOUND_LOWER, BOUND_UPPER, BOUND_EXACT])
+def test_score_and_bound_survive_packing(score, bound):
+    tt = TranspositionTable(size_mb=0.01)
+    tt.store(99, 255, bound, score)
+    assert tt.probe(99) == (0, score, 255, bound)
+
+
+def test_probe_verifies_full_key():
+    tt = TranspositionTable(size_mb=0.01)
+    key = 0xDEADBEEF
+    tt.store(key, 3, BOUND_EXACT, 10)
+    assert tt.probe(key + tt.num_buckets) is None
+    assert tt.probe(key) is not None
+
+
+def test_store_without_move_keeps_old_move():
+    tt = TranspositionTable(size_mb=0.01)
+    tt.store(5, 2, BOUND_LOWER, 50, 777)
+    tt.store(5, 3, BOUND_UPPER, 20)
+    assert tt.probe(5) == (777, 20, 3, BOUND_UPPER)
+
+
+def test_replacement_evicts_shallowest_then_stale():
+    tt = TranspositionTable(size_mb=0.01)
+    n = tt.num_buckets
+    keys = [3 + i * n for i in range(BUCKET_SLOTS + 1)]
+    for depth, key in zip((6, 2, 5, 4), keys):
+        tt.store(key, depth, BOUND_EXACT, 0)
+    # Bucket full: the depth-2 entry goes
+    tt.store(keys[4], 1, BOUND_EXACT, 0)
+    assert tt.probe(keys[1]) is None
+    assert all(tt.probe(k) for k in (keys[0], keys[2], keys[3], keys[4]))
+
+    # One search later the old depth-6 entry is worth less than a
+    # fresh depth-1 entry
+    tt.new_search()
+    for key in (keys[2], keys[3], keys[4]):
+        tt.store(key, 1, BOUND_EXACT, 0)
+    tt.store(keys[1], 1, BOUND_EXACT, 0)
+    assert tt.probe(keys[0]) is None
+
+
+def test_hashfull_and_clear():
+    tt = TranspositionTable(size_mb=0.01)
+    assert tt.hashfull() == 0
+    for key in range(len(tt)):
+        tt.store(key, 1, BOUND_EXACT, 0)
+    assert tt.hashfull() > 0
+    tt.new_search()
+    # Entries from an earlier search do not count as full
+    assert tt.hashfull() == 0
+    tt.clear()
+    assert tt.probe(0) is None
+    assert tt.stores == 0
+
+
+def test_external_buffer_is_used_in_place():
+    buf = bytearray(8 * BUCKET_WORDS * 16)
+    tt = TranspositionTable(buffer=buf)
+    assert tt.num_buckets == 16
+    tt.store(42, 4, BOUND_EXACT, 123, 55)
+    assert any(buf)
+    # A second table over the same memory sees the entry
+    assert TranspositionTable(buffer=buf).probe(42) == (
+        55,
+        123,
+        4,
+        BOUND_EXACT,
+    )
+    tt.clear()
+    assert not any(buf)
+
+
+def test_torn_slot_reads_as_a_miss():
+    buf = bytearray(8 * BUCKET_WORDS)
+    tt = TranspositionTable(buffer=buf)
+    tt.store(42, 4, BOUND_EXACT, 123, 55)
+    words = memoryview(buf).cast("Q")
+    key_word = words[0]
+    # Another writer's data lands next to the old key word
+    tt.clear()
+    tt.store(42, 9, BOUND_LOWER, -7, 66)
+    words[0] = key_word
+    assert tt.probe(42) is None
+    words.release()
+
+
+@pytest.mark.parametrize("ply", [0, 1, 7])
+@pytest.mark.parametrize("score", [MATE_SCORE - 3, 3 - MATE_SCORE, 250])
+def test_mate_scores_are_node_relative(score, ply):
+    stored = score_to_tt(score, ply)
+    assert score_from_tt(stored, ply) == score
+    if abs(score) > 1000:
+        # The same mate seen from two plies further down is 2 plies
+        # closer to the root's view
+        assert abs(score_from_tt(stored, ply + 2)) == abs(score) - 2
+
+
+def test_search_with_table_keeps_score_and_reduces_nodes():
+    board = Board()
+    board.set_fen(KIWIPETE)
+    cold = Searcher(board, tt=TranspositionTable(size_mb=1))
+    move, score = cold.search(3)
+    assert cold.tt.stores > 0
+
+    # Re-searching with the warm table needs far fewer nodes
+    nodes = cold.nodes
+    assert cold.search(3) == (move, score)
+    assert cold.nodes < nodes
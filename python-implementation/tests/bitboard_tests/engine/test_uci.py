@@ -1,8 +1,27 @@
 import os
+import queue
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
 
+import pytest
+
+from engine.bitboard.generator import generate_legal_moves
+from engine.bitboard.utils import move_to_uci
+from tests.utils import board_from
+
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+KIWIPETE = (
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+)
+
+
+def legal_uci(fen: str) -> set:
+    board = board_from(fen)
+    return {move_to_uci(m) for m in generate_legal_moves(board, True)}
+
 
 def test_uci_smoke():
     env = os.environ.copy()
@@ -20,3 +39,245 @@ def test_uci_smoke():
     assert "uciok" in out
     assert "readyok" in out
     assert "bestmove" in out
+
+
+def run_uci(cmds: str) -> str:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parents[3])
+    proc = subprocess.run(
+        [sys.executable, "-m", "engine.bitboard.uci"],
+        input=cmds,
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=30,
+    )
+    return proc.stdout
+
+
+def test_uci_go_depth_searches():
+    out = run_uci(
+        "position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1\n"
+        "go depth 3\nquit\n"
+    )
+    assert "info depth 1 " in out
+    assert "score mate 1" in out
+    assert out.strip().splitlines()[-1] == "bestmove a1a8"
+
+
+def test_uci_go_perft():
+    out = run_uci("position startpos\ngo perft 3\nquit\n")
+    assert "info nodes 8902" in out
+
+
+@pytest.mark.parametrize("depth", ["x", "-1", ""])
+def test_uci_go_perft_rejects_a_bad_depth(depth):
+    out = run_uci(f"position startpos\ngo perft {depth}\ngo perft 1\nquit\n")
+    lines = out.splitlines()
+    assert lines[0].startswith("info string Invalid perft command")
+    assert lines[1] == "info nodes 20"
+
+
+def test_uci_hash_option():
+    out = run_uci(
+        "uci\nsetoption name Hash value 4\nucinewgame\n"
+        "position startpos\ngo depth 2\nquit\n"
+    )
+    assert "option name Hash type spin" in out
+    assert " hashfull " in out
+    assert "bestmove" in out
+
+
+def test_uci_go_nodes_and_clock():
+    out = run_uci(
+        "position startpos\ngo nodes 2000\n"
+        "go wtime 2000 btime 2000 winc 0 binc 0\n"
+        "go movetime 100\nquit\n"
+    )
+    assert out.count("bestmove") == 3
+    assert "bestmove 0000" not in out
+
+
+def test_uci_tiny_node_limit_plays_a_legal_move():
+    out = run_uci(
+        f"position fen {KIWIPETE}\ngo nodes 10\n"
+        "position startpos\ngo nodes 1\nquit\n"
+    )
+    moves = [
+        line.split()[1]
+        for line in out.splitlines()
+        if line.startswith("bestmove")
+    ]
+    assert len(moves) == 2
+    assert moves[0] in legal_uci(KIWIPETE)
+    assert moves[1] in legal_uci(START)
+
+
+class UciProcess:
+    """An engine process fed line by line, with timed reads."""
+
+    def __init__(self) -> None:
+        env = os.environ.copy()
+        env["PYTHONPATH"] = str(Path(__file__).resolve().parents[3])
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "engine.bitboard.uci"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            env=env,
+        )
+        self.lines: "queue.Queue[str]" = queue.Queue()
+        # The last line expect() found
+        self.last = ""
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self) -> None:
+        for line in self.proc.stdout:
+            self.lines.put(line.strip())
+
+    def send(self, cmd: str) -> None:
+        self.proc.stdin.write(cmd + "\n")
+        self.proc.stdin.flush()
+
+    def expect(self, prefix: str, timeout: float) -> float:
+        """Seconds until a line starting with `prefix` arrives."""
+        start = time.perf_counter()
+        deadline = start + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            assert remaining > 0, f"no {prefix!r} within {timeout}s"
+            try:
+                line = self.lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line.startswith(prefix):
+                self.last = line
+                return time.perf_counter() - start
+
+    def quiet(self, prefix: str, seconds: float) -> bool:
+        """True if no line starting with `prefix` comes for `seconds`."""
+        deadline = time.perf_counter() + seconds
+        while (remaining := deadline - time.perf_counter()) > 0:
+            try:
+                if self.lines.get(timeout=remaining).startswith(prefix):
+                    return False
+            except queue.Empty:
+                break
+        return True
+
+    def close(self) -> None:
+        self.send("quit")
+        self.proc.wait(timeout=10)
+
+
+def test_uci_stays_responsive_during_infinite_search():
+    engine = UciProcess()
+    try:
+        engine.send("uci")
+        engine.expect("uciok", 10)
+        engine.send("position startpos")
+        engine.send("go infinite")
+        engine.expect("info depth 2", 10)
+        engine.send("isready")
+        assert engine.expect("readyok", 5) < 0.5
+        # An infinite search never reports on its own
+        assert engine.quiet("bestmove", 0.3)
+        engine.send("stop")
+        assert engine.expect("bestmove", 5) < 0.5
+    finally:
+        engine.close()
+
+
+def test_uci_immediate_stop_plays_a_legal_move():
+    engine = UciProcess()
+    try:
+        engine.send(f"position fen {KIWIPETE}")
+        engine.send("isready")
+        engine.expect("readyok", 10)
+        engine.send("go infinite")
+        engine.send("stop")
+        assert engine.expect("bestmove", 5) < 1.0
+        move = engine.last.split()[1]
+        assert move in legal_uci(KIWIPETE)
+    finally:
+        engine.close()
+
+
+def test_uci_ponderhit_starts_the_clock():
+    engine = UciProcess()
+    try:
+        engine.send("position startpos")
+        engine.send("go ponder movetime 200")
+        assert engine.quiet("bestmove", 0.5)
+        engine.send("ponderhit")
+        assert engine.expect("bestmove", 5) < 1.0
+        engine.send("isready")
+        engine.expect("readyok", 5)
+    finally:
+        engine.close()
+
+
+def test_uci_quit_stops_a_running_search():
+    engine = UciProcess()
+    engine.send("position startpos")
+    engine.send("go infinite")
+    engine.expect("info depth 1", 10)
+    start = time.perf_counter()
+    engine.close()
+    assert time.perf_counter() - start < 2
+
+
+def test_uci_position_moves():
+    out = run_uci(
+        "position startpos moves e2e4 e7e5\ngo perft 1\n"
+        "position startpos moves e2e4 e7e5 g1f3\ngo perft 1\n"
+        "position startpos moves e2e4 e7e5 g1f3 b8c6\ngo perft 1\n"
+        "position startpos moves e2e4 e7e5\ngo perft 1\n"
+        "position startpos moves e2e4 x\n"
+        "position startpos moves e2e4 e8e7\ngo perft 1\nquit\n"
+    )
+    nodes = [line for line in out.splitlines() if line.startswith("info")]
+    assert nodes[:4] == [
+        "info nodes 29",
+        "info nodes 29",
+        "info nodes 27",
+        "info nodes 29",
+    ]
+    assert nodes[4].startswith("info string")
+    # An illegal move is refused; the moves before it stand
+    assert nodes[5] == "info string Illegal move: e8e7"
+    assert nodes[6] == "info nodes 20"
+
+
+def test_uci_threads_option():
+    out = run_uci(
+        "uci\nsetoption name Threads value 3\nisready\n"
+        "position startpos\ngo depth 2\n"
+        "setoption name Hash value 2\ngo depth 2\nquit\n"
+    )
+    assert "option name Threads type spin" in out
+    assert "readyok" in out
+    assert out.count("bestmove") == 2
+    assert "bestmove 0000" not in out
+    assert out.count("info nodes") == 2
+
+
+@pytest.mark.parametrize(
+    "cmd", ["setoption name Hash value 32", "ucinewgame", "go perft 1"]
+)
+def test_uci_stops_a_long_search_instead_of_waiting(cmd):
+    engine = UciProcess()
+    try:
+        engine.send("position startpos")
+        engine.send("go depth 30")
+        engine.expect("info depth 2", 10)
+        start = time.perf_counter()
+        engine.send(cmd)
+        engine.send("isready")
+        # The stopped search still reports its move, then readyok
+        engine.expect("bestmove", 5)
+        engine.expect("readyok", 5)
+        assert time.perf_counter() - start < 1.0
+    finally:
+        engine.close()
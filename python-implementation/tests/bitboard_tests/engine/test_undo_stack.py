@@ -0,0 +1,64 @@
+import pytest
+
+from engine.bitboard.board import Board
+from engine.bitboard.constants import UNDO_STACK_SIZE
+
+# Knights out and back: b1c3, b8c6, c3b1, c6b8
+SHUFFLE = [
+    (1, 18, False, None, False, False),
+    (57, 42, False, None, False, False),
+    (18, 1, False, None, False, False),
+    (42, 57, False, None, False, False),
+]
+
+
+def test_undo_stack_is_preallocated():
+    b = Board()
+    assert len(b.undo_stack) == UNDO_STACK_SIZE
+    assert b.ply == 0
+    b.make_move_raw(SHUFFLE[0])
+    assert b.ply == 1
+    assert len(b.undo_stack) == UNDO_STACK_SIZE
+    b.undo_move_raw()
+    assert b.ply == 0
+
+
+def test_undo_stack_grows_past_preallocation():
+    b = Board()
+    start = b.get_fen()
+    plies = UNDO_STACK_SIZE + 8
+    for i in range(plies):
+        b.make_move_raw(SHUFFLE[i % 4])
+    assert b.ply == plies
+    assert len(b.undo_stack) >= plies
+    for _ in range(plies):
+        b.undo_move_raw()
+    assert b.get_fen() == start
+
+
+def test_raw_history_view():
+    b = Board()
+    assert b.raw_history == []
+    assert len(b.raw_history) == 0
+
+    b.make_move_raw(SHUFFLE[0])
+    b.make_move_raw(SHUFFLE[1])
+    history = b.raw_history
+    assert len(history) == 2
+    # (piece_idx, src, dst, ...) oldest first
+    assert history[0][:3] == (1, 1, 18)
+    assert history[-1][:3] == (7, 57, 42)
+    assert [entry[1] for entry in history] == [1, 57]
+
+    b.undo_move_raw()
+    assert len(history) == 1
+
+    history.clear()
+    assert b.ply == 0
+    assert b.raw_history == []
+
+
+def test_undo_with_empty_history_raises():
+    b = Board()
+    with pytest.raises(IndexError):
+        b.undo_move_raw()
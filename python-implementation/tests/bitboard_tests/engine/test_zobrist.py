@@ -59,3 +59,12 @@ def test_en_passant_hash_variation():
     b.ep_square = 17  # file=1
     b._compute_zobrist_from_scratch()
     assert b.zobrist_key != second
+
+
+def test_set_fen_recomputes_hash_and_history():
+    b = Board()
+    b.make_move_raw((12, 28, False, None, False, False))
+    b.set_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    assert b.zobrist_key == Board().zobrist_key
+    assert b.zobrist_history == [b.zobrist_key]
+    assert b.raw_history == []
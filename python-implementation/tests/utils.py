@@ -24,6 +24,14 @@ def make_board(pieces: dict[tuple[int, int], str]):
     return b
 
 
+def board_from(fen: str):
+    from engine.bitboard.board import Board
+
+    b = Board()
+    b.set_fen(fen)
+    return b
+
+
 def print_section(title: str):
     print(f"\n{'='*10} {title} {'='*10}")
 